@@ -1,6 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { PieChart, Pie, Cell, ResponsiveContainer, Legend, Tooltip } from 'recharts';
-import { checkCoverage, getTargetLists } from '../utils/api';
+import { checkCoverageAll } from '../utils/api';
 import { GlassCard, GlassBadge, GlassProgress } from './GlassComponents';
 
 const GLASS_COLORS = {
@@ -10,38 +10,22 @@ const GLASS_COLORS = {
 };
 
 const Dashboard = () => {
-  const [coverageData, setCoverageData] = useState(null);
-  const [targetLists, setTargetLists] = useState([]);
+  const [allCoverage, setAllCoverage] = useState(null);
   const [selectedList, setSelectedList] = useState('');
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
 
-  // Fetch available target lists
+  // Fetch coverage of every target list in one request
   useEffect(() => {
-    const fetchTargetLists = async () => {
-      try {
-        const data = await getTargetLists();
-        setTargetLists(data.files);
-        setSelectedList(data.default);
-      } catch (err) {
-        console.error('Failed to fetch target lists:', err);
-      }
-    };
-
-    fetchTargetLists();
-  }, []);
-
-  // Fetch coverage data when selected list changes
-  useEffect(() => {
-    if (!selectedList) return;
-
     const fetchCoverage = async () => {
       setLoading(true);
       setError(null);
 
       try {
-        const data = await checkCoverage(selectedList, 5);
-        setCoverageData(data);
+        const data = await checkCoverageAll(5);
+        const files = data.lists.map((list) => list.file);
+        setAllCoverage(data);
+        setSelectedList(files.includes(data.default) ? data.default : files[0] || '');
       } catch (err) {
         setError(err.message);
         console.error('Failed to fetch coverage:', err);
@@ -51,7 +35,13 @@ const Dashboard = () => {
     };
 
     fetchCoverage();
-  }, [selectedList]);
+  }, []);
+
+  // Switching lists is local: the response already holds every list
+  const targetLists = allCoverage ? allCoverage.lists.map((list) => list.file) : [];
+  const coverageData = allCoverage
+    ? allCoverage.lists.find((list) => list.file === selectedList) || null
+    : null;
 
   // Prepare chart data
   const chartData = coverageData
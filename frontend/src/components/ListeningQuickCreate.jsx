@@ -1,6 +1,9 @@
 import React, { useState, useRef } from 'react';
-import { createListeningCard } from '../utils/api';
-import { GlassCard, GlassButton, GlassNotification } from './GlassComponents';
+import { createListeningCard, streamListeningCardsBatch } from '../utils/api';
+import { GlassCard, GlassButton, GlassNotification, GlassProgress } from './GlassComponents';
+
+// One sentence per line; multiple lines → streaming batch
+const splitLines = (text) => text.split('\n').map((line) => line.trim()).filter(Boolean);
 
 const ListeningQuickCreate = () => {
   const [koreanSentence, setKoreanSentence] = useState('');
@@ -10,6 +13,7 @@ const ListeningQuickCreate = () => {
   const [loading, setLoading] = useState(false);
   const [result, setResult] = useState(null);
   const [error, setError] = useState(null);
+  const [progress, setProgress] = useState(null);
   const koreanRef = useRef(null);
   const chineseRef = useRef(null);
 
@@ -35,17 +39,42 @@ const ListeningQuickCreate = () => {
       return;
     }
 
+    const sentences = splitLines(koreanSentence);
+    const translations = splitLines(chineseTranslation);
+    if (sentences.length > 1 && translations.length > 0 && translations.length !== sentences.length) {
+      setError('中文翻譯行數需與韓語句子行數相同（或全部留空）');
+      return;
+    }
+
     setLoading(true);
     setError(null);
     setResult(null);
 
     try {
-      const data = await createListeningCard(
-        koreanSentence.trim(),
-        chineseTranslation.trim() || null,
-        forceUpdate
-      );
-      setResult(data);
+      if (sentences.length > 1) {
+        const failed = [];
+        setProgress({ done: 0, total: sentences.length });
+        const summary = await streamListeningCardsBatch(
+          sentences.map((sentence, i) => ({
+            korean_sentence: sentence,
+            chinese_translation: translations[i] || null,
+          })),
+          (event) => {
+            if (event.type !== 'item') return;
+            setProgress({ done: event.done, total: event.total });
+            if (event.item.status === 'failed') failed.push(event.item.korean_sentence);
+          },
+          forceUpdate
+        );
+        setResult({ batch: true, ...summary, failed });
+      } else {
+        const data = await createListeningCard(
+          koreanSentence.trim(),
+          chineseTranslation.trim() || null,
+          forceUpdate
+        );
+        setResult(data);
+      }
       setKoreanSentence('');
       setChineseTranslation('');
       // Reset textarea heights
@@ -55,6 +84,7 @@ const ListeningQuickCreate = () => {
       setError(err.response?.data?.detail || err.message || '建立失敗');
     } finally {
       setLoading(false);
+      setProgress(null);
     }
   };
 
@@ -78,7 +108,7 @@ const ListeningQuickCreate = () => {
               id="korean-sentence"
               value={koreanSentence}
               onChange={handleKoreanInput}
-              placeholder="例如：오늘 날씨가 좋아요"
+              placeholder="例如：오늘 날씨가 좋아요（一行一句，可一次建立多張）"
               rows={3}
               style={{ fontSize: '16px' }}
               className="w-full px-4 py-3 bg-white/60 backdrop-blur-glass-sm border border-white/40 rounded-glass-md korean-text text-glass-text-primary placeholder-glass-text-muted/60 shadow-[inset_0_2px_8px_rgba(0,0,0,0.03)] transition-all duration-300 ease resize-none overflow-hidden focus:bg-white/75 focus:border-glass-indigo-300/40 focus:shadow-[0_0_0_3px_rgba(139,92,246,0.1)] focus:outline-none disabled:opacity-50 disabled:cursor-not-allowed"
@@ -126,6 +156,15 @@ const ListeningQuickCreate = () => {
             </label>
           </div>
 
+          {progress && (
+            <div className="space-y-2">
+              <GlassProgress value={progress.done} max={progress.total} color="rose" />
+              <p className="text-sm text-glass-text-muted">
+                {progress.done} / {progress.total}
+              </p>
+            </div>
+          )}
+
           <div className="md:relative md:mt-4 fixed bottom-0 left-0 right-0 z-10 md:z-auto px-4 md:px-0 pb-4 md:pb-0 bg-gradient-to-t from-white/90 to-transparent md:bg-none backdrop-blur-glass-md md:backdrop-blur-0">
             <GlassButton
               type="submit"
@@ -147,7 +186,26 @@ const ListeningQuickCreate = () => {
         </form>
 
         {/* Result Messages - Mobile: Fixed toast, Desktop: Relative */}
-        {result && (
+        {result?.batch && (
+          <div className="fixed top-4 left-4 right-4 md:relative md:top-0 md:left-0 md:right-0 md:mt-6 z-50 md:z-auto">
+            <GlassNotification
+              type={result.fail_count === 0 ? 'success' : 'warning'}
+              onClose={() => setResult(null)}
+            >
+              <p className="font-semibold mb-2 text-glass-text-primary">批次建立完成</p>
+              <div className="text-sm space-y-1 text-glass-text-secondary">
+                <p>
+                  成功 {result.success_count}・已存在 {result.skip_count}・失敗 {result.fail_count}
+                </p>
+                {result.failed.map((sentence, i) => (
+                  <p key={i} className="korean-text">失敗: {sentence}</p>
+                ))}
+              </div>
+            </GlassNotification>
+          </div>
+        )}
+
+        {result && !result.batch && (
           <div className="fixed top-4 left-4 right-4 md:relative md:top-0 md:left-0 md:right-0 md:mt-6 z-50 md:z-auto">
             <GlassNotification
               type={result.status === 'success' ? 'success' : 'warning'}
@@ -1,6 +1,9 @@
 import React, { useState, useRef, useEffect } from 'react';
-import { createVocabCard } from '../utils/api';
-import { GlassCard, GlassButton, GlassInput, GlassNotification } from './GlassComponents';
+import { createVocabCard, streamVocabCardsBatch } from '../utils/api';
+import { GlassCard, GlassButton, GlassInput, GlassNotification, GlassProgress } from './GlassComponents';
+
+// Multiple words separated by commas → streaming batch
+const splitWords = (text) => text.split(/[,，、]/).map((w) => w.trim()).filter(Boolean);
 
 const VocabQuickCreate = () => {
   const [word, setWord] = useState('');
@@ -8,6 +11,7 @@ const VocabQuickCreate = () => {
   const [loading, setLoading] = useState(false);
   const [result, setResult] = useState(null);
   const [error, setError] = useState(null);
+  const [progress, setProgress] = useState(null);
   const inputRef = useRef(null);
 
   // Auto-focus on desktop only
@@ -20,7 +24,8 @@ const VocabQuickCreate = () => {
   const handleSubmit = async (e) => {
     e.preventDefault();
 
-    if (!word.trim()) {
+    const words = splitWords(word);
+    if (words.length === 0) {
       setError('請輸入單字');
       return;
     }
@@ -30,13 +35,25 @@ const VocabQuickCreate = () => {
     setResult(null);
 
     try {
-      const data = await createVocabCard(word.trim(), forceUpdate);
-      setResult(data);
+      if (words.length > 1) {
+        const failed = [];
+        setProgress({ done: 0, total: words.length });
+        const summary = await streamVocabCardsBatch(words, (event) => {
+          if (event.type !== 'item') return;
+          setProgress({ done: event.done, total: event.total });
+          if (event.item.status === 'failed') failed.push(event.item.word);
+        }, forceUpdate);
+        setResult({ batch: true, ...summary, failed });
+      } else {
+        const data = await createVocabCard(words[0], forceUpdate);
+        setResult(data);
+      }
       setWord(''); // Clear input on success
     } catch (err) {
       setError(err.response?.data?.detail || err.message || '建立失敗');
     } finally {
       setLoading(false);
+      setProgress(null);
     }
   };
 
@@ -60,7 +77,7 @@ const VocabQuickCreate = () => {
               id="vocab-word"
               value={word}
               onChange={(e) => setWord(e.target.value)}
-              placeholder="例如：학생"
+              placeholder="例如：학생（多個單字以逗號分隔）"
               disabled={loading}
               className="korean-text"
             />
@@ -80,6 +97,15 @@ const VocabQuickCreate = () => {
             </label>
           </div>
 
+          {progress && (
+            <div className="space-y-2">
+              <GlassProgress value={progress.done} max={progress.total} />
+              <p className="text-sm text-glass-text-muted">
+                {progress.done} / {progress.total}
+              </p>
+            </div>
+          )}
+
           {/* Desktop: Regular button */}
           <div className="md:relative md:mt-4 fixed bottom-0 left-0 right-0 z-10 md:z-auto px-4 md:px-0 pb-4 md:pb-0 bg-gradient-to-t from-white/90 to-transparent md:bg-none backdrop-blur-glass-md md:backdrop-blur-0">
             <GlassButton
@@ -102,7 +128,26 @@ const VocabQuickCreate = () => {
         </form>
 
         {/* Result Messages - Mobile: Fixed toast, Desktop: Relative */}
-        {result && (
+        {result?.batch && (
+          <div className="fixed top-4 left-4 right-4 md:relative md:top-0 md:left-0 md:right-0 md:mt-6 z-50 md:z-auto">
+            <GlassNotification
+              type={result.fail_count === 0 ? 'success' : 'warning'}
+              onClose={() => setResult(null)}
+            >
+              <p className="font-semibold mb-2 text-glass-text-primary">批次建立完成</p>
+              <div className="text-sm space-y-1 text-glass-text-secondary">
+                <p>
+                  成功 {result.success_count}・已存在 {result.skip_count}・失敗 {result.fail_count}
+                </p>
+                {result.failed.length > 0 && (
+                  <p className="korean-text">失敗: {result.failed.join(', ')}</p>
+                )}
+              </div>
+            </GlassNotification>
+          </div>
+        )}
+
+        {result && !result.batch && (
           <div className="fixed top-4 left-4 right-4 md:relative md:top-0 md:left-0 md:right-0 md:mt-6 z-50 md:z-auto">
             <GlassNotification
               type={result.status === 'success' ? 'success' : 'warning'}
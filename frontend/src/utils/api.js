@@ -12,6 +12,40 @@ const api = axios.create({
   },
 });
 
+// Streaming batch: POST body, read NDJSON events line by line and call onEvent for each
+const streamBatch = async (path, body, onEvent) => {
+  const response = await fetch(`${API_BASE_URL}${path}`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify(body),
+  });
+  if (!response.ok) {
+    throw new Error(`Request failed with status ${response.status}`);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  let summary = null;
+  for (;;) {
+    const { done, value } = await reader.read();
+    buffer += decoder.decode(value || new Uint8Array(), { stream: !done });
+    const lines = buffer.split('\n');
+    buffer = lines.pop();
+    for (const line of lines) {
+      if (!line.trim()) continue;
+      const event = JSON.parse(line);
+      if (event.type === 'summary') summary = event;
+      onEvent(event);
+    }
+    if (done) break;
+  }
+  if (summary?.status === 'failed') {
+    throw new Error(summary.error || 'Batch failed');
+  }
+  return summary;
+};
+
 // API Status checks
 export const checkApiStatus = async () => {
   try {
@@ -50,6 +84,9 @@ export const createVocabCardsBatch = async (words, forceUpdate = false) => {
   return response.data;
 };
 
+export const streamVocabCardsBatch = async (words, onEvent, forceUpdate = false) =>
+  streamBatch('/vocab/batch/stream', { words, force_update: forceUpdate }, onEvent);
+
 export const getTargetLists = async () => {
   const response = await api.get('/vocab/targets');
   return response.data;
@@ -64,6 +101,11 @@ export const checkCoverage = async (file = null, topK = 10) => {
   return response.data;
 };
 
+export const checkCoverageAll = async (topK = 10) => {
+  const response = await api.get('/vocab/coverage/all', { params: { top_k: topK } });
+  return response.data;
+};
+
 // Listening APIs
 export const createListeningCard = async (koreanSentence, chineseTranslation = null, forceUpdate = false) => {
   const response = await api.post('/listening', {
@@ -82,4 +124,7 @@ export const createListeningCardsBatch = async (sentences, forceUpdate = false)
   return response.data;
 };
 
+export const streamListeningCardsBatch = async (sentences, onEvent, forceUpdate = false) =>
+  streamBatch('/listening/batch/stream', { sentences, force_update: forceUpdate }, onEvent);
+
 export default api;
@@ -2,17 +2,47 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from src.routers import vocab_router, listening_router
-from src.utils.anki import AnkiConnectionError
+from src.routers import vocab_router, listening_router, stats_router
+from src.utils.anki import AnkiConnectionError, get_anki_client
 from src.startup import initialize
+from src.service.job_queue import get_job_queue
+from src.service.bulk_job_service import get_bulk_job_service
+from src.graph.checkpoint import get_graph_checkpointer
+from src.service.vocab_anki_service import get_vocab_anki_service
+from src.service.target_list_index import get_target_list_index
+from src.utils.tts_executor import get_tts_executor
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """API 生命週期管理：啟動時初始化 Anki 連線和 Models"""
-    await initialize()
-    yield
-    # 關閉時的清理（目前不需要）
+    """API 生命週期管理：啟動時初始化 Anki 連線和 Models，關閉時釋放連線"""
+    anki_client = get_anki_client()
+    job_queue = get_job_queue()
+    bulk_jobs = get_bulk_job_service()
+    checkpointer = get_graph_checkpointer()
+    vocab_index = get_vocab_anki_service().index
+    target_lists = get_target_list_index()
+    tts_executor = get_tts_executor()
+    await anki_client.start()
+    try:
+        await tts_executor.start()
+        if checkpointer is not None:
+            await checkpointer.start()
+        await initialize()
+        await job_queue.start()
+        await bulk_jobs.start()
+        vocab_index.start()
+        target_lists.start()
+        yield
+    finally:
+        await target_lists.stop()
+        await vocab_index.stop()
+        await bulk_jobs.stop()
+        await job_queue.stop()
+        await tts_executor.stop()
+        if checkpointer is not None:
+            await checkpointer.close()
+        await anki_client.close()
 
 
 app = FastAPI(
@@ -53,6 +83,7 @@ async def anki_connection_error_handler(_request: Request, exc: AnkiConnectionEr
 # Include routers
 app.include_router(vocab_router)
 app.include_router(listening_router)
+app.include_router(stats_router)
 
 
 @app.get("/")
@@ -65,5 +96,6 @@ async def root():
             "vocab_batch": "/vocab/batch",
             "listening": "/listening",
             "listening_batch": "/listening/batch",
+            "stats": "/stats",
         },
     }
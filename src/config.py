@@ -1,4 +1,5 @@
 from functools import lru_cache
+from typing import Literal
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -10,6 +11,7 @@ class AzureOpenAISettings(BaseSettings):
     api_version: str = "2025-01-01-preview"
     deployment: str = "gpt-4o-mini-0"
     endpoint: str
+    batch_deployment: str = ""  # Global-Batch deployment（offline bulk job 用）
     model_config = SettingsConfigDict(
         env_file=".env", env_prefix="AZURE_OPENAI_", extra="ignore"
     )
@@ -26,6 +28,23 @@ class AnkiSettings(BaseSettings):
     tag_default: str = "korean_auto"
     tag_native: str = "native_kor"
 
+    # AnkiConnect client（app-scoped, keep-alive）
+    max_connections: int = 8  # 同時送往 AnkiConnect 的請求上限
+    timeout: float = 10.0  # 單一請求 timeout（秒）
+    keepalive_timeout: float = 30.0
+    batch_window_ms: float = 5.0  # 合併並發 action 成 `multi` 的等待時間，0 = 關閉
+    batch_max_actions: int = 50  # 單一 `multi` 請求的 action 上限
+    notes_info_chunk_size: int = 500  # 讀整個 deck 時每次 notesInfo 的 note 數
+
+    # 啟動時建立 media index 的檔名 pattern（本系統產生的音檔）
+    media_patterns: list[str] = ["vocab_*.mp3", "listening_*.mp3"]
+    # storeMediaFile 上傳方式：data = base64 內容（Docker / 遠端 Anki 皆可用）；
+    # path = 只傳本地檔案路徑，省去 base64 複製，但 Anki 必須能以同一路徑讀到檔案（同機、非容器）
+    media_upload: Literal["data", "path"] = "data"
+
+    # Vocab word index：背景增量同步間隔（秒），0 = 只在 batch 查重時同步
+    vocab_index_sync_seconds: float = 60.0
+
     # Vocabulary model card templates and CSS
     card_css: str = """
 .card-root {
@@ -107,14 +126,100 @@ class ListeningSettings(BaseSettings):
         .korean { font-size: 24px; margin: 10px 0; }
         .chinese { font-size: 18px; color: #666; }
     """
+
+    # Batch pipeline：各 stage 的 worker 數與 queue 大小
+    pipeline_dedup_workers: int = 4
+    pipeline_translate_workers: int = 4
+    pipeline_tts_workers: int = 2
+    pipeline_upload_workers: int = 2
+    pipeline_write_workers: int = 2
+    pipeline_queue_size: int = 32
     model_config = SettingsConfigDict(
         env_file=".env", env_prefix="ANKI_LISTENING_", extra="ignore"
     )
 
 
+class TTSSettings(BaseSettings):
+    # TTS backend：gtts = Google Translate TTS；local = 本地 CLI 合成器；fake = 測試用假音檔
+    backend: Literal["gtts", "local", "fake"] = "gtts"
+
+    # TTS executor：worker 數 = backend 的 concurrency；queue 滿時 submit 等待（backpressure）
+    queue_size: int = 64
+    timeout_seconds: float = 60.0
+
+    # gTTS
+    lang: str = "ko"
+    tld: str = "com"
+    slow: bool = False
+    gtts_concurrency: int = 2
+
+    # Local synthesizer（{text} / {output} 佔位符見 src/utils/tts_backends.py）
+    local_command: str = "espeak-ng -v ko --stdout {text}"
+    local_encode_command: str = "lame --quiet - -"  # 空字串 = 直接使用合成器輸出
+    local_concurrency: int = 4
+
+    # Fake
+    fake_delay_seconds: float = 0.0
+    fake_concurrency: int = 16
+
+    # 本地音檔 cache（content-addressed，依總容量做 LRU 淘汰）
+    cache_enabled: bool = True
+    cache_dir: str = "audio"
+    cache_max_bytes: int = 512 * 1024 * 1024
+    model_config = SettingsConfigDict(
+        env_file=".env", env_prefix="TTS_", extra="ignore"
+    )
+
+
 class AppSettings(BaseSettings):
     word_list_dir: str = "data"
     default_word_list: str = "korean_words.txt"
+    word_list_watch_seconds: float = 5.0  # 目標清單目錄的輪詢間隔（秒），0 = 只在啟動時載入
+
+    # Vocab LLM 模式：split = parse_word + extract_root 兩次呼叫；combined = analyze_word 一次呼叫
+    vocab_llm_mode: Literal["split", "combined"] = "split"
+    # /vocab/batch 多字批次 LLM：每次 completion 解析的單字數，0 = 關閉（逐字呼叫）
+    vocab_llm_batch_size: int = 0
+
+    # Offline bulk job（Batch API）：azure = Azure OpenAI Batch API；local = 本地離線替身
+    llm_batch_backend: Literal["azure", "local"] = "azure"
+    llm_batch_dir: str = "cache/batch"
+    llm_batch_poll_seconds: float = 30.0
+    bulk_job_ttl_seconds: float = 7 * 86400  # 完成的 bulk job 結果保留時間（存在 job_db_path）
+
+    # Durable job queue（SQLite + in-process workers）
+    job_db_path: str = "cache/jobs.sqlite3"
+    job_workers: int = 4
+
+    # Local lexicon（SQLite）：parse_word / extract_root 先查，命中就略過 LLM
+    lexicon_enabled: bool = True
+    lexicon_path: str = "cache/lexicon.sqlite3"
+
+    # LangGraph checkpoint（SQLite）：失敗的 run 重試時從失敗的 node 繼續
+    graph_checkpoint_enabled: bool = True
+    graph_checkpoint_path: str = "cache/graph_checkpoints.sqlite3"
+
+    # Node logging：DEBUG = start + 欄位 diff；INFO = 耗時 + 變動欄位；WARNING / ERROR = 只記錄失敗
+    node_log_level: Literal["DEBUG", "INFO", "WARNING", "ERROR"] = "INFO"
+    node_log_sample_rate: float = 1.0  # 成功的 node 記錄比例（0~1），大量 batch 時可調低；失敗一律記錄
+
+    # Batch concurrency（每種外部資源各自的並發上限）
+    batch_concurrency: int = 8  # 同時執行的 graph run 數
+    llm_concurrency: int = 4
+    anki_write_concurrency: int = 2
+
+    # Azure OpenAI rate limit（RPM / TPM 初始預算，之後依 x-ratelimit-* header 校正）+ retry
+    llm_rpm_limit: int = 300
+    llm_tpm_limit: int = 50_000
+    llm_max_retries: int = 6
+    llm_backoff_base: float = 1.0  # 秒，第 n 次重試最多等 base * 2^n
+    llm_backoff_max: float = 60.0
+
+    # LLM response cache（SQLite）
+    llm_cache_enabled: bool = True
+    llm_cache_path: str = "cache/llm_cache.sqlite3"
+    llm_cache_ttl_seconds: int = 30 * 24 * 3600
+    llm_cache_max_entries: int = 50_000
     model_config = SettingsConfigDict(
         env_file=".env", extra="ignore"
     )
@@ -135,6 +240,11 @@ def get_listening_settings() -> ListeningSettings:
     return ListeningSettings()
 
 
+@lru_cache()
+def get_tts_settings() -> TTSSettings:
+    return TTSSettings()
+
+
 @lru_cache()
 def get_app_settings() -> AppSettings:
     return AppSettings()
@@ -0,0 +1,125 @@
+"""
+LangGraph checkpoint：graph 每完成一個 node 就把 state 存進 SQLite。
+
+run 失敗時（例如 Anki 關閉導致 send_to_anki 失敗）checkpoint 保留在失敗的 node，
+同一個 word / sentence 重試時從該 node 繼續，不再重跑已完成的 LLM / TTS。
+run 成功後刪除該 thread 的 checkpoint，因此資料庫只保留未完成的 run。
+"""
+
+import asyncio
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Optional, Sequence
+from weakref import WeakValueDictionary
+
+import aiosqlite
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+from src.config import get_app_settings
+from src.utils.logger import console
+
+# 重試時需與原 run 相同的輸入；不同時捨棄舊 checkpoint 重新執行
+_RESUME_KEYS = ("force_update", "chinese_translation")
+
+
+class GraphCheckpointer(BaseCheckpointSaver):
+    """
+    SQLite checkpointer whose connection is opened on the running event loop.
+
+    graph 在 import 時 compile，但 AsyncSqliteSaver 必須在 event loop 內建立，
+    因此這裡只做轉接：第一次使用（或 lifespan 呼叫 start）時才開啟連線。
+    """
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        self._saver: Optional[AsyncSqliteSaver] = None
+        self._start_lock = asyncio.Lock()
+
+    async def start(self) -> AsyncSqliteSaver:
+        async with self._start_lock:
+            if self._saver is None:
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+                saver = AsyncSqliteSaver(await aiosqlite.connect(self.path))
+                await saver.setup()
+                self._saver = saver
+        return self._saver
+
+    async def close(self):
+        if self._saver is not None:
+            await self._saver.conn.close()
+            self._saver = None
+
+    async def aget_tuple(self, config):
+        return await (await self.start()).aget_tuple(config)
+
+    async def alist(self, config, *, filter=None, before=None, limit=None) -> AsyncIterator:
+        saver = await self.start()
+        async for item in saver.alist(config, filter=filter, before=before, limit=limit):
+            yield item
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        return await (await self.start()).aput(config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config, writes: Sequence, task_id: str, task_path: str = ""):
+        return await (await self.start()).aput_writes(config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str):
+        await (await self.start()).adelete_thread(thread_id)
+
+    async def aget_delta_channel_history(self, *, config, channels):
+        return await (await self.start()).aget_delta_channel_history(
+            config=config, channels=channels
+        )
+
+    def get_next_version(self, current, channel):
+        # 與 AsyncSqliteSaver 相同的 version 格式
+        return AsyncSqliteSaver.get_next_version(self, current, channel)
+
+
+@lru_cache()
+def get_graph_checkpointer() -> Optional[GraphCheckpointer]:
+    settings = get_app_settings()
+    if not settings.graph_checkpoint_enabled:
+        return None
+    return GraphCheckpointer(settings.graph_checkpoint_path)
+
+
+# 同一個 thread 同時只允許一個 run（batch 內重複的 word 會共用 thread_id）
+_thread_locks: "WeakValueDictionary[str, asyncio.Lock]" = WeakValueDictionary()
+
+
+async def ainvoke_resumable(app, state: Dict[str, Any], thread_id: str) -> Dict[str, Any]:
+    """
+    Invoke a compiled graph, resuming the thread's unfinished run if there is one.
+
+    - 該 thread 有未完成的 checkpoint 且輸入相同 → 從失敗的 node 繼續
+    - 成功後刪除 checkpoint；失敗時保留，讓下一次重試接續
+    """
+    checkpointer = app.checkpointer
+    if not isinstance(checkpointer, BaseCheckpointSaver):
+        return await app.ainvoke(state)
+
+    config = {"configurable": {"thread_id": thread_id}}
+    lock = _thread_locks.setdefault(thread_id, asyncio.Lock())
+    async with lock:
+        snapshot = await app.aget_state(config)
+        resume = bool(snapshot.next)
+        if resume and any(
+            state.get(key) != snapshot.values.get(key) for key in _RESUME_KEYS if key in state
+        ):
+            await checkpointer.adelete_thread(thread_id)
+            resume = False
+        elif resume:
+            console.log(
+                f"[checkpoint] {thread_id}: resume from {', '.join(snapshot.next)}",
+                markup=False,
+            )
+        elif snapshot.values:
+            # 上一次 run 已結束但未清除（例如刪除前中斷），不沿用舊 state
+            await checkpointer.adelete_thread(thread_id)
+
+        result = await app.ainvoke(None if resume else state, config)
+        await checkpointer.adelete_thread(thread_id)
+        return result
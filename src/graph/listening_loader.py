@@ -1,4 +1,5 @@
 from langgraph.graph import StateGraph, START, END
+from src.graph.checkpoint import get_graph_checkpointer
 from src.models.listening_state import ListeningState
 from src.nodes.listening import (
     check_duplicate,
@@ -41,7 +42,8 @@ def build_listening_graph():
     graph.add_edge("build_card", "send_to_anki")
     graph.add_edge("send_to_anki", END)
 
-    return graph.compile()
+    # checkpoint 以 thread_id（listening:<sentence>）區分，見 ainvoke_resumable
+    return graph.compile(checkpointer=get_graph_checkpointer())
 
 
 def get_listening_graph_app():
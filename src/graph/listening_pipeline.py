@@ -0,0 +1,118 @@
+"""
+Listening batch pipeline：以 stage 為單位的 worker pool。
+
+每個 stage 有自己的 queue 與 worker 數，句子完成一個 stage 就往下一個 queue 送，
+因此某句 gTTS 很慢時不會卡住下一句的翻譯。stage 的內容直接沿用 listening graph 的 nodes。
+
+    dedup → translate → tts → upload → write
+"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Sequence, Tuple
+
+from src.config import get_listening_settings
+from src.models.listening_state import ListeningState
+from src.nodes.listening import (
+    check_duplicate,
+    translate_sentence,
+    generate_tts,
+    store_audio,
+    build_card,
+    send_to_anki,
+)
+
+Node = Callable[[ListeningState], Awaitable[dict]]
+
+
+@dataclass
+class Stage:
+    name: str
+    nodes: Sequence[Node]
+    workers: int
+
+
+@dataclass
+class _Item:
+    index: int
+    state: ListeningState
+
+
+def build_listening_stages() -> List[Stage]:
+    settings = get_listening_settings()
+    return [
+        Stage("dedup", [check_duplicate], settings.pipeline_dedup_workers),
+        Stage("translate", [translate_sentence], settings.pipeline_translate_workers),
+        Stage("tts", [generate_tts], settings.pipeline_tts_workers),
+        Stage("upload", [store_audio], settings.pipeline_upload_workers),
+        Stage("write", [build_card, send_to_anki], settings.pipeline_write_workers),
+    ]
+
+
+async def iter_listening_pipeline(
+    states: Sequence[ListeningState], stages: Optional[List[Stage]] = None
+) -> AsyncIterator[Tuple[int, ListeningState | Exception]]:
+    """
+    Run listening states through the staged pipeline, yielding `(index, result)`
+    as each sentence finishes. 失敗的句子 result 為 Exception。
+    各 stage queue 有上限，輸入由 producer 逐筆送入，記憶體用量不隨 batch 大小成長。
+    """
+    stages = stages or build_listening_stages()
+    queue_size = get_listening_settings().pipeline_queue_size
+    queues = [asyncio.Queue(maxsize=queue_size) for _ in stages]
+    done: asyncio.Queue = asyncio.Queue()
+
+    async def _worker(stage_idx: int):
+        stage = stages[stage_idx]
+        queue = queues[stage_idx]
+        while True:
+            item: _Item = await queue.get()
+            try:
+                for node in stage.nodes:
+                    item.state = {**item.state, **await node(item.state)}
+
+                # 與 graph 的 conditional edge 相同：check_duplicate 判定 skip 即結束
+                finished = stage_idx == len(stages) - 1 or (
+                    stage.name == "dedup" and item.state.get("exists") is not False
+                )
+                if finished:
+                    done.put_nowait((item.index, item.state))
+                else:
+                    await queues[stage_idx + 1].put(item)
+            except Exception as e:
+                done.put_nowait((item.index, e))
+            finally:
+                queue.task_done()
+
+    async def _produce():
+        for index, state in enumerate(states):
+            await queues[0].put(_Item(index, dict(state)))
+
+    workers = [
+        asyncio.create_task(_worker(i))
+        for i, stage in enumerate(stages)
+        for _ in range(max(1, stage.workers))
+    ]
+    producer = asyncio.create_task(_produce())
+    try:
+        for _ in range(len(states)):
+            yield await done.get()
+        await producer
+    finally:
+        producer.cancel()
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(producer, *workers, return_exceptions=True)
+
+
+async def run_listening_pipeline(
+    states: Sequence[ListeningState], stages: Optional[List[Stage]] = None
+) -> List[ListeningState | Exception]:
+    """
+    Run listening states through the staged pipeline.
+    回傳順序與輸入相同；失敗的句子對應位置為 Exception。
+    """
+    results: List[ListeningState | Exception | None] = [None] * len(states)
+    async for index, result in iter_listening_pipeline(states, stages):
+        results[index] = result
+    return results
@@ -1,9 +1,13 @@
+from typing import Optional
 from langgraph.graph import StateGraph, START, END
+from src.config import get_app_settings
+from src.graph.checkpoint import get_graph_checkpointer
 from src.models.vocab_state import VocabState
 from src.nodes.vocab import (
     parse_word,
     send_to_anki,
     extract_root,
+    analyze_word,
     check_duplicate,
     build_tags,
     build_examples,
@@ -12,13 +16,31 @@ from src.nodes.vocab import (
 )
 
 
-def build_vocab_graph():
+def _route_after_check(state: VocabState) -> str:
+    if state.get("exists") is not False:
+        return "skip"
+    if state.get("llm_prefilled"):
+        return "prefilled"
+    return "continue"
+
+
+def build_vocab_graph(llm_mode: Optional[str] = None):
+    """
+    llm_mode:
+      - "split"   : fanout → parse_word + extract_root（兩次 LLM 呼叫）
+      - "combined": analyze_word（一次 structured output 呼叫）
+    未指定時使用 VOCAB_LLM_MODE 設定。
+    """
+    llm_mode = llm_mode or get_app_settings().vocab_llm_mode
     graph = StateGraph(VocabState)
 
     graph.add_node("check_duplicate", check_duplicate)
-    graph.add_node("fanout", lambda _: {})
-    graph.add_node("parse_word", parse_word)
-    graph.add_node("extract_root", extract_root)
+    if llm_mode == "combined":
+        graph.add_node("analyze_word", analyze_word)
+    else:
+        graph.add_node("fanout", lambda _: {})
+        graph.add_node("parse_word", parse_word)
+        graph.add_node("extract_root", extract_root)
     graph.add_node("build_tags", build_tags)
     graph.add_node("build_examples", build_examples)
     graph.add_node("generate_tts", generate_tts)
@@ -31,22 +53,28 @@ def build_vocab_graph():
     # check_duplicate：
     # - note 存在 & force=False  -> exists=True
     # - 其餘情況（新字或強制更新） -> exists=False
+    # - llm_prefilled：多字批次 LLM 已填好結果 -> 直接 build_tags
     graph.add_conditional_edges(
         "check_duplicate",
-        lambda s: "continue" if s.get("exists") is False else "skip",
+        _route_after_check,
         {
             "skip": END,  # 有舊卡且不強制更新 -> 直接結束
-            "continue": "fanout",  # 需要處理 -> fanout
+            "prefilled": "build_tags",
+            # 需要處理 -> fanout（split）或 analyze_word（combined）
+            "continue": "analyze_word" if llm_mode == "combined" else "fanout",
         },
     )
 
-    # fanout：在「需要處理」的情況下，同時跑兩個 node
-    graph.add_edge("fanout", "parse_word")
-    graph.add_edge("fanout", "extract_root")
+    if llm_mode == "combined":
+        graph.add_edge("analyze_word", "build_tags")
+    else:
+        # fanout：在「需要處理」的情況下，同時跑兩個 node
+        graph.add_edge("fanout", "parse_word")
+        graph.add_edge("fanout", "extract_root")
 
-    # 平行完成後匯流到 build_tags
-    graph.add_edge("parse_word", "build_tags")
-    graph.add_edge("extract_root", "build_tags")
+        # 平行完成後匯流到 build_tags
+        graph.add_edge("parse_word", "build_tags")
+        graph.add_edge("extract_root", "build_tags")
 
     # 後續流程：build_examples -> TTS -> store_audio -> send_to_anki
     graph.add_edge("build_tags", "build_examples")
@@ -55,8 +83,9 @@ def build_vocab_graph():
     graph.add_edge("store_audio", "send_to_anki")
     graph.add_edge("send_to_anki", END)
 
-    return graph.compile()
+    # checkpoint 以 thread_id（vocab:<mode>:<word>）區分，見 ainvoke_resumable
+    return graph.compile(checkpointer=get_graph_checkpointer())
 
 
-def get_vocab_graph_app():
-    return build_vocab_graph()
+def get_vocab_graph_app(llm_mode: Optional[str] = None):
+    return build_vocab_graph(llm_mode)
@@ -11,8 +11,7 @@ class ListeningState(TypedDict, total=False):
     translation_source: Literal["user", "llm"]
 
     # TTS node output
-    audio_bytes: bytes
-    audio_filename: str
+    audio_filename: str  # 音檔本身在本地 media 目錄，不放進 state
 
     # Store audio node output
     audio_stored: bool
@@ -30,6 +29,8 @@ class ListeningState(TypedDict, total=False):
     # Control flags
     force_update: bool
     exists: Optional[bool]
+    preflight_checked: bool  # batch 已預先查重，anki_note_id 即為結果
+    llm_prefilled: bool  # offline batch job 已填好 translation
 
     # Tags
     tags: List[str]
@@ -15,8 +15,7 @@ class VocabState(TypedDict, total=False):
     pos_zh: str  # 詞性中文（規則轉換）
 
     # TTS audio output
-    audio_bytes: bytes  # TTS 音檔 bytes
-    audio_filename: str  # 音檔檔名
+    audio_filename: str  # 音檔檔名（音檔本身在本地 media 目錄，不放進 state）
 
     # send_to_anki node output
     anki_note_id: Optional[int]
@@ -28,3 +27,5 @@ class VocabState(TypedDict, total=False):
     # anki update control
     force_update: Optional[bool]  # 是否強制更新已存在的 Anki
     exists: Optional[bool]  # 是否已存在（重複檢查結果）
+    preflight_checked: Optional[bool]  # batch 已預先查重，anki_note_id 即為結果
+    llm_prefilled: Optional[bool]  # 多字批次 LLM 已填好 meaning/pos/examples/root
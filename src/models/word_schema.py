@@ -1,5 +1,6 @@
 from typing import Literal, List
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
+from src.models.root_schema import validate_root_value
 
 
 class ExampleItem(BaseModel):
@@ -17,3 +18,26 @@ class WordParseOutput(BaseModel):
     examples: List[ExampleItem] = Field(
         description="兩句例句：第一句 casual（요體），第二句 formal（ㅂ니다體）。"
     )
+
+
+class WordAnalysisOutput(WordParseOutput):
+    """parse_word + extract_root 合併模式（單次 structured output）。"""
+
+    root: str = Field(
+        description="字源：漢字詞輸出一個對應漢字（如 學），純韓語詞（고유어）輸出 N。"
+    )
+
+    @field_validator("root")
+    def validate_root(cls, v):
+        return validate_root_value(v)
+
+
+class WordAnalysisBatchItem(WordAnalysisOutput):
+    index: int = Field(description="輸入清單中的編號（從 1 開始），必須與輸入一致。")
+    input: str = Field(description="該編號的輸入單字，原樣照抄（不轉成原形）。")
+
+
+class WordAnalysisBatchOutput(BaseModel):
+    """多字批次模式：一次 completion 解析多個單字（結構描述用，逐項驗證）。"""
+
+    items: List[WordAnalysisBatchItem] = Field(description="每個輸入單字各一筆，依輸入順序。")
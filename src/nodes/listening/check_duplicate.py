@@ -9,7 +9,11 @@ anki = get_listening_anki_service()
 async def check_duplicate(state: ListeningState):
     """Check if a listening card for this sentence already exists."""
     sentence = state["korean_sentence"]
-    note_id = await anki.find_listening_note(sentence)
+    # batch 已預先查重 → 直接使用 state 內的結果，不再查詢 Anki
+    if state.get("preflight_checked"):
+        note_id = state.get("anki_note_id")
+    else:
+        note_id = await anki.find_listening_note(sentence)
     force = state.get("force_update", False)
 
     if not note_id:
@@ -1,17 +1,16 @@
-import hashlib
 from src.models.listening_state import ListeningState
-from src.utils.tts import generate_korean_tts
+from src.utils.tts import media_filename, prepare_korean_tts
 from src.utils.logger import node_logger
 
 
 @node_logger
 async def generate_tts(state: ListeningState):
-    """Generate TTS audio from Korean sentence using gTTS."""
+    """Generate TTS audio from Korean sentence (kept in the local audio cache)."""
     sentence = state["korean_sentence"]
 
-    # Generate unique filename based on sentence hash
-    sentence_hash = hashlib.md5(sentence.encode()).hexdigest()[:12]
-    filename = f"listening_{sentence_hash}.mp3"
+    # Unique filename based on sentence + TTS voice (different voices never share a filename)
+    filename = media_filename("listening", sentence)
 
-    audio_bytes = await generate_korean_tts(sentence)
-    return {"audio_bytes": audio_bytes, "audio_filename": filename}
+    # 音檔寫入本地 audio cache，state / checkpoint 只帶檔名
+    await prepare_korean_tts(sentence)
+    return {"audio_filename": filename}
@@ -1,5 +1,6 @@
 from src.models.listening_state import ListeningState
 from src.service.listening_anki_service import get_listening_anki_service
+from src.utils.anki import AnkiDuplicateError, AnkiNoteNotFoundError
 from src.utils.logger import node_logger
 
 anki = get_listening_anki_service()
@@ -7,19 +8,37 @@ anki = get_listening_anki_service()
 
 @node_logger
 async def send_to_anki(state: ListeningState):
-    """Add or update the listening card in Anki."""
+    """
+    Add or update the listening card in Anki.
+    Trusts the note id resolved by check_duplicate; only re-queries Anki
+    when the note changed in between (deleted, or added concurrently).
+    """
     sentence = state["korean_sentence"]
     audio_filename = state["audio_filename"]
     translation = state["translation"]
     tags = state.get("tags", [])
 
-    note_id = await anki.find_listening_note(sentence)
-
+    note_id = state.get("anki_note_id")
     if note_id:
+        try:
+            await anki.update_listening_note(
+                note_id, audio_filename, sentence, translation, tags
+            )
+            return {"anki_note_id": note_id}
+        except AnkiNoteNotFoundError:
+            pass
+
+    try:
+        new_id = await anki.add_listening_note(audio_filename, sentence, translation, tags)
+    except AnkiDuplicateError:
+        note_id = await anki.find_listening_note(sentence)
+        if not note_id:
+            raise
+        if not state.get("force_update"):
+            return {"exists": True, "anki_note_id": note_id}
         await anki.update_listening_note(
             note_id, audio_filename, sentence, translation, tags
         )
         return {"anki_note_id": note_id}
 
-    new_id = await anki.add_listening_note(audio_filename, sentence, translation, tags)
     return {"anki_note_id": new_id}
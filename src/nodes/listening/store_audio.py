@@ -1,10 +1,13 @@
 from src.models.listening_state import ListeningState
 from src.utils.anki import store_media_file
+from src.utils.tts import korean_tts_file
 from src.utils.logger import node_logger
 
 
 @node_logger
 async def store_audio(state: ListeningState) -> dict:
-    """Store audio file in Anki media collection."""
-    await store_media_file(state["audio_bytes"], state["audio_filename"])
+    """Store audio file in Anki media collection (skipped if already present)."""
+    # 重新定位本地檔案（checkpoint resume 或檔案被淘汰時會重新生成）
+    async with korean_tts_file(state["korean_sentence"]) as path:
+        await store_media_file(path, state["audio_filename"])
     return {"audio_stored": True}
@@ -1,3 +1,4 @@
+from typing import Dict, Any
 from src.models.listening_state import ListeningState
 from src.utils.llm import ask_llm
 from src.utils.prompt_loader import load_prompt
@@ -6,6 +7,26 @@ from src.utils.logger import node_logger
 CNF = load_prompt("translate_sentence")
 
 
+def build_translate_request(korean: str) -> Dict[str, Any]:
+    """ask_llm kwargs for one sentence（node 與 offline batch job 共用）。"""
+    return {
+        "model": CNF["parameters"]["model"],
+        "system_prompt": CNF["system_prompt"],
+        "user_prompt": CNF["user_prompt"].format(sentence=korean),
+        "temperature": CNF["parameters"]["temperature"],
+        "max_tokens": CNF["parameters"]["max_tokens"],
+        "cache": CNF["parameters"].get("cache", True),
+        "tag": CNF["name"],
+    }
+
+
+def translate_response(result: str) -> Dict[str, Any]:
+    translation = result.strip()
+    if not translation:
+        raise ValueError("empty translation")
+    return {"translation": translation, "translation_source": "llm"}
+
+
 @node_logger
 async def translate_sentence(state: ListeningState):
     """Translate Korean sentence to Chinese using LLM if not provided."""
@@ -14,14 +35,11 @@ async def translate_sentence(state: ListeningState):
     if user_translation and user_translation.strip():
         return {"translation": user_translation.strip(), "translation_source": "user"}
 
-    korean = state["korean_sentence"]
-    user_prompt = CNF["user_prompt"].format(sentence=korean)
+    # offline batch job 已翻譯好
+    if state.get("llm_prefilled") and state.get("translation"):
+        return {}
 
     result = await ask_llm(
-        model=CNF["parameters"]["model"],
-        system_prompt=CNF["system_prompt"],
-        user_prompt=user_prompt,
-        temperature=CNF["parameters"]["temperature"],
-        max_tokens=CNF["parameters"]["max_tokens"],
+        **build_translate_request(state["korean_sentence"]), validate=translate_response
     )
-    return {"translation": result.strip(), "translation_source": "llm"}
+    return translate_response(result)
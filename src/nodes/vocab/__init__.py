@@ -1,6 +1,7 @@
 from .check_duplicate import check_duplicate
 from .parse_word import parse_word
 from .extract_root import extract_root
+from .analyze_word import analyze_word, analyze_words_batch
 from .build_tags import build_tags
 from .build_examples import build_examples
 from .generate_tts import generate_tts
@@ -11,6 +12,8 @@ __all__ = [
     "check_duplicate",
     "parse_word",
     "extract_root",
+    "analyze_word",
+    "analyze_words_batch",
     "build_tags",
     "build_examples",
     "generate_tts",
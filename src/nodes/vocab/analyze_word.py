@@ -0,0 +1,157 @@
+import json
+from typing import Dict, Any, List, Optional
+
+from pydantic import ValidationError
+
+from src.models.vocab_state import VocabState
+from src.models.word_schema import (
+    WordAnalysisOutput,
+    WordAnalysisBatchItem,
+    WordAnalysisBatchOutput,
+)
+from src.utils.llm import ask_llm, structured_response_format
+from src.utils.korean import normalize_key
+from src.utils.lexicon import get_lexicon
+from src.nodes.vocab.extract_root import root_fields
+from src.utils.prompt_loader import load_prompt
+from src.utils.logger import node_logger, console
+
+# Load config from YAML
+CNF = load_prompt("analyze_word")
+RESPONSE_FORMAT = structured_response_format(WordAnalysisOutput, "word_analysis")
+
+BATCH_CNF = load_prompt("analyze_words_batch")
+BATCH_RESPONSE_FORMAT = structured_response_format(
+    WordAnalysisBatchOutput, "word_analysis_batch"
+)
+
+
+def _to_state(parsed: WordAnalysisOutput) -> Dict[str, Any]:
+    return {
+        "meaning": parsed.meaning,
+        "pos": parsed.pos,
+        "examples": [ex.model_dump() for ex in parsed.examples],
+        **root_fields(parsed.root),
+    }
+
+
+def _batch_items(response: str) -> List[Any]:
+    # 個別 item 的驗證在下方逐筆進行；這裡只確認整體是可用的 JSON
+    items = json.loads(response).get("items")
+    if not isinstance(items, list):
+        raise ValueError("batch response has no `items` list")
+    return items
+
+
+async def _lookup_lexicon(word: str) -> Optional[Dict[str, Any]]:
+    """完整的 lexicon 結果（parse + root 都有）才算命中。"""
+    lexicon = get_lexicon()
+    if lexicon is None:
+        return None
+    entry = await lexicon.lookup_parse(word)
+    root_value = await lexicon.lookup_root(word) if entry is not None else None
+    if root_value is None:
+        return None
+    return {**entry, **root_fields(root_value)}
+
+
+async def _remember(word: str, state: Dict[str, Any]):
+    lexicon = get_lexicon()
+    if lexicon is not None:
+        await lexicon.remember(word, **state)
+
+
+@node_logger
+async def analyze_word(state: VocabState) -> Dict[str, Any]:
+    """
+    合併模式：一次 LLM 呼叫取得 parse_word + extract_root 的結果。
+    使用 structured output（json_schema），不需 format instructions 與文字解析。
+    """
+    word = state["word"]
+    cached = await _lookup_lexicon(word)
+    if cached is not None:
+        return cached
+
+    user_prompt = CNF["user_prompt"].format(word=word)
+
+    try:
+        response = await ask_llm(
+            model=CNF["parameters"]["model"],
+            system_prompt=CNF["system_prompt"],
+            user_prompt=user_prompt,
+            temperature=CNF["parameters"]["temperature"],
+            max_tokens=CNF["parameters"]["max_tokens"],
+            cache=CNF["parameters"].get("cache", True),
+            tag=CNF["name"],
+            response_format=RESPONSE_FORMAT,
+            validate=WordAnalysisOutput.model_validate_json,
+        )
+
+        parsed = WordAnalysisOutput.model_validate_json(response)
+
+    except Exception as e:
+        raise RuntimeError(f"[analyze_word] LLM Error: {e}")
+
+    result = _to_state(parsed)
+    await _remember(word, result)
+    return result
+
+
+async def analyze_words_batch(words: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    多字批次模式：一次 completion 解析多個單字，拆回每個單字的 state 欄位。
+    每筆結果各自驗證；驗證失敗或缺漏的單字不會出現在回傳值中，
+    由 graph 照原本流程逐字重跑。
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    for word in words:
+        cached = await _lookup_lexicon(word)
+        if cached is not None:
+            results[word] = cached
+    # 只把 lexicon 沒有的單字送進 LLM
+    words = [word for word in words if word not in results]
+    if not words:
+        return results
+
+    word_list = "\n".join(f"{i}. {word}" for i, word in enumerate(words, start=1))
+    try:
+        response = await ask_llm(
+            model=BATCH_CNF["parameters"]["model"],
+            system_prompt=BATCH_CNF["system_prompt"],
+            user_prompt=BATCH_CNF["user_prompt"].format(word_list=word_list),
+            temperature=BATCH_CNF["parameters"]["temperature"],
+            max_tokens=BATCH_CNF["parameters"]["max_tokens_per_word"] * len(words),
+            cache=BATCH_CNF["parameters"].get("cache", True),
+            tag=BATCH_CNF["name"],
+            response_format=BATCH_RESPONSE_FORMAT,
+            validate=_batch_items,
+        )
+        items = _batch_items(response)
+    except Exception as e:
+        console.log(f"[analyze_words_batch] batch failed, fallback per word: {e}", markup=False)
+        return results
+
+    parsed_count = 0
+    for item in items:
+        try:
+            parsed = WordAnalysisBatchItem.model_validate(item)
+        except (TypeError, ValidationError):
+            continue
+        index = parsed.index
+        # index 與回傳的 input 必須對得上，避免模型漏字 / 錯位時把結果配到別的單字
+        if not 1 <= index <= len(words):
+            continue
+        if normalize_key(parsed.input) != normalize_key(words[index - 1]):
+            continue
+        if words[index - 1] not in results:
+            results[words[index - 1]] = _to_state(parsed)
+            await _remember(words[index - 1], results[words[index - 1]])
+            parsed_count += 1
+
+    if parsed_count < len(words):
+        console.log(
+            f"[analyze_words_batch] {len(words) - parsed_count}/{len(words)} words "
+            "failed validation, retrying one at a time",
+            markup=False,
+        )
+    return results
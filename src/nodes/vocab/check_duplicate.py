@@ -6,9 +6,26 @@ anki = get_vocab_anki_service()
 @node_logger
 async def check_duplicate(state):
     word = state["word"]
-    note_id = await anki.find_note(word)
+    # 正規化 index（NFC/NFD、空白、jamo）：O(1)，寫法不同的同一個字也算重複；
+    # 也涵蓋同一個 batch 中已先完成的變體
+    index = anki.index
+    preflight = state.get("preflight_checked")
+    if preflight:
+        # batch 已預先查重（find_notes_bulk 已向 Anki 確認）→ 直接使用 state 內的結果
+        note_id = state.get("anki_note_id")
+        candidate = index.get(word) if note_id is None else None
+    else:
+        note_id = None
+        candidate = index.get(word) if index.loaded else None
+
+    if candidate is not None:
+        # index 命中可能已過期或只是正規化 key 相同 → 以 notesInfo 確認後才算重複
+        note_id = (await index.confirm({word: candidate})).get(word)
+    if note_id is None and not preflight:
+        # index miss → 以 Anki 精確查詢確認（涵蓋背景同步前在 Anki 新增的 note）
+        note_id = await anki.find_note(word)
     force = state.get("force_update", False)
-    
+
     # 1) 完全沒 note: 新增
     if not note_id:
         return {"exists": False}
@@ -4,6 +4,7 @@ from langchain_core.output_parsers import PydanticOutputParser
 from src.models.root_schema import RootOutput
 from src.models.vocab_state import VocabState
 from src.utils.llm import ask_llm
+from src.utils.lexicon import get_lexicon
 from src.utils.prompt_loader import load_prompt
 from src.utils.logger import node_logger
 
@@ -12,6 +13,33 @@ CNF = load_prompt("extract_root")
 parser = PydanticOutputParser(pydantic_object=RootOutput)
 
 
+def build_extract_root_request(word: str) -> Dict[str, Any]:
+    """ask_llm kwargs for one word（node 與 offline batch job 共用）。"""
+    return {
+        "model": CNF["parameters"]["model"],
+        "system_prompt": CNF["system_prompt"],
+        "user_prompt": CNF["user_prompt"].format(
+            word=word, format_instructions=parser.get_format_instructions()
+        ),
+        "temperature": CNF["parameters"]["temperature"],
+        "max_tokens": CNF["parameters"]["max_tokens"],
+        "cache": CNF["parameters"].get("cache", True),
+        "tag": CNF["name"],
+    }
+
+
+def root_fields(root_value: str) -> Dict[str, Any]:
+    return {
+        "root": root_value,
+        "root_tag": "native_kor" if root_value == "N" else f"root_{root_value}",
+    }
+
+
+def extract_root_response(result: str) -> Dict[str, Any]:
+    parsed: RootOutput = parser.parse(result)
+    return root_fields(parsed.root.strip())
+
+
 @node_logger
 async def extract_root(state: VocabState) -> Dict[str, Any]:
     """
@@ -21,17 +49,16 @@ async def extract_root(state: VocabState) -> Dict[str, Any]:
     後續自動轉為 Tag（root_學 / native_kor）
     """
     word = state["word"]
-    user_prompt = CNF["user_prompt"].format(
-        word=word, format_instructions=parser.get_format_instructions()
-    )
+
+    # lexicon 命中 → 略過 LLM
+    lexicon = get_lexicon()
+    if lexicon is not None:
+        root_value = await lexicon.lookup_root(word)
+        if root_value is not None:
+            return root_fields(root_value)
+
     try:
-        result = await ask_llm(
-            model=CNF["parameters"]["model"],
-            system_prompt=CNF["system_prompt"],
-            user_prompt=user_prompt,
-            temperature=CNF["parameters"]["temperature"],
-            max_tokens=CNF["parameters"]["max_tokens"],
-        )
+        result = await ask_llm(**build_extract_root_request(word), validate=extract_root_response)
     except Exception as e:
         return {
             "root": None,
@@ -39,10 +66,7 @@ async def extract_root(state: VocabState) -> Dict[str, Any]:
             "root_error": str(e),
         }
 
-    parsed: RootOutput = parser.parse(result)
-    root_value = parsed.root.strip()
-
-    return {
-        "root": root_value,
-        "root_tag": "native_kor" if root_value == "N" else f"root_{root_value}",
-    }
+    fields = extract_root_response(result)
+    if lexicon is not None:
+        await lexicon.remember(word, root=fields["root"])
+    return fields
@@ -1,17 +1,16 @@
-import hashlib
 from src.models.vocab_state import VocabState
-from src.utils.tts import generate_korean_tts
+from src.utils.tts import media_filename, prepare_korean_tts
 from src.utils.logger import node_logger
 
 
 @node_logger
 async def generate_tts(state: VocabState):
-    """Generate TTS audio from Korean word using gTTS."""
+    """Generate TTS audio from Korean word (kept in the local audio cache)."""
     word = state["word"]
 
-    # Generate unique filename based on word hash
-    word_hash = hashlib.md5(word.encode()).hexdigest()[:12]
-    filename = f"vocab_{word_hash}.mp3"
+    # Unique filename based on word + TTS voice (different voices never share a filename)
+    filename = media_filename("vocab", word)
 
-    audio_bytes = await generate_korean_tts(word)
-    return {"audio_bytes": audio_bytes, "audio_filename": filename}
+    # 音檔寫入本地 audio cache，state / checkpoint 只帶檔名
+    await prepare_korean_tts(word)
+    return {"audio_filename": filename}
@@ -4,6 +4,7 @@ from src.models.vocab_state import VocabState
 from src.models.word_schema import WordParseOutput
 from src.utils.prompt_loader import load_prompt
 from src.utils.llm import ask_llm
+from src.utils.lexicon import get_lexicon
 from typing import Dict, Any
 from src.utils.logger import node_logger
 
@@ -17,27 +18,47 @@ parse_word_prompt = PromptTemplate(
     partial_variables={"format_instructions": output_parser.get_format_instructions()},
 )
 
+
+def build_parse_word_request(word: str) -> Dict[str, Any]:
+    """ask_llm kwargs for one word（node 與 offline batch job 共用）。"""
+    return {
+        "model": CNF["parameters"]["model"],
+        "system_prompt": CNF["system_prompt"],
+        "user_prompt": parse_word_prompt.format(word=word),
+        "temperature": CNF["parameters"]["temperature"],
+        "max_tokens": CNF["parameters"]["max_tokens"],
+        "cache": CNF["parameters"].get("cache", True),
+        "tag": CNF["name"],
+    }
+
+
+def parse_word_response(response: str) -> Dict[str, Any]:
+    parsed: WordParseOutput = output_parser.parse(response)
+    return {
+        "meaning": parsed.meaning,
+        "pos": parsed.pos,
+        "examples": [ex.model_dump() for ex in parsed.examples],
+    }
+
+
 @node_logger
 async def parse_word(state: VocabState) -> Dict[str, Any]:
     word = state["word"]
-    user_prompt = parse_word_prompt.format(word=word)
 
-    try:
-        response = await ask_llm(
-            model=CNF["parameters"]["model"],
-            system_prompt=CNF["system_prompt"],
-            user_prompt=user_prompt,
-            temperature=CNF["parameters"]["temperature"],
-            max_tokens=CNF["parameters"]["max_tokens"],
-        )
+    # lexicon 命中 → 略過 LLM
+    lexicon = get_lexicon()
+    if lexicon is not None:
+        entry = await lexicon.lookup_parse(word)
+        if entry is not None:
+            return entry
 
-        parsed: WordParseOutput = output_parser.parse(response)
+    try:
+        response = await ask_llm(**build_parse_word_request(word), validate=parse_word_response)
+        result = parse_word_response(response)
 
     except Exception as e:
         raise RuntimeError(f"[parse_word] LLM Error: {e}")
 
-    return {
-        "meaning": parsed.meaning,
-        "pos": parsed.pos,
-        "examples": [ex.model_dump() for ex in parsed.examples],
-    }
+    if lexicon is not None:
+        await lexicon.remember(word, **result)
+    return result
@@ -1,5 +1,6 @@
 from src.models.vocab_state import VocabState
 from src.service.vocab_anki_service import get_vocab_anki_service
+from src.utils.anki import AnkiDuplicateError, AnkiNoteNotFoundError
 from typing import Dict, Any
 from src.utils.logger import node_logger
 
@@ -10,38 +11,44 @@ anki = get_vocab_anki_service()
 async def send_to_anki(state: VocabState) -> Dict[str, Any]:
     """
     Node 任務：將解析好的資料寫入 Anki（使用獨立欄位儲存每一個值）。
-    - 先判斷是否存在
-    - 若存在 → update
-    - 若不存在 → add
+    - 直接使用 check_duplicate 放在 state 的 anki_note_id（不再重新查詢）
+    - 有 note_id → update；沒有 → add
+    - 查重之後 note 被刪除 / 被新增時才補查（optimistic concurrency）
     """
     word = state["word"]
-    audio_filename = state["audio_filename"]
-    meaning = state["meaning"]
-    pos_zh = state.get("pos_zh", "")
-    example_korean_1 = state.get("example_korean_1", "")
-    example_chinese_1 = state.get("example_chinese_1", "")
-    example_korean_2 = state.get("example_korean_2", "")
-    example_chinese_2 = state.get("example_chinese_2", "")
-    tags = state.get("tags", [])
-
-    # 1) 檢查是否應該 update
-    note_id = await anki.find_note(word)
+    fields = (
+        word,
+        state["audio_filename"],
+        state["meaning"],
+        state.get("pos_zh", ""),
+        state.get("example_korean_1", ""),
+        state.get("example_chinese_1", ""),
+        state.get("example_korean_2", ""),
+        state.get("example_chinese_2", ""),
+        state.get("tags", []),
+    )
 
-    # 2) 更新
+    # 1) 已知 note → 更新
+    note_id = state.get("anki_note_id")
     if note_id:
-        await anki.update_note(
-            note_id, word, audio_filename, meaning, pos_zh,
-            example_korean_1, example_chinese_1,
-            example_korean_2, example_chinese_2,
-            tags
-        )
+        try:
+            await anki.update_note(note_id, *fields)
+            return {"anki_note_id": note_id}
+        except AnkiNoteNotFoundError:
+            # 查重後 note 被刪除 → 改為新增
+            pass
+
+    # 2) 新增
+    try:
+        new_id = await anki.add_note(*fields)
+    except AnkiDuplicateError:
+        # 查重後同一個字已被新增（例如同 batch 內重複）→ 補查一次
+        note_id = await anki.find_note(word)
+        if not note_id:
+            raise
+        if not state.get("force_update"):
+            return {"exists": True, "anki_note_id": note_id}
+        await anki.update_note(note_id, *fields)
         return {"anki_note_id": note_id}
 
-    # 3) 新增
-    new_id = await anki.add_note(
-        word, audio_filename, meaning, pos_zh,
-        example_korean_1, example_chinese_1,
-        example_korean_2, example_chinese_2,
-        tags
-    )
     return {"anki_note_id": new_id}
@@ -1,4 +1,5 @@
 from .vocab import router as vocab_router
 from .listening import router as listening_router
+from .stats import router as stats_router
 
-__all__ = ["vocab_router", "listening_router"]
+__all__ = ["vocab_router", "listening_router", "stats_router"]
@@ -1,11 +1,22 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, ConfigDict
 from typing import List, Optional
 
+from src.graph.checkpoint import ainvoke_resumable
 from src.graph.listening_loader import get_listening_graph_app
+from src.graph.listening_pipeline import iter_listening_pipeline, run_listening_pipeline
+from src.nodes.listening.translate_sentence import build_translate_request, translate_response
+from src.service.listening_anki_service import get_listening_anki_service
+from src.service.bulk_job_service import BulkJob, get_bulk_job_service
+from src.service.job_queue import get_job_queue
+from src.utils.batch_llm import get_batch_llm_client
+from src.utils.streaming import StreamFormat, batch_progress_events, stream_events
 
 router = APIRouter(prefix="/listening", tags=["listening"])
 graph_app = get_listening_graph_app()
+listening_service = get_listening_anki_service()
+bulk_jobs = get_bulk_job_service()
+job_queue = get_job_queue()
 
 
 # ============== Request/Response Models ==============
@@ -50,7 +61,7 @@ class ListeningResponse(BaseModel):
                     "korean_sentence": "오늘 날씨가 좋아요",
                     "chinese_translation": "今天天氣很好",
                     "translation_source": "user",
-                    "audio_filename": "listening_abc123def456.mp3",
+                    "audio_filename": "listening_4be0a1c27d93e1f5.mp3",
                     "anki_note_id": 1234567890,
                 }
             ]
@@ -112,6 +123,10 @@ class BatchListeningResponse(BaseModel):
 # ============== Endpoints ==============
 
 
+def _thread_id(sentence: str) -> str:
+    return f"listening:{sentence}"
+
+
 @router.post("", response_model=ListeningResponse)
 async def create_listening_card(req: ListeningRequest):
     """Create a single listening Anki card with TTS audio."""
@@ -120,7 +135,9 @@ async def create_listening_card(req: ListeningRequest):
         "chinese_translation": req.chinese_translation,
         "force_update": req.force_update,
     }
-    result = await graph_app.ainvoke(initial_state)
+    result = await ainvoke_resumable(
+        graph_app, initial_state, _thread_id(req.korean_sentence)
+    )
 
     # Handle case when card already exists (skipped)
     if result.get("exists") is True:
@@ -143,47 +160,65 @@ async def create_listening_card(req: ListeningRequest):
     )
 
 
-@router.post("/batch", response_model=BatchListeningResponse)
-async def create_listening_cards_batch(req: BatchListeningRequest):
-    """Create multiple listening Anki cards with TTS audio."""
-    results = []
+def _to_batch_item(
+    sentence_req: ListeningBatchItem, result: dict | Exception
+) -> BatchListeningResultItem:
+    if isinstance(result, Exception):
+        return BatchListeningResultItem(
+            korean_sentence=sentence_req.korean_sentence,
+            status="failed",
+            error=str(result),
+        )
 
-    for sentence_req in req.sentences:
-        try:
-            initial_state = {
-                "korean_sentence": sentence_req.korean_sentence,
-                "chinese_translation": sentence_req.chinese_translation,
-                "force_update": req.force_update,
-            }
-            result = await graph_app.ainvoke(initial_state)
-
-            # Handle case when card already exists (skipped)
-            if result.get("exists") is True:
-                item = BatchListeningResultItem(
-                    korean_sentence=sentence_req.korean_sentence,
-                    status="skipped",
-                    chinese_translation="(已存在)",
-                    translation_source="skipped",
-                    audio_filename="(已存在)",
-                    anki_note_id=result["anki_note_id"],
-                )
-            else:
-                item = BatchListeningResultItem(
-                    korean_sentence=sentence_req.korean_sentence,
-                    status="success",
-                    chinese_translation=result["translation"],
-                    translation_source=result["translation_source"],
-                    audio_filename=result["audio_filename"],
-                    anki_note_id=result["anki_note_id"],
-                )
-        except Exception as e:
-            item = BatchListeningResultItem(
-                korean_sentence=sentence_req.korean_sentence,
-                status="failed",
-                error=str(e),
-            )
+    # Handle case when card already exists (skipped)
+    if result.get("exists") is True:
+        return BatchListeningResultItem(
+            korean_sentence=sentence_req.korean_sentence,
+            status="skipped",
+            chinese_translation="(已存在)",
+            translation_source="skipped",
+            audio_filename="(已存在)",
+            anki_note_id=result["anki_note_id"],
+        )
+
+    return BatchListeningResultItem(
+        korean_sentence=sentence_req.korean_sentence,
+        status="success",
+        chinese_translation=result["translation"],
+        translation_source=result["translation_source"],
+        audio_filename=result["audio_filename"],
+        anki_note_id=result["anki_note_id"],
+    )
 
-        results.append(item)
+
+def _batch_initial_states(
+    req: BatchListeningRequest, existing: dict[str, Optional[int]]
+) -> List[dict]:
+    return [
+        {
+            "korean_sentence": sentence_req.korean_sentence,
+            "chinese_translation": sentence_req.chinese_translation,
+            "force_update": req.force_update,
+            # 預先查重結果（check_duplicate 不再個別查詢 Anki）
+            "preflight_checked": True,
+            "anki_note_id": existing[sentence_req.korean_sentence],
+        }
+        for sentence_req in req.sentences
+    ]
+
+
+@router.post("/batch", response_model=BatchListeningResponse)
+async def create_listening_cards_batch(req: BatchListeningRequest):
+    """Create multiple listening Anki cards through the staged batch pipeline."""
+    existing = await listening_service.find_listening_notes_bulk(
+        [sentence_req.korean_sentence for sentence_req in req.sentences]
+    )
+    initial_states = _batch_initial_states(req, existing)
+    outputs = await run_listening_pipeline(initial_states)
+    results = [
+        _to_batch_item(sentence_req, output)
+        for sentence_req, output in zip(req.sentences, outputs)
+    ]
 
     success = sum(1 for r in results if r.status == "success")
     skipped = sum(1 for r in results if r.status == "skipped")
@@ -195,3 +230,214 @@ async def create_listening_cards_batch(req: BatchListeningRequest):
         success_count=success,
         fail_count=fail,
     )
+
+
+@router.post("/batch/stream")
+async def stream_listening_cards_batch(
+    req: BatchListeningRequest, format: StreamFormat = "ndjson"
+):
+    """
+    Create multiple listening Anki cards, streaming each result as it leaves the pipeline.
+    回傳 NDJSON（預設）或 SSE（`?format=sse`），event 格式同 `/vocab/batch/stream`。
+    """
+
+    async def _results():
+        # 查重在串流內進行，client 先收到 `start` event
+        existing = await listening_service.find_listening_notes_bulk(
+            [sentence_req.korean_sentence for sentence_req in req.sentences]
+        )
+        initial_states = _batch_initial_states(req, existing)
+        async for index, output in iter_listening_pipeline(initial_states):
+            yield index, _to_batch_item(req.sentences[index], output)
+
+    return stream_events(batch_progress_events(len(req.sentences), _results()), format)
+
+
+# ============== Offline Bulk Job (Batch API) ==============
+
+
+class BulkListeningJobResponse(BaseModel):
+    job_id: str
+    status: str
+    llm_batch_status: Optional[str] = None
+    total: int
+    success_count: int = 0
+    skip_count: int = 0
+    fail_count: int = 0
+    error: Optional[str] = None
+    results: List[BatchListeningResultItem] = []
+
+
+def _to_bulk_response(job: BulkJob) -> BulkListeningJobResponse:
+    success = sum(1 for r in job.results if r["status"] == "success")
+    skipped = sum(1 for r in job.results if r["status"] == "skipped")
+    return BulkListeningJobResponse(
+        job_id=job.job_id,
+        status=job.status,
+        llm_batch_status=job.llm_batch_status,
+        total=job.total,
+        success_count=success,
+        skip_count=skipped,
+        fail_count=len(job.results) - success - skipped,
+        error=job.error,
+        results=job.results,
+    )
+
+
+async def _run_listening_bulk(job: BulkJob) -> List[dict]:
+    """
+    未提供翻譯的句子一起送 Batch API 翻譯（batch id 立即保存），之後照常走 staged pipeline。
+    重啟後恢復時，已送出的 batch 直接繼續輪詢。
+    """
+    req = BatchListeningRequest(**job.params)
+    existing = await listening_service.find_listening_notes_bulk(
+        [sentence_req.korean_sentence for sentence_req in req.sentences]
+    )
+    initial_states = _batch_initial_states(req, existing)
+
+    requests = {}
+    if job.batch_id is None:
+        for i, state in enumerate(initial_states):
+            needs_llm = existing[state["korean_sentence"]] is None or req.force_update
+            if needs_llm and not (state["chinese_translation"] or "").strip():
+                requests[f"translate_sentence:{i}"] = build_translate_request(
+                    state["korean_sentence"]
+                )
+
+    async def _on_submit(batch_id: str):
+        job.batch_id = batch_id
+        await bulk_jobs.save(job)
+
+    job.status = "llm_batch"
+    await bulk_jobs.save(job)
+    batch_client = get_batch_llm_client()
+    outputs = await batch_client.run(
+        requests,
+        on_status=lambda status: setattr(job, "llm_batch_status", status),
+        batch_id=job.batch_id,
+        on_submit=_on_submit,
+    )
+    # custom_id = "translate_sentence:<index>"，重啟後可由 custom_id 還原請求
+    requests = {
+        custom_id: build_translate_request(
+            initial_states[int(custom_id.split(":", 1)[1])]["korean_sentence"]
+        )
+        for custom_id in outputs
+    }
+    # 空白翻譯視為失敗，交給 graph 逐句重跑；只有有效的輸出寫入 LLM cache
+    valid = {custom_id: content for custom_id, content in outputs.items() if content.strip()}
+    await batch_client.warm_cache(requests, valid)
+    for custom_id, content in valid.items():
+        state = initial_states[int(custom_id.split(":", 1)[1])]
+        state.update(translate_response(content), llm_prefilled=True)
+
+    job.status = "running"
+    await bulk_jobs.save(job)
+    outputs = await run_listening_pipeline(initial_states)
+    return [
+        _to_batch_item(sentence_req, output).model_dump()
+        for sentence_req, output in zip(req.sentences, outputs)
+    ]
+
+
+bulk_jobs.register("listening", _run_listening_bulk)
+
+
+@router.post("/bulk", response_model=BulkListeningJobResponse, status_code=202)
+async def submit_listening_bulk_job(req: BatchListeningRequest):
+    """Submit an offline bulk import using the Batch API for translations."""
+    try:
+        get_batch_llm_client().check_offline()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    job = await bulk_jobs.submit("listening", len(req.sentences), req.model_dump())
+    return _to_bulk_response(job)
+
+
+@router.get("/bulk/{job_id}", response_model=BulkListeningJobResponse)
+async def get_listening_bulk_job(job_id: str):
+    """Check the status of an offline bulk import."""
+    job = await bulk_jobs.get(job_id, kind="listening")
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Bulk job not found: {job_id}")
+    return _to_bulk_response(job)
+
+
+# ============== Durable Job Queue ==============
+
+
+class ListeningJobResponse(BaseModel):
+    job_id: str
+    status: str  # queued / running / completed / cancelled
+    total: int
+    pending_count: int = 0
+    success_count: int = 0
+    skip_count: int = 0
+    fail_count: int = 0
+    cancelled_count: int = 0
+    results: List[BatchListeningResultItem] = []
+
+
+async def _run_listening_job_item(payload: dict, force_update: bool) -> dict:
+    sentence_req = ListeningBatchItem(**payload)
+    try:
+        result = await ainvoke_resumable(
+            graph_app,
+            {
+                "korean_sentence": sentence_req.korean_sentence,
+                "chinese_translation": sentence_req.chinese_translation,
+                "force_update": force_update,
+            },
+            _thread_id(sentence_req.korean_sentence),
+        )
+    except Exception as e:
+        result = e
+    return _to_batch_item(sentence_req, result).model_dump()
+
+
+job_queue.register("listening", _run_listening_job_item)
+
+
+async def _get_listening_job(job_id: str) -> ListeningJobResponse:
+    job = await job_queue.get(job_id)
+    if job is None or job["kind"] != "listening":
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    counts = job["counts"]
+    return ListeningJobResponse(
+        job_id=job["job_id"],
+        status=job["status"],
+        total=job["total"],
+        pending_count=counts.get("pending", 0) + counts.get("running", 0),
+        success_count=counts.get("success", 0),
+        skip_count=counts.get("skipped", 0),
+        fail_count=counts.get("failed", 0),
+        cancelled_count=counts.get("cancelled", 0),
+        results=job["results"],
+    )
+
+
+@router.post("/jobs", response_model=ListeningJobResponse, status_code=202)
+async def submit_listening_job(req: BatchListeningRequest):
+    """Queue a long batch import; progress is checkpointed per sentence and survives restarts."""
+    job_id = await job_queue.submit(
+        "listening",
+        [sentence_req.model_dump() for sentence_req in req.sentences],
+        req.force_update,
+    )
+    return await _get_listening_job(job_id)
+
+
+@router.get("/jobs/{job_id}", response_model=ListeningJobResponse)
+async def get_listening_job(job_id: str):
+    """Check the status and per-sentence results of a queued batch import."""
+    return await _get_listening_job(job_id)
+
+
+@router.post("/jobs/{job_id}/cancel", response_model=ListeningJobResponse)
+async def cancel_listening_job(job_id: str):
+    """Cancel a queued batch import (sentences already written to Anki stay)."""
+    job = await job_queue.get(job_id)
+    if job is None or job["kind"] != "listening":
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    await job_queue.cancel(job_id)
+    return await _get_listening_job(job_id)
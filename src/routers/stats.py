@@ -0,0 +1,61 @@
+from fastapi import APIRouter
+
+from src.utils.llm import get_llm_cache, usage_stats
+from src.utils.rate_limit import get_rate_limiter
+from src.utils.audio_cache import get_audio_cache
+from src.utils.lexicon import get_lexicon
+from src.utils.tts_executor import get_tts_executor
+from src.service.vocab_anki_service import get_vocab_anki_service
+
+router = APIRouter(prefix="/stats", tags=["stats"])
+
+
+@router.get("/llm")
+async def get_llm_usage_stats():
+    """Per-prompt LLM calls, token usage and latency (p50 / p95)."""
+    return usage_stats.snapshot()
+
+
+@router.get("/llm-rate-limit")
+async def get_llm_rate_limit_stats():
+    """Azure OpenAI RPM / TPM budget, queue depth, 429 and retry counters."""
+    return get_rate_limiter().snapshot()
+
+
+@router.get("/llm-cache")
+async def get_llm_cache_stats():
+    """LLM response cache hit/miss counters."""
+    llm_cache = get_llm_cache()
+    if llm_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **llm_cache.stats()}
+
+
+@router.get("/audio-cache")
+async def get_audio_cache_stats():
+    """Local TTS audio cache usage."""
+    audio_cache = get_audio_cache()
+    if audio_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **audio_cache.stats()}
+
+
+@router.get("/tts")
+async def get_tts_stats():
+    """TTS executor queue depth, wait / run time (p50 / p95), timeouts and failures."""
+    return get_tts_executor().stats()
+
+
+@router.get("/lexicon")
+async def get_lexicon_stats():
+    """Local lexicon size and hit rate (LLM calls skipped)."""
+    lexicon = get_lexicon()
+    if lexicon is None:
+        return {"enabled": False}
+    return {"enabled": True, **lexicon.stats()}
+
+
+@router.get("/vocab-index")
+async def get_vocab_index_stats():
+    """Local vocab word index size and last sync time."""
+    return get_vocab_anki_service().index.stats()
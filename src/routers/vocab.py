@@ -1,19 +1,35 @@
+import asyncio
+
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, ConfigDict
 from typing import List, Optional
-from pathlib import Path
 
+from src.graph.checkpoint import ainvoke_resumable
 from src.graph.vocab_loader import get_vocab_graph_app
+from src.nodes.vocab import analyze_words_batch
+from src.nodes.vocab.parse_word import build_parse_word_request, parse_word_response
+from src.nodes.vocab.extract_root import build_extract_root_request, extract_root_response
 from src.service.vocab_anki_service import get_vocab_anki_service
+from src.service.bulk_job_service import BulkJob, get_bulk_job_service
+from src.service.job_queue import get_job_queue
+from src.service.target_list_index import get_target_list_index
+from src.utils.batch_llm import get_batch_llm_client
+from src.utils.lexicon import get_lexicon
 from src.config import get_app_settings
+from src.utils.concurrency import iter_bounded, run_bounded
+from src.utils.korean import normalize_key
+from src.utils.streaming import StreamFormat, batch_progress_events, stream_events
 
 router = APIRouter(prefix="/vocab", tags=["vocab"])
 graph_app = get_vocab_graph_app()
 vocab_service = get_vocab_anki_service()
+bulk_jobs = get_bulk_job_service()
+job_queue = get_job_queue()
 app_settings = get_app_settings()
+target_lists = get_target_list_index()
 
 # Word list directory
-WORD_LIST_DIR = Path(__file__).parent.parent.parent / app_settings.word_list_dir
+WORD_LIST_DIR = target_lists.directory
 
 
 # ============== Request/Response Models ==============
@@ -58,7 +74,7 @@ class VocabResponse(BaseModel):
                     "anki_note_id": 1234567890,
                     "tags": ["korean_auto", "root_學", "pos_n"],
                     "root": "學",
-                    "audio_filename": "vocab_abc123def456.mp3",
+                    "audio_filename": "vocab_9fb3c50e75f48940.mp3",
                     "force_update": False,
                 }
             ]
@@ -103,11 +119,16 @@ class BatchVocabResponse(BaseModel):
 # ============== Endpoints ==============
 
 
+def _thread_id(word: str) -> str:
+    # 不同 LLM 模式的 graph node 不同，checkpoint 不互通
+    return f"vocab:{app_settings.vocab_llm_mode}:{word}"
+
+
 @router.post("", response_model=VocabResponse)
 async def create_vocab_card(req: VocabRequest):
     """Create a single vocabulary Anki card."""
     initial_state = {"word": req.word, "force_update": req.force_update}
-    result = await graph_app.ainvoke(initial_state)
+    result = await ainvoke_resumable(graph_app, initial_state, _thread_id(req.word))
 
     # Handle case when card already exists (skipped)
     if result.get("exists") is True:
@@ -136,50 +157,133 @@ async def create_vocab_card(req: VocabRequest):
     )
 
 
-@router.post("/batch", response_model=BatchVocabResponse)
-async def create_vocab_cards_batch(req: BatchVocabRequest):
-    """Create multiple vocabulary Anki cards."""
-    results = []
-
-    for word in req.words:
-        try:
-            initial_state = {
-                "word": word,
-                "force_update": req.force_update,
-            }
-            result = await graph_app.ainvoke(initial_state)
-
-            # Handle case when card already exists (skipped)
-            if result.get("exists") is True:
-                item = BatchVocabItem(
-                    word=word,
-                    status="skipped",
-                    meaning="(已存在)",
-                    anki_note_id=result["anki_note_id"],
-                    force_update=req.force_update,
-                )
-            else:
-                item = BatchVocabItem(
-                    word=word,
-                    status="success",
-                    meaning=result["meaning"],
-                    pos=result["pos"],
-                    examples=result["examples"],
-                    anki_note_id=result["anki_note_id"],
-                    tags=result.get("tags", []),
-                    root=result.get("root"),
-                    audio_filename=result.get("audio_filename"),
-                    force_update=req.force_update,
-                )
-        except Exception as e:
-            item = BatchVocabItem(
+async def _run_vocab_item(
+    word: str,
+    force_update: bool,
+    note_id: Optional[int],
+    prefilled: Optional[dict] = None,
+    preflight_checked: bool = True,
+) -> BatchVocabItem:
+    """
+    Run the vocab graph for one batch word; failures become a `failed` item.
+    preflight_checked=False 表示沒有預先查重（note_id 無意義），由 check_duplicate 自行查詢。
+    """
+    try:
+        initial_state = {"word": word, "force_update": force_update}
+        if preflight_checked:
+            # 預先查重結果（check_duplicate 不再個別查詢 Anki）
+            initial_state.update(preflight_checked=True, anki_note_id=note_id)
+        if prefilled:
+            # 多字批次 LLM 的結果，graph 會略過 parse_word / extract_root
+            initial_state.update(prefilled, llm_prefilled=True)
+        result = await ainvoke_resumable(graph_app, initial_state, _thread_id(word))
+
+        # Handle case when card already exists (skipped)
+        if result.get("exists") is True:
+            return BatchVocabItem(
                 word=word,
-                status="failed",
-                error=str(e),
-                force_update=req.force_update,
+                status="skipped",
+                meaning="(已存在)",
+                anki_note_id=result["anki_note_id"],
+                force_update=force_update,
             )
 
-        results.append(item)
+        return BatchVocabItem(
+            word=word,
+            status="success",
+            meaning=result["meaning"],
+            pos=result["pos"],
+            examples=result["examples"],
+            anki_note_id=result["anki_note_id"],
+            tags=result.get("tags", []),
+            root=result.get("root"),
+            audio_filename=result.get("audio_filename"),
+            force_update=force_update,
+        )
+    except Exception as e:
+        return BatchVocabItem(
+            word=word,
+            status="failed",
+            error=str(e),
+            force_update=force_update,
+        )
+
+
+def _batch_runner(
+    force_update: bool,
+    existing: dict[str, Optional[int]],
+    prefilled: dict[str, dict],
+    prefill_tasks: Optional[dict[str, asyncio.Task]] = None,
+):
+    """
+    Per-word runner for a batch; words with the same normalized key run one after another.
+    prefill_tasks：多字批次 LLM 仍在執行時，每個單字只等自己所在的 chunk。
+    """
+    locks: dict[str, asyncio.Lock] = {}
+    prefill_tasks = prefill_tasks or {}
+
+    async def _run(word: str) -> BatchVocabItem:
+        data = prefilled.get(word)
+        if word in prefill_tasks:
+            try:
+                data = (await prefill_tasks[word]).get(word)
+            except Exception:
+                data = None  # chunk 失敗 → graph 照原本流程逐字呼叫 LLM
+        # 同一個 batch 中的寫法變體（공부하다 / 공부 하다）依序執行，
+        # 後執行者在 check_duplicate 由 index 判定為已存在
+        async with locks.setdefault(normalize_key(word), asyncio.Lock()):
+            return await _run_vocab_item(word, force_update, existing[word], data)
+
+    return _run
+
+
+def _start_llm_prefill(
+    words: List[str], existing: dict[str, Optional[int]], force_update: bool
+) -> dict[str, asyncio.Task]:
+    """
+    多字批次 LLM：只處理需要建立 / 更新的單字，每 N 個字一次 completion。
+    每個 chunk 一個 task（最多 batch_concurrency 個同時執行），回傳 word → 所在 chunk 的 task；
+    chunk 完成後該 chunk 的單字就能開始跑 graph，不必等整批預取完成。
+    """
+    batch_size = app_settings.vocab_llm_batch_size
+    if batch_size <= 0:
+        return {}
+
+    pending = list(dict.fromkeys(
+        w for w in words if existing.get(w) is None or force_update
+    ))
+    semaphore = asyncio.Semaphore(max(1, app_settings.batch_concurrency))
+
+    async def _analyze(chunk: List[str]) -> dict[str, dict]:
+        async with semaphore:
+            return await analyze_words_batch(chunk)
+
+    tasks: dict[str, asyncio.Task] = {}
+    for i in range(0, len(pending), batch_size):
+        chunk = pending[i:i + batch_size]
+        tasks.update(dict.fromkeys(chunk, asyncio.create_task(_analyze(chunk))))
+    return tasks
+
+
+def _cancel_prefill(tasks: dict[str, asyncio.Task]):
+    # 串流中斷 / 例外時不留下仍在呼叫 LLM 的 chunk
+    for task in set(tasks.values()):
+        task.cancel()
+
+
+@router.post("/batch", response_model=BatchVocabResponse)
+async def create_vocab_cards_batch(req: BatchVocabRequest):
+    """Create multiple vocabulary Anki cards (concurrently, results keep input order)."""
+    existing = await vocab_service.find_notes_bulk(req.words)
+    prefill_tasks = _start_llm_prefill(req.words, existing, req.force_update)
+    try:
+        results = await run_bounded(
+            req.words,
+            _batch_runner(req.force_update, existing, {}, prefill_tasks),
+            app_settings.batch_concurrency,
+        )
+    finally:
+        _cancel_prefill(prefill_tasks)
 
     success = sum(1 for r in results if r.status == "success")
     skipped = sum(1 for r in results if r.status == "skipped")
@@ -193,6 +297,32 @@ async def create_vocab_cards_batch(req: BatchVocabRequest):
     )
 
 
+@router.post("/batch/stream")
+async def stream_vocab_cards_batch(req: BatchVocabRequest, format: StreamFormat = "ndjson"):
+    """
+    Create multiple vocabulary Anki cards, streaming each result as it completes.
+    回傳 NDJSON（預設）或 SSE（`?format=sse`）：每個單字一個 `item` event（含累計
+    success / skip / fail 數），最後一個 `summary` event。結果依完成順序送出，以 `index` 對應輸入。
+    """
+
+    async def _results():
+        # 查重與 LLM 預取在串流內進行，client 先收到 `start` event；
+        # 第一個 chunk 預取完成後就開始送出 item event
+        existing = await vocab_service.find_notes_bulk(req.words)
+        prefill_tasks = _start_llm_prefill(req.words, existing, req.force_update)
+        try:
+            async for pair in iter_bounded(
+                req.words,
+                _batch_runner(req.force_update, existing, {}, prefill_tasks),
+                app_settings.batch_concurrency,
+            ):
+                yield pair
+        finally:
+            _cancel_prefill(prefill_tasks)
+
+    return stream_events(batch_progress_events(len(req.words), _results()), format)
+
+
 # ============== New Endpoints: Query & Coverage ==============
 
 
@@ -255,9 +385,9 @@ class CoverageResponse(BaseModel):
 
 @router.get("/words", response_model=VocabWordsResponse)
 async def get_vocab_words():
-    """Get all vocabulary words from Anki deck."""
-    words = await vocab_service.get_all_vocab_words()
-    sorted_words = sorted(list(words))
+    """Get all vocabulary words from Anki deck (served from the local word index)."""
+    index = await vocab_service.get_vocab_index()
+    sorted_words = sorted(index.words())
 
     return VocabWordsResponse(
         total_count=len(sorted_words),
@@ -268,14 +398,14 @@ async def get_vocab_words():
 @router.get("/targets", response_model=TargetsResponse)
 async def list_target_word_lists():
     """List all available target word list files in the data directory."""
-    if not WORD_LIST_DIR.exists():
+    if not target_lists.exists:
         raise HTTPException(
             status_code=404,
             detail=f"Word list directory not found: {WORD_LIST_DIR}"
         )
 
-    # Get all .txt files in the directory
-    txt_files = sorted([f.name for f in WORD_LIST_DIR.glob("*.txt")])
+    # .txt files from the preloaded index (kept current by the file watcher)
+    txt_files = target_lists.files()
 
     if not txt_files:
         raise HTTPException(
@@ -289,6 +419,36 @@ async def list_target_word_lists():
     )
 
 
+def _load_word_list(file: Optional[str]) -> List[str]:
+    """Get a target word list (default: DEFAULT_WORD_LIST) from the preloaded index."""
+    # Use default file if not specified
+    filename = file if file else app_settings.default_word_list
+    word_list = target_lists.get(filename)
+
+    # Check if word list file exists
+    if word_list is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Target word list file not found: {filename}. Use /vocab/targets to see available files."
+        )
+
+    return word_list
+
+
+def _coverage(words: List[str], index, top_k: int) -> dict:
+    """Coverage of one word list against the vocab index（只走訪 target list）."""
+    input_words = set(words)
+    found = {word for word in input_words if word in index}
+    missing = sorted(input_words - found)
+    return {
+        "target_word_count": len(input_words),
+        "existing_count": len(found),
+        "missing_count": len(missing),
+        "coverage_percentage": round(len(found) / len(input_words) * 100, 2) if input_words else 0.0,
+        "missing_words": missing if top_k <= 0 else missing[:top_k],
+    }
+
+
 @router.get("/coverage", response_model=CoverageResponse)
 async def check_coverage(file: str = None, top_k: int = 10):
     """Check coverage of word list against existing Anki vocab cards.
@@ -297,47 +457,277 @@ async def check_coverage(file: str = None, top_k: int = 10):
         file: Word list filename (default: korean_words.txt)
         top_k: Number of missing words to return (default: 10, set to 0 for all)
     """
-    # Use default file if not specified
-    filename = file if file else app_settings.default_word_list
-    word_list_file = WORD_LIST_DIR / filename
+    word_list = _load_word_list(file)
 
-    # Check if word list file exists
-    if not word_list_file.exists():
-        raise HTTPException(
-            status_code=404,
-            detail=f"Target word list file not found: {filename}. Use /vocab/targets to see available files."
-        )
+    # Existing vocab words come from the local index (no Anki round trip)
+    index = await vocab_service.get_vocab_index()
+    return CoverageResponse(**_coverage(word_list, index, top_k))
+
+
+class ListCoverage(BaseModel):
+    file: str
+    target_word_count: int
+    existing_count: int
+    missing_count: int
+    coverage_percentage: float
+    missing_words: List[str]
+
+
+class ListOverlap(BaseModel):
+    files: List[str]
+    shared_count: int
+
+
+class MultiCoverageResponse(BaseModel):
+    """Response model for coverage of all target lists."""
+    default: str
+    lists: List[ListCoverage]
+    overlaps: List[ListOverlap]
+    # 所有清單合併（去重）後的涵蓋率
+    total: CoverageResponse
+
+
+@router.get("/coverage/all", response_model=MultiCoverageResponse)
+async def check_coverage_all(top_k: int = 10):
+    """Coverage of every target list plus pairwise overlaps, in one call (no file reads).
+
+    Args:
+        top_k: Number of missing words to return per list (default: 10, set to 0 for all)
+    """
+    index = await vocab_service.get_vocab_index()
+    return MultiCoverageResponse(
+        default=app_settings.default_word_list,
+        lists=[
+            ListCoverage(file=name, **_coverage(target_lists.get(name), index, top_k))
+            for name in target_lists.files()
+        ],
+        overlaps=[
+            ListOverlap(files=list(pair), shared_count=count)
+            for pair, count in sorted(target_lists.overlaps().items())
+        ],
+        total=CoverageResponse(**_coverage(target_lists.unique_words(), index, top_k)),
+    )
+
+
+# ============== Offline Bulk Job (Batch API) ==============
+
+
+class BulkVocabRequest(BaseModel):
+    """Offline bulk import. 未提供 words 時，匯入 target list 中尚未建立的單字。"""
+    words: Optional[List[str]] = None
+    file: Optional[str] = None
+    force_update: bool = False
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "examples": [
+                {"file": "korean_words.txt", "force_update": False},
+                {"words": ["학생", "선생님", "학교"], "force_update": False},
+            ]
+        }
+    )
+
+
+class BulkVocabJobResponse(BaseModel):
+    job_id: str
+    status: str
+    llm_batch_status: Optional[str] = None
+    total: int
+    success_count: int = 0
+    skip_count: int = 0
+    fail_count: int = 0
+    error: Optional[str] = None
+    results: List[BatchVocabItem] = []
+
+
+def _to_bulk_response(job: BulkJob) -> BulkVocabJobResponse:
+    success = sum(1 for r in job.results if r["status"] == "success")
+    skipped = sum(1 for r in job.results if r["status"] == "skipped")
+    return BulkVocabJobResponse(
+        job_id=job.job_id,
+        status=job.status,
+        llm_batch_status=job.llm_batch_status,
+        total=job.total,
+        success_count=success,
+        skip_count=skipped,
+        fail_count=len(job.results) - success - skipped,
+        error=job.error,
+        results=job.results,
+    )
+
+
+def _vocab_batch_request(custom_id: str, words: List[str]) -> dict:
+    # custom_id = "<prompt>:<words 的 index>"，重啟後可由 custom_id 還原請求
+    kind, index = custom_id.split(":", 1)
+    word = words[int(index)]
+    if kind == "parse_word":
+        return build_parse_word_request(word)
+    return build_extract_root_request(word)
+
+
+async def _run_vocab_bulk(job: BulkJob) -> List[dict]:
+    """
+    1. 預先查重
+    2. lexicon 沒有的 parse_word / extract_root 請求寫成一個 Batch API job（batch id 立即保存）
+    3. 結果填入 graph state，後續 TTS / store / send 照常執行（失敗的單字逐字重跑 LLM）
+    重啟後恢復時，已送出的 batch 直接繼續輪詢；已寫入 Anki 的單字在查重時略過。
+    """
+    words: List[str] = job.params["words"]
+    force_update: bool = job.params["force_update"]
+    existing = await vocab_service.find_notes_bulk(words)
+
+    lexicon = get_lexicon()
+    requests = {}
+    if job.batch_id is None:
+        for i, word in enumerate(words):
+            if existing[word] is not None and not force_update:
+                continue
+            # lexicon 已有的部分不送 Batch API，graph 執行時直接命中
+            if lexicon is None or await lexicon.lookup_parse(word) is None:
+                requests[f"parse_word:{i}"] = build_parse_word_request(word)
+            if lexicon is None or await lexicon.lookup_root(word) is None:
+                requests[f"extract_root:{i}"] = build_extract_root_request(word)
+
+    async def _on_submit(batch_id: str):
+        job.batch_id = batch_id
+        await bulk_jobs.save(job)
+
+    job.status = "llm_batch"
+    await bulk_jobs.save(job)
+    batch_client = get_batch_llm_client()
+    outputs = await batch_client.run(
+        requests,
+        on_status=lambda status: setattr(job, "llm_batch_status", status),
+        batch_id=job.batch_id,
+        on_submit=_on_submit,
+    )
+    requests = {custom_id: _vocab_batch_request(custom_id, words) for custom_id in outputs}
+
+    # 只保留通過 response parser 的輸出（才寫入 LLM cache / lexicon）
+    valid = {}
+    parsed = {}
+    for custom_id, content in outputs.items():
+        parser = parse_word_response if custom_id.startswith("parse_word:") else extract_root_response
+        try:
+            parsed[custom_id] = parser(content)
+        except Exception:
+            continue  # 交給 graph 逐字重跑
+        valid[custom_id] = content
+    await batch_client.warm_cache(requests, valid)
+
+    prefilled = {}
+    for i, word in enumerate(words):
+        parse_id, root_id = f"parse_word:{i}", f"extract_root:{i}"
+        if parse_id not in parsed or root_id not in parsed:
+            continue  # 交給 graph 逐字重跑（lexicon / LLM cache 命中）
+        prefilled[word] = {**parsed[parse_id], **parsed[root_id]}
+        if lexicon is not None and not batch_client.offline:
+            await lexicon.remember(word, **prefilled[word])
+
+    job.status = "running"
+    await bulk_jobs.save(job)
+    results = await run_bounded(
+        words,
+        _batch_runner(force_update, existing, prefilled),
+        app_settings.batch_concurrency,
+    )
+    return [item.model_dump() for item in results]
 
-    # Read word list from file
+
+bulk_jobs.register("vocab", _run_vocab_bulk)
+
+
+@router.post("/bulk", response_model=BulkVocabJobResponse, status_code=202)
+async def submit_vocab_bulk_job(req: BulkVocabRequest):
+    """Submit an offline bulk import using the Batch API (for overnight imports)."""
     try:
-        with open(word_list_file, 'r', encoding='utf-8') as f:
-            word_list = [line.strip() for line in f if line.strip()]
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to read word list file: {str(e)}"
-        )
+        get_batch_llm_client().check_offline()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if req.words:
+        words = list(dict.fromkeys(w.strip() for w in req.words if w.strip()))
+    else:
+        # coverage → missing words
+        index = await vocab_service.get_vocab_index(sync=True)
+        words = [w for w in dict.fromkeys(_load_word_list(req.file)) if w not in index]
+
+    job = await bulk_jobs.submit(
+        "vocab", len(words), {"words": words, "force_update": req.force_update}
+    )
+    return _to_bulk_response(job)
+
+
+@router.get("/bulk/{job_id}", response_model=BulkVocabJobResponse)
+async def get_vocab_bulk_job(job_id: str):
+    """Check the status of an offline bulk import."""
+    job = await bulk_jobs.get(job_id, kind="vocab")
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Bulk job not found: {job_id}")
+    return _to_bulk_response(job)
+
+
+# ============== Durable Job Queue ==============
+
 
-    # Get all existing vocab words from Anki
-    existing_words = await vocab_service.get_all_vocab_words()
+class VocabJobResponse(BaseModel):
+    job_id: str
+    status: str  # queued / running / completed / cancelled
+    total: int
+    pending_count: int = 0
+    success_count: int = 0
+    skip_count: int = 0
+    fail_count: int = 0
+    cancelled_count: int = 0
+    results: List[BatchVocabItem] = []
 
-    # Convert to set for efficient comparison
-    input_words = set(word_list)
 
-    # Calculate coverage
-    found = input_words & existing_words
-    missing = input_words - existing_words
+async def _run_vocab_job_item(payload: dict, force_update: bool) -> dict:
+    # job item 執行時才查重（排隊期間 Anki 可能已有變動），不帶預先查重結果
+    item = await _run_vocab_item(payload["word"], force_update, None, preflight_checked=False)
+    return item.model_dump()
 
-    coverage_pct = (len(found) / len(input_words) * 100) if input_words else 0.0
 
-    # Sort missing words and limit by top_k
-    sorted_missing = sorted(list(missing))
-    limited_missing = sorted_missing if top_k <= 0 else sorted_missing[:top_k]
+job_queue.register("vocab", _run_vocab_job_item)
 
-    return CoverageResponse(
-        target_word_count=len(input_words),
-        existing_count=len(found),
-        missing_count=len(missing),
-        coverage_percentage=round(coverage_pct, 2),
-        missing_words=limited_missing
+
+async def _get_vocab_job(job_id: str) -> VocabJobResponse:
+    job = await job_queue.get(job_id)
+    if job is None or job["kind"] != "vocab":
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    counts = job["counts"]
+    return VocabJobResponse(
+        job_id=job["job_id"],
+        status=job["status"],
+        total=job["total"],
+        pending_count=counts.get("pending", 0) + counts.get("running", 0),
+        success_count=counts.get("success", 0),
+        skip_count=counts.get("skipped", 0),
+        fail_count=counts.get("failed", 0),
+        cancelled_count=counts.get("cancelled", 0),
+        results=job["results"],
+    )
+
+
+@router.post("/jobs", response_model=VocabJobResponse, status_code=202)
+async def submit_vocab_job(req: BatchVocabRequest):
+    """Queue a long batch import; progress is checkpointed per word and survives restarts."""
+    job_id = await job_queue.submit(
+        "vocab", [{"word": word} for word in req.words], req.force_update
     )
+    return await _get_vocab_job(job_id)
+
+
+@router.get("/jobs/{job_id}", response_model=VocabJobResponse)
+async def get_vocab_job(job_id: str):
+    """Check the status and per-word results of a queued batch import."""
+    return await _get_vocab_job(job_id)
+
+
+@router.post("/jobs/{job_id}/cancel", response_model=VocabJobResponse)
+async def cancel_vocab_job(job_id: str):
+    """Cancel a queued batch import (words already written to Anki stay)."""
+    job = await job_queue.get(job_id)
+    if job is None or job["kind"] != "vocab":
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    await job_queue.cancel(job_id)
+    return await _get_vocab_job(job_id)
@@ -0,0 +1,226 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from src.config import get_app_settings
+from src.utils.logger import console
+
+FINISHED_BULK_STATUSES = ("completed", "failed")
+
+
+@dataclass
+class BulkJob:
+    job_id: str
+    kind: str  # "vocab" / "listening"
+    total: int
+    params: Dict[str, Any]  # runner 的輸入（JSON），重啟後據此恢復
+    status: str = "pending"  # pending → llm_batch → running → completed / failed
+    batch_id: Optional[str] = None  # 已送出的 Batch API job，重啟後繼續輪詢而不重送
+    llm_batch_status: Optional[str] = None
+    results: List[Dict[str, Any]] = field(default_factory=list)
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+
+
+# runner(job) -> 每個輸入一筆結果（dict）
+BulkRunner = Callable[[BulkJob], Awaitable[List[Dict[str, Any]]]]
+
+
+class BulkJobService:
+    """
+    Durable registry for offline (Batch API) bulk jobs.
+
+    - job、runner 參數與 Batch API 的 batch id 存在 SQLite（與 JobQueue 同一個檔案），
+      重啟時未完成的 job 由 start() 恢復：已送出的 batch 直接繼續輪詢，不會重送
+    - 記憶體只保留執行中的 job；完成的結果寫入 SQLite，超過 ttl 後刪除
+    - 由 main.py lifespan 呼叫 start() / stop()
+    """
+
+    def __init__(self, path: str, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._runners: Dict[str, BulkRunner] = {}
+        self._active: Dict[str, BulkJob] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._lock = threading.Lock()
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS bulk_jobs (
+                job_id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                status TEXT NOT NULL,
+                total INTEGER NOT NULL,
+                params TEXT NOT NULL,
+                batch_id TEXT,
+                llm_batch_status TEXT,
+                results TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                finished_at REAL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def register(self, kind: str, runner: BulkRunner):
+        self._runners[kind] = runner
+
+    # ============== Lifecycle ==============
+
+    async def start(self):
+        pruned = await asyncio.to_thread(self._prune)
+        if pruned:
+            console.log(f"[BulkJob] pruned {pruned} finished jobs", markup=False)
+        for job in await asyncio.to_thread(self._load_unfinished):
+            if job.job_id in self._tasks or job.kind not in self._runners:
+                continue
+            console.log(
+                f"[BulkJob] resuming {job.job_id} ({job.status}, batch {job.batch_id})",
+                markup=False,
+            )
+            self._launch(job)
+
+    async def stop(self):
+        # 中斷的 job 保持未完成狀態，下次 start 時恢復
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+        self._active.clear()
+
+    # ============== Public API ==============
+
+    async def submit(self, kind: str, total: int, params: Dict[str, Any]) -> BulkJob:
+        if kind not in self._runners:
+            raise ValueError(f"Unknown bulk job kind: {kind}")
+        job = BulkJob(job_id=uuid.uuid4().hex[:12], kind=kind, total=total, params=params)
+        await asyncio.to_thread(self._insert, job)
+        self._launch(job)
+        return job
+
+    async def get(self, job_id: str, kind: Optional[str] = None) -> Optional[BulkJob]:
+        job = self._active.get(job_id)
+        if job is None:
+            job = await asyncio.to_thread(self._load, job_id)
+        if job is None or (kind and job.kind != kind):
+            return None
+        return job
+
+    async def save(self, job: BulkJob):
+        """Persist status / batch id changes (runner 在送出 batch 後立即呼叫)."""
+        await asyncio.to_thread(self._update, job)
+
+    # ============== Runner ==============
+
+    def _launch(self, job: BulkJob):
+        self._active[job.job_id] = job
+
+        async def _run():
+            try:
+                job.results = await self._runners[job.kind](job)
+                job.status = "completed"
+            except Exception as e:
+                job.status = "failed"
+                job.error = str(e)
+                console.log(f"[BulkJob] {job.job_id} failed: {e}", markup=False)
+            job.finished_at = time.time()
+            await asyncio.to_thread(self._update, job)
+            await asyncio.to_thread(self._prune)
+            self._active.pop(job.job_id, None)
+            self._tasks.pop(job.job_id, None)
+
+        self._tasks[job.job_id] = asyncio.create_task(_run())
+
+    # ============== Storage ==============
+
+    def _insert(self, job: BulkJob):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO bulk_jobs (job_id, kind, status, total, params, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    job.job_id,
+                    job.kind,
+                    job.status,
+                    job.total,
+                    json.dumps(job.params, ensure_ascii=False),
+                    job.created_at,
+                ),
+            )
+            self._conn.commit()
+
+    def _update(self, job: BulkJob):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE bulk_jobs SET status = ?, batch_id = ?, llm_batch_status = ?, "
+                "results = ?, error = ?, finished_at = ? WHERE job_id = ?",
+                (
+                    job.status,
+                    job.batch_id,
+                    job.llm_batch_status,
+                    json.dumps(job.results, ensure_ascii=False) if job.results else None,
+                    job.error,
+                    job.finished_at,
+                    job.job_id,
+                ),
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def _from_row(row: sqlite3.Row) -> BulkJob:
+        return BulkJob(
+            job_id=row["job_id"],
+            kind=row["kind"],
+            total=row["total"],
+            params=json.loads(row["params"]),
+            status=row["status"],
+            batch_id=row["batch_id"],
+            llm_batch_status=row["llm_batch_status"],
+            results=json.loads(row["results"]) if row["results"] else [],
+            error=row["error"],
+            created_at=row["created_at"],
+            finished_at=row["finished_at"],
+        )
+
+    def _load(self, job_id: str) -> Optional[BulkJob]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM bulk_jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        return self._from_row(row) if row is not None else None
+
+    def _load_unfinished(self) -> List[BulkJob]:
+        placeholders = ", ".join("?" for _ in FINISHED_BULK_STATUSES)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT * FROM bulk_jobs WHERE status NOT IN ({placeholders}) ORDER BY created_at",
+                FINISHED_BULK_STATUSES,
+            ).fetchall()
+        return [self._from_row(row) for row in rows]
+
+    def _prune(self) -> int:
+        with self._lock:
+            cur = self._conn.execute(
+                "DELETE FROM bulk_jobs WHERE finished_at IS NOT NULL AND finished_at < ?",
+                (time.time() - self.ttl_seconds,),
+            )
+            self._conn.commit()
+            return cur.rowcount
+
+
+@lru_cache()
+def get_bulk_job_service() -> BulkJobService:
+    settings = get_app_settings()
+    return BulkJobService(settings.job_db_path, settings.bulk_job_ttl_seconds)
@@ -0,0 +1,278 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from src.config import get_app_settings
+from src.utils.logger import console
+
+# runner(payload, force_update) -> result dict（含 "status": success / skipped / failed）
+ItemRunner = Callable[[Dict[str, Any], bool], Awaitable[Dict[str, Any]]]
+
+FINISHED_JOB_STATUSES = ("completed", "cancelled")
+
+
+class JobQueue:
+    """
+    Durable job queue for long batch imports.
+
+    - jobs / job_items 存在 SQLite，每個 item 完成即 checkpoint
+    - in-process worker pool 依序領取 pending item，交給該 kind 註冊的 runner（LangGraph app）
+    - 重啟時把中斷的 running item 重設為 pending，從停下的地方繼續
+    """
+
+    def __init__(self, path: str, workers: int, poll_seconds: float = 1.0):
+        self.workers = workers
+        self.poll_seconds = poll_seconds
+        self._runners: Dict[str, ItemRunner] = {}
+        self._lock = threading.Lock()
+        self._wakeup = asyncio.Event()
+        self._worker_tasks: List[asyncio.Task] = []
+        self._running: Dict[Tuple[str, int], asyncio.Task] = {}
+        self._stopping = False
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                status TEXT NOT NULL,
+                force_update INTEGER NOT NULL,
+                total INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS job_items (
+                job_id TEXT NOT NULL,
+                idx INTEGER NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL,
+                result TEXT,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (job_id, idx)
+            );
+            CREATE INDEX IF NOT EXISTS idx_job_items_status ON job_items (status);
+            """
+        )
+        self._conn.commit()
+
+    def register(self, kind: str, runner: ItemRunner):
+        self._runners[kind] = runner
+
+    # ============== Lifecycle ==============
+
+    async def start(self):
+        if self._worker_tasks:
+            return
+        self._stopping = False
+        resumed = await asyncio.to_thread(self._reset_interrupted)
+        if resumed:
+            console.log(f"[JobQueue] resuming {resumed} interrupted items", markup=False)
+        self._worker_tasks = [
+            asyncio.create_task(self._worker()) for _ in range(max(1, self.workers))
+        ]
+
+    async def stop(self):
+        # 中斷中的 item 保持 running，下次 start 時重設為 pending
+        self._stopping = True
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+
+    def _reset_interrupted(self) -> int:
+        with self._lock:
+            cur = self._conn.execute(
+                "UPDATE job_items SET status = 'pending', updated_at = ? WHERE status = 'running'",
+                (time.time(),),
+            )
+            self._conn.commit()
+            return cur.rowcount
+
+    # ============== Public API ==============
+
+    async def submit(
+        self, kind: str, payloads: List[Dict[str, Any]], force_update: bool
+    ) -> str:
+        if kind not in self._runners:
+            raise ValueError(f"Unknown job kind: {kind}")
+        job_id = uuid.uuid4().hex[:12]
+        await asyncio.to_thread(self._insert_job, job_id, kind, payloads, force_update)
+        self._wakeup.set()
+        return job_id
+
+    def _insert_job(
+        self, job_id: str, kind: str, payloads: List[Dict[str, Any]], force_update: bool
+    ):
+        now = time.time()
+        status = "queued" if payloads else "completed"
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, kind, status, int(force_update), len(payloads), now, now),
+            )
+            self._conn.executemany(
+                "INSERT INTO job_items VALUES (?, ?, ?, 'pending', NULL, ?)",
+                [
+                    (job_id, idx, json.dumps(payload, ensure_ascii=False), now)
+                    for idx, payload in enumerate(payloads)
+                ],
+            )
+            self._conn.commit()
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self._get, job_id)
+
+    def _get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._conn.execute(
+                "SELECT * FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+            if job is None:
+                return None
+            items = self._conn.execute(
+                "SELECT idx, status, result FROM job_items WHERE job_id = ? ORDER BY idx",
+                (job_id,),
+            ).fetchall()
+
+        counts: Dict[str, int] = {}
+        for item in items:
+            counts[item["status"]] = counts.get(item["status"], 0) + 1
+        return {
+            "job_id": job["job_id"],
+            "kind": job["kind"],
+            "status": job["status"],
+            "force_update": bool(job["force_update"]),
+            "total": job["total"],
+            "counts": counts,
+            "results": [json.loads(item["result"]) for item in items if item["result"]],
+            "created_at": job["created_at"],
+            "updated_at": job["updated_at"],
+        }
+
+    async def cancel(self, job_id: str) -> bool:
+        found = await asyncio.to_thread(self._cancel, job_id)
+        if found:
+            for (running_job, _), task in list(self._running.items()):
+                if running_job == job_id:
+                    task.cancel()
+        return found
+
+    def _cancel(self, job_id: str) -> bool:
+        now = time.time()
+        with self._lock:
+            placeholders = ", ".join("?" for _ in FINISHED_JOB_STATUSES)
+            cur = self._conn.execute(
+                "UPDATE jobs SET status = 'cancelled', updated_at = ? "
+                f"WHERE job_id = ? AND status NOT IN ({placeholders})",
+                (now, job_id, *FINISHED_JOB_STATUSES),
+            )
+            if cur.rowcount == 0:
+                exists = self._conn.execute(
+                    "SELECT 1 FROM jobs WHERE job_id = ?", (job_id,)
+                ).fetchone()
+                return exists is not None
+            self._conn.execute(
+                "UPDATE job_items SET status = 'cancelled', updated_at = ? "
+                "WHERE job_id = ? AND status IN ('pending', 'running')",
+                (now, job_id),
+            )
+            self._conn.commit()
+            return True
+
+    # ============== Worker ==============
+
+    def _claim_next(self) -> Optional[Tuple[str, int, str, Dict[str, Any], bool]]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                """
+                SELECT i.job_id, i.idx, i.payload, j.kind, j.force_update
+                FROM job_items i JOIN jobs j ON i.job_id = j.job_id
+                WHERE i.status = 'pending' AND j.status IN ('queued', 'running')
+                ORDER BY j.created_at, i.idx
+                LIMIT 1
+                """
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE job_items SET status = 'running', updated_at = ? WHERE job_id = ? AND idx = ?",
+                (now, row["job_id"], row["idx"]),
+            )
+            self._conn.execute(
+                "UPDATE jobs SET status = 'running', updated_at = ? WHERE job_id = ? AND status = 'queued'",
+                (now, row["job_id"]),
+            )
+            self._conn.commit()
+            return (
+                row["job_id"],
+                row["idx"],
+                row["kind"],
+                json.loads(row["payload"]),
+                bool(row["force_update"]),
+            )
+
+    def _finish_item(self, job_id: str, idx: int, status: str, result: Dict[str, Any]):
+        now = time.time()
+        with self._lock:
+            # 已被取消的 item 不覆寫
+            self._conn.execute(
+                "UPDATE job_items SET status = ?, result = ?, updated_at = ? "
+                "WHERE job_id = ? AND idx = ? AND status = 'running'",
+                (status, json.dumps(result, ensure_ascii=False), now, job_id, idx),
+            )
+            remaining = self._conn.execute(
+                "SELECT COUNT(*) FROM job_items WHERE job_id = ? AND status IN ('pending', 'running')",
+                (job_id,),
+            ).fetchone()[0]
+            if remaining == 0:
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'completed', updated_at = ? "
+                    "WHERE job_id = ? AND status = 'running'",
+                    (now, job_id),
+                )
+            self._conn.commit()
+
+    async def _worker(self):
+        while True:
+            claimed = await asyncio.to_thread(self._claim_next)
+            if claimed is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            job_id, idx, kind, payload, force_update = claimed
+            task = asyncio.create_task(self._runners[kind](payload, force_update))
+            self._running[(job_id, idx)] = task
+            try:
+                result = await task
+            except asyncio.CancelledError:
+                if self._stopping:
+                    raise
+                continue  # job 被取消，item 狀態已由 cancel() 更新
+            except Exception as e:
+                result = {**payload, "status": "failed", "error": str(e)}
+            finally:
+                self._running.pop((job_id, idx), None)
+
+            await asyncio.to_thread(
+                self._finish_item, job_id, idx, result.get("status", "success"), result
+            )
+
+
+@lru_cache()
+def get_job_queue() -> JobQueue:
+    settings = get_app_settings()
+    return JobQueue(settings.job_db_path, settings.job_workers)
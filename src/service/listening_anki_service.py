@@ -1,12 +1,14 @@
 from typing import List, Optional
 from functools import lru_cache
-from src.utils.anki import invoke_anki
+from src.utils.anki import get_anki_client, iter_note_fields
+from src.utils.concurrency import get_semaphore
 from src.config import get_listening_settings
 from src.utils.logger import console
 
 
 class ListeningAnkiService:
     def __init__(self):
+        self.client = get_anki_client()
         self.settings = get_listening_settings()
         self.default_tag = self.settings.tag_default
 
@@ -14,7 +16,7 @@ class ListeningAnkiService:
         """Find existing listening note by Korean sentence field."""
         escaped = sentence.replace('"', '\\"')
         query = f'deck:"{self.settings.deck_name}" Korean:"{escaped}"'
-        notes = await invoke_anki("findNotes", {"query": query})
+        notes = await self.client.invoke("findNotes", {"query": query})
         if notes:
             console.log(
                 f"[ListeningAnkiService] found existing note: {notes[0]}", markup=False
@@ -23,6 +25,26 @@ class ListeningAnkiService:
         console.log("[ListeningAnkiService] NEW sentence", markup=False)
         return None
 
+    async def find_listening_notes_bulk(
+        self, sentences: List[str]
+    ) -> dict[str, Optional[int]]:
+        """Resolve existing notes for a whole batch (findNotes + chunked Korean-field fetch)."""
+        query = f'deck:"{self.settings.deck_name}"'
+        note_ids = await self.client.invoke("findNotes", {"query": query})
+        sentence_map: dict[str, int] = {}
+        async for chunk in iter_note_fields(note_ids, ["Korean"]):
+            for note in chunk:
+                if note["Korean"]:
+                    sentence_map.setdefault(note["Korean"], note["noteId"])
+
+        found = {s: sentence_map.get(s.strip()) for s in sentences}
+        hits = sum(1 for v in found.values() if v)
+        console.log(
+            f"[ListeningAnkiService] Pre-flight dedup: {hits}/{len(found)} existing",
+            markup=False,
+        )
+        return found
+
     def make_listening_note(
         self, audio_filename: str, korean: str, chinese: str, tags: List[str]
     ):
@@ -43,7 +65,8 @@ class ListeningAnkiService:
         self, audio_filename: str, korean: str, chinese: str, tags: List[str]
     ) -> int:
         note = self.make_listening_note(audio_filename, korean, chinese, tags)
-        note_id = await invoke_anki("addNote", {"note": note})
+        async with get_semaphore("anki_write"):
+            note_id = await self.client.invoke("addNote", {"note": note})
         console.log(f"[ListeningAnkiService] ADD -> {note_id}", markup=False)
         return note_id
 
@@ -55,9 +78,8 @@ class ListeningAnkiService:
         chinese: str,
         tags: List[str],
     ):
-        await invoke_anki(
-            "updateNoteFields",
-            {
+        actions = [
+            ("updateNoteFields", {
                 "note": {
                     "id": note_id,
                     "fields": {
@@ -66,12 +88,14 @@ class ListeningAnkiService:
                         "Chinese": chinese,
                     },
                 }
-            },
-        )
+            }),
+        ]
         # Update tags
         if tags:
             tags_str = " ".join(tags)
-            await invoke_anki("addTags", {"notes": [note_id], "tags": tags_str})
+            actions.append(("addTags", {"notes": [note_id], "tags": tags_str}))
+        async with get_semaphore("anki_write"):
+            await self.client.multi(actions)
         console.log(f"[ListeningAnkiService] UPDATE -> {note_id}", markup=False)
         return note_id
 
@@ -0,0 +1,143 @@
+import asyncio
+from functools import lru_cache
+from itertools import combinations
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from src.config import get_app_settings
+from src.utils.logger import console
+
+# 專案根目錄（word_list_dir 相對於此）
+ROOT_DIR = Path(__file__).parent.parent.parent
+
+
+class TargetListIndex:
+    """
+    In-memory index of the target word lists in `word_list_dir`.
+
+    - 啟動時載入所有 *.txt，背景以 mtime / size 輪詢目錄，只重新讀取有變動的檔案
+    - word → 包含該字的清單名稱，用於多清單 coverage 與清單間重疊統計
+    """
+
+    def __init__(self, directory: Path, watch_seconds: float):
+        self.directory = directory
+        self.watch_seconds = watch_seconds
+        self._lists: Dict[str, List[str]] = {}
+        self._signatures: Dict[str, Tuple[float, int]] = {}
+        self._word_lists: Dict[str, Set[str]] = {}
+        self._watch_task: Optional[asyncio.Task] = None
+
+    @property
+    def exists(self) -> bool:
+        return self.directory.is_dir()
+
+    def files(self) -> List[str]:
+        return sorted(self._lists)
+
+    def get(self, name: str) -> Optional[List[str]]:
+        return self._lists.get(name)
+
+    def overlaps(self) -> Dict[Tuple[str, str], int]:
+        """Count words shared by each pair of lists."""
+        counts: Dict[Tuple[str, str], int] = {}
+        for names in self._word_lists.values():
+            if len(names) > 1:
+                for pair in combinations(sorted(names), 2):
+                    counts[pair] = counts.get(pair, 0) + 1
+        return counts
+
+    def unique_words(self) -> List[str]:
+        return list(self._word_lists)
+
+    # ============== Loading ==============
+
+    def _scan(self) -> Dict[str, Tuple[float, int]]:
+        if not self.exists:
+            return {}
+        signatures = {}
+        for path in self.directory.glob("*.txt"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue  # glob 之後被刪除 / 改名（編輯器存檔時常見），下次輪詢再處理
+            signatures[path.name] = (stat.st_mtime, stat.st_size)
+        return signatures
+
+    @staticmethod
+    def _read(path: Path) -> List[str]:
+        with open(path, "r", encoding="utf-8") as f:
+            return [line.strip() for line in f if line.strip()]
+
+    def _drop(self, name: str):
+        for word in dict.fromkeys(self._lists.pop(name, [])):
+            names = self._word_lists.get(word)
+            if names is not None:
+                names.discard(name)
+                if not names:
+                    del self._word_lists[word]
+        self._signatures.pop(name, None)
+
+    def _collect(self) -> Tuple[Dict[str, Tuple[float, int]], Dict[str, List[str]]]:
+        # 在 worker thread 執行：掃描目錄並讀取有變動的檔案（不修改 index）
+        current = self._scan()
+        loaded = {}
+        for name, signature in current.items():
+            if self._signatures.get(name) == signature:
+                continue
+            try:
+                loaded[name] = self._read(self.directory / name)
+            except (OSError, UnicodeDecodeError) as e:
+                console.log(f"[TargetListIndex] failed to read {name}: {e}", markup=False)
+        return current, loaded
+
+    async def refresh(self) -> int:
+        """Reload changed / new list files and drop deleted ones. Returns the number of changes."""
+        current, loaded = await asyncio.to_thread(self._collect)
+        # 套用變更在 event loop 上進行，讀取端不會看到一半的 index
+        removed = [name for name in self._lists if name not in current]
+        for name in removed:
+            self._drop(name)
+        for name, words in loaded.items():
+            self._drop(name)
+            self._lists[name] = words
+            self._signatures[name] = current[name]
+            for word in words:
+                self._word_lists.setdefault(word, set()).add(name)
+        return len(removed) + len(loaded)
+
+    async def load(self) -> int:
+        await self.refresh()
+        return len(self._lists)
+
+    # ============== File watcher ==============
+
+    def start(self):
+        if self.watch_seconds > 0 and self._watch_task is None:
+            self._watch_task = asyncio.create_task(self._watch_loop())
+
+    async def stop(self):
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            await asyncio.gather(self._watch_task, return_exceptions=True)
+            self._watch_task = None
+
+    async def _watch_loop(self):
+        while True:
+            await asyncio.sleep(self.watch_seconds)
+            try:
+                changed = await self.refresh()
+            except Exception as e:
+                # 讀取失敗不能讓 watcher 停掉，保留目前的 index 等下次輪詢
+                console.log(f"[TargetListIndex] refresh failed: {type(e).__name__}: {e}", markup=False)
+                continue
+            if changed:
+                console.log(
+                    f"[TargetListIndex] reloaded {changed} list(s), {len(self._lists)} total",
+                    markup=False,
+                )
+
+
+@lru_cache()
+def get_target_list_index() -> TargetListIndex:
+    settings = get_app_settings()
+    return TargetListIndex(ROOT_DIR / settings.word_list_dir, settings.word_list_watch_seconds)
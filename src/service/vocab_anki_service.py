@@ -1,52 +1,230 @@
-from typing import List, Optional
+import asyncio
+import math
+import time
+from typing import Dict, Iterable, List, Optional
 from functools import lru_cache
-from src.utils.anki import invoke_anki
+from src.utils.anki import get_anki_client, iter_note_fields
+from src.utils.concurrency import get_semaphore
+from src.utils.korean import normalize_key
 from src.config import get_anki_settings
 
 
 from src.utils.logger import console
 
 
+class VocabIndex:
+    """
+    In-memory Word → note_id index of the vocab deck.
+
+    - 第一次使用時完整載入，之後由本系統的 add / update 直接更新
+    - sync() 只增量對帳：`edited:N` 找近期修改的 note，notesModTime 篩掉未變動的，
+      只對真正變動的 note 取欄位；findNotes 整個 deck 的 id 用來偵測刪除
+    - /vocab/words、/vocab/coverage 直接讀 index，不需 Anki round trip
+    - 另存正規化 key（NFC/NFD、空白、jamo）→ note_id，查詢時 O(1) 比對寫法不同的同一個字
+    """
+
+    def __init__(self, service: "VocabAnkiService", sync_seconds: float):
+        self._service = service
+        self.sync_seconds = sync_seconds
+        self.loaded = False
+        self.synced_at = 0.0
+        self._last_mod = 0
+        self._words: Dict[str, int] = {}
+        self._note_words: Dict[int, str] = {}
+        self._keys: Dict[str, int] = {}
+        self._lock = asyncio.Lock()
+        self._sync_task: Optional[asyncio.Task] = None
+
+    def __contains__(self, word: str) -> bool:
+        return self.get(word) is not None
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def get(self, word: str) -> Optional[int]:
+        """Exact match first, then the normalized key."""
+        note_id = self._words.get(word)
+        if note_id is None:
+            note_id = self._keys.get(normalize_key(word))
+        return note_id
+
+    def words(self) -> Iterable[str]:
+        return self._words.keys()
+
+    def add(self, word: str, note_id: int):
+        """Record a note written by our own add / update path."""
+        old_word = self._note_words.get(note_id)
+        if old_word is not None and old_word != word:
+            self._forget(old_word, note_id)
+        self._note_words[note_id] = word
+        self._words.setdefault(word, note_id)
+        self._keys.setdefault(normalize_key(word), note_id)
+
+    def _forget(self, word: str, note_id: int):
+        if self._words.get(word) == note_id:
+            del self._words[word]
+        key = normalize_key(word)
+        if self._keys.get(key) == note_id:
+            del self._keys[key]
+
+    def _remove(self, note_id: int):
+        word = self._note_words.pop(note_id, None)
+        if word is not None:
+            self._forget(word, note_id)
+
+    def _apply(self, notes: List[dict]):
+        for note in notes:
+            if note["word"]:
+                self.add(note["word"], note["noteId"])
+            else:
+                self._remove(note["noteId"])
+            self._last_mod = max(self._last_mod, note["mod"])
+
+    async def _load(self):
+        started = time.time()
+        note_ids = await self._service.client.invoke(
+            "findNotes", {"query": self._service.deck_query()}
+        )
+        notes = await self._service.fetch_note_words(note_ids)
+        self._words, self._note_words, self._keys, self._last_mod = {}, {}, {}, 0
+        self._apply(notes)
+        self.loaded = True
+        self.synced_at = started
+        console.log(f"[VocabIndex] loaded {len(self._words)} words", markup=False)
+
+    async def confirm(self, hits: Dict[str, int]) -> Dict[str, int]:
+        """
+        Re-check index hits against Anki before they are used to skip a word.
+
+        index 只反映上次同步的狀態，正規化 key 也可能配到拼法不同的 note；
+        以 notesInfo（一次整批）確認 note 仍存在且 Word 的正規化 key 相同才保留，
+        其餘順便修正 index（note 已刪除 / Word 已修改）。
+        """
+        if not hits:
+            return {}
+        notes = await self._service.fetch_note_words(list(set(hits.values())))
+        current = {note["noteId"]: note["word"] for note in notes}
+        for note_id in set(hits.values()) - current.keys():
+            self._remove(note_id)
+        for note_id, stored in current.items():
+            if stored:
+                self.add(stored, note_id)
+            else:
+                self._remove(note_id)
+        return {
+            word: note_id
+            for word, note_id in hits.items()
+            if current.get(note_id) and normalize_key(current[note_id]) == normalize_key(word)
+        }
+
+    async def ensure_loaded(self):
+        if not self.loaded:
+            async with self._lock:
+                if not self.loaded:
+                    await self._load()
+
+    async def sync(self):
+        """Reconcile with Anki incrementally (full load on first call)."""
+        async with self._lock:
+            if not self.loaded:
+                await self._load()
+                return
+
+            started = time.time()
+            deck_query = self._service.deck_query()
+            # edited:N 以 Anki 的換日時間（預設凌晨 4 點）計算天數，不是滑動的 24 小時；
+            # 多查一天，避免換日前後的修改落在視窗外
+            days = max(1, math.ceil((started - self.synced_at) / 86400)) + 1
+            all_ids, edited_ids = await self._service.client.multi([
+                ("findNotes", {"query": deck_query}),
+                ("findNotes", {"query": f"{deck_query} edited:{days}"}),
+            ])
+
+            # 刪除：index 有但 deck 已沒有的 note
+            current = set(all_ids)
+            removed = [nid for nid in self._note_words if nid not in current]
+            for note_id in removed:
+                self._remove(note_id)
+
+            # 變動：近期修改且 mod 晚於上次同步，或 index 還沒有的 note
+            candidates = set(edited_ids) | (current - self._note_words.keys())
+            changed: List[int] = []
+            if candidates:
+                mod_times = await self._service.client.invoke(
+                    "notesModTime", {"notes": list(candidates)}
+                )
+                changed = [
+                    m["noteId"] for m in mod_times
+                    if m["mod"] >= self._last_mod or m["noteId"] not in self._note_words
+                ]
+            if changed:
+                self._apply(await self._service.fetch_note_words(changed))
+
+            self.synced_at = started
+            if removed or changed:
+                console.log(
+                    f"[VocabIndex] sync: {len(changed)} changed, {len(removed)} removed",
+                    markup=False,
+                )
+
+    # ============== Background sync ==============
+
+    def start(self):
+        if self.sync_seconds > 0 and self._sync_task is None:
+            self._sync_task = asyncio.create_task(self._sync_loop())
+
+    async def stop(self):
+        if self._sync_task is not None:
+            self._sync_task.cancel()
+            await asyncio.gather(self._sync_task, return_exceptions=True)
+            self._sync_task = None
+
+    async def _sync_loop(self):
+        while True:
+            await asyncio.sleep(self.sync_seconds)
+            try:
+                await self.sync()
+            except Exception as e:
+                # 任何錯誤都不能讓背景同步停掉（例如 AnkiConnect 回傳非預期格式）
+                console.log(f"[VocabIndex] sync failed: {type(e).__name__}: {e}", markup=False)
+
+    def stats(self) -> dict:
+        return {
+            "loaded": self.loaded,
+            "words": len(self._words),
+            "notes": len(self._note_words),
+            "normalized_keys": len(self._keys),
+            "synced_at": self.synced_at,
+            "sync_seconds": self.sync_seconds,
+        }
+
+
 class VocabAnkiService:
     def __init__(self):
+        self.client = get_anki_client()
         self.settings = get_anki_settings()
         self.default_tag = self.settings.tag_default
         self.native_tag = self.settings.tag_native
+        self.index = VocabIndex(self, self.settings.vocab_index_sync_seconds)
 
-    async def _prune_tags(self, note_id: int):
+    def _removable_tags(self, note_tags: set[str]) -> set[str]:
         # ====================================================
-        # Tag tool：移除舊 tag（保留使用者自加的）
+        # Tag tool：可移除的舊 tag（保留使用者自加的）
         # ====================================================
-        note_info = await invoke_anki("notesInfo", {"notes": [note_id]})
-        note_tags = set(note_info[0].get("tags", []))
-
-        # 可移除清單
         removable = {self.default_tag, self.native_tag}
         removable |= {t for t in note_tags if t.startswith("root_")}
         removable |= {t for t in note_tags if t.startswith("pos_")}
+        return removable & note_tags
 
-        if removable:
-            tags_str = " ".join(removable)  # ⚠ MUST be space-separated string
-            console.log(f"[VocabAnkiService] Removing tags: {tags_str}", markup=False)
-            await invoke_anki("removeTags", {"notes": [note_id], "tags": tags_str})
-
-    async def _ensure_tags(self, note_id: int, tags: List[str]):
+    async def _ensure_tags(self, note_id: int, tags: List[str], note_tags: set[str]):
         # ====================================================
         # Tag tool：確保 Tag 新增成功
         # ====================================================
-        if tags:
-            tags_str = " ".join(tags)
-            await invoke_anki("addTags", {"notes": [note_id], "tags": tags_str})
-
-        # 再確認
-        note_info = await invoke_anki("notesInfo", {"notes": [note_id]})
-        note_tags = set(note_info[0].get("tags", []))
-
         missing = [t for t in tags if t not in note_tags]
         if missing:
             console.log(f"[⚠ Warning] Retrying add tags → {missing}", markup=False)
             retry = " ".join(missing)
-            await invoke_anki("addTags", {"notes": [note_id], "tags": retry})
+            await self.client.invoke("addTags", {"notes": [note_id], "tags": retry})
         else:
             console.log(f"[VocabAnkiService] Tags confirmed: {note_tags}", markup=False)
 
@@ -54,33 +232,50 @@ class VocabAnkiService:
     async def find_note(self, word: str) -> Optional[int]:
         escaped = word.replace('"', '\\"')
         query = f'deck:"{self.settings.deck_name}" Word:"{escaped}"'
-        notes = await invoke_anki("findNotes", {"query": query})
+        notes = await self.client.invoke("findNotes", {"query": query})
         if notes:
             console.log(f"[VocabAnkiService] found existing note: {notes[0]}", markup=False)
             return notes[0]
         console.log(f"[VocabAnkiService] NEW word: {word}", markup=False)
         return None
 
-    # 獲取所有vocab單字（用於涵蓋率檢查）
-    async def get_all_vocab_words(self) -> set[str]:
-        """Fetch all vocabulary words from Anki deck."""
-        query = f'deck:"{self.settings.deck_name}"'
-        note_ids = await invoke_anki("findNotes", {"query": query})
+    def deck_query(self) -> str:
+        return f'deck:"{self.settings.deck_name}"'
 
-        if not note_ids:
-            console.log("[VocabAnkiService] No vocab cards found in deck", markup=False)
-            return set()
+    async def fetch_note_words(self, note_ids: List[int]) -> List[dict]:
+        """Fetch `{noteId, word, mod}` for the given notes (Word field only)."""
+        notes: List[dict] = []
+        async for chunk in iter_note_fields(note_ids, ["Word"]):
+            notes.extend(
+                {"noteId": n["noteId"], "word": n["Word"], "mod": n["mod"]} for n in chunk
+            )
+        return notes
 
-        # Batch fetch all note info
-        notes_info = await invoke_anki("notesInfo", {"notes": note_ids})
+    # 整個 deck 的 Word index（已載入則只做增量同步）
+    async def get_vocab_index(self, sync: bool = False) -> VocabIndex:
+        if sync:
+            await self.index.sync()
+        else:
+            await self.index.ensure_loaded()
+        return self.index
 
-        # Extract Word field from each note
-        words = set()
-        for note in notes_info:
-            word = note.get("fields", {}).get("Word", {}).get("value", "").strip()
-            if word:
-                words.add(word)
+    # Batch 查重：先增量同步 index，再一次解析整批單字
+    async def find_notes_bulk(self, words: List[str]) -> dict[str, Optional[int]]:
+        index = await self.get_vocab_index(sync=True)
+        candidates = {word: index.get(word.strip()) for word in words}
+        confirmed = await index.confirm({w: nid for w, nid in candidates.items() if nid})
+        found = {word: confirmed.get(word) for word in words}
+        hits = sum(1 for v in found.values() if v)
+        console.log(
+            f"[VocabAnkiService] Pre-flight dedup: {hits}/{len(found)} existing",
+            markup=False,
+        )
+        return found
 
+    # 獲取所有vocab單字（用於涵蓋率檢查）
+    async def get_all_vocab_words(self) -> set[str]:
+        """Return all vocabulary words in the deck (from the local index)."""
+        words = set((await self.get_vocab_index()).words())
         console.log(f"[VocabAnkiService] Retrieved {len(words)} vocab words", markup=False)
         return words
 
@@ -133,7 +328,9 @@ class VocabAnkiService:
             example_korean_2, example_chinese_2,
             tags
         )
-        note_id = await invoke_anki("addNote", {"note": note})
+        async with get_semaphore("anki_write"):
+            note_id = await self.client.invoke("addNote", {"note": note})
+        self.index.add(word, note_id)
         console.log(f"[VocabAnkiService] ADD → {note_id}", markup=False)
         return note_id
 
@@ -151,26 +348,42 @@ class VocabAnkiService:
         example_chinese_2: str,
         tags: List[str],
     ):
-        await invoke_anki(
-            "updateNoteFields",
-            {
-                "note": {
-                    "id": note_id,
-                    "fields": {
-                        "Word": word,
-                        "Audio": f"[sound:{audio_filename}]",
-                        "Meaning": meaning,
-                        "POS": pos_zh,
-                        "ExampleKorean1": example_korean_1,
-                        "ExampleChinese1": example_chinese_1,
-                        "ExampleKorean2": example_korean_2,
-                        "ExampleChinese2": example_chinese_2,
-                    },
-                }
-            },
-        )
-        await self._prune_tags(note_id)
-        await self._ensure_tags(note_id, tags)
+        async with get_semaphore("anki_write"):
+            # 1) 更新欄位 + 讀取目前 tags（同一個 multi round trip）
+            # Word 不覆寫：查重可能以正規化 key 配到拼法不同的 note，保留 Anki 裡原本的寫法
+            _, note_info = await self.client.multi([
+                ("updateNoteFields", {
+                    "note": {
+                        "id": note_id,
+                        "fields": {
+                            "Audio": f"[sound:{audio_filename}]",
+                            "Meaning": meaning,
+                            "POS": pos_zh,
+                            "ExampleKorean1": example_korean_1,
+                            "ExampleChinese1": example_chinese_1,
+                            "ExampleKorean2": example_korean_2,
+                            "ExampleChinese2": example_chinese_2,
+                        },
+                    }
+                }),
+                ("notesInfo", {"notes": [note_id]}),
+            ])
+            stored_word = note_info[0].get("fields", {}).get("Word", {}).get("value") or word
+
+            # 2) 移除舊 tag → 加新 tag → 再確認（AnkiConnect 依序執行）
+            actions = []
+            removable = self._removable_tags(set(note_info[0].get("tags", [])))
+            if removable:
+                tags_str = " ".join(removable)  # ⚠ MUST be space-separated string
+                console.log(f"[VocabAnkiService] Removing tags: {tags_str}", markup=False)
+                actions.append(("removeTags", {"notes": [note_id], "tags": tags_str}))
+            if tags:
+                actions.append(("addTags", {"notes": [note_id], "tags": " ".join(tags)}))
+            actions.append(("notesInfo", {"notes": [note_id]}))
+
+            *_, note_info = await self.client.multi(actions)
+            await self._ensure_tags(note_id, tags, set(note_info[0].get("tags", [])))
+        self.index.add(stored_word, note_id)
         return note_id
 
 
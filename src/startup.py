@@ -2,10 +2,15 @@
 API 啟動時的初始化邏輯：
 1. 檢查 Anki 是否在運行
 2. 確保 Vocab 和 Listening 的 Deck/Model 存在
+3. 建立 media index（已上傳的音檔）
+4. 載入 vocab word index
+5. 載入目標單字清單 index
 """
 
-from src.utils.anki import invoke_anki, AnkiConnectionError
+from src.utils.anki import invoke_anki, get_media_index, AnkiConnectionError
 from src.config import get_anki_settings, get_listening_settings
+from src.service.vocab_anki_service import get_vocab_anki_service
+from src.service.target_list_index import get_target_list_index
 from src.utils.logger import console
 
 
@@ -103,6 +108,24 @@ async def ensure_listening_model():
     console.log(f"[Startup] 建立 Listening Model: {model_name}", style="green")
 
 
+async def load_media_index():
+    """載入 Anki 內已存在的音檔檔名，之後相同檔名不再重新上傳"""
+    count = await get_media_index().load()
+    console.log(f"[Startup] Media index: {count} 個音檔", style="green")
+
+
+async def load_vocab_index():
+    """載入 vocab deck 的 Word index，之後由 add / update 與背景增量同步維護"""
+    index = await get_vocab_anki_service().get_vocab_index()
+    console.log(f"[Startup] Vocab index: {len(index)} 個單字", style="green")
+
+
+async def load_target_lists():
+    """載入目標單字清單（之後由 file watcher 維持最新）"""
+    count = await get_target_list_index().load()
+    console.log(f"[Startup] Target lists: {count} 個清單", style="green")
+
+
 async def initialize():
     """API 啟動時執行的初始化"""
     console.log("[Startup] 開始初始化...", style="bold blue")
@@ -114,4 +137,13 @@ async def initialize():
     await ensure_vocab_model()
     await ensure_listening_model()
 
+    # 3. 建立 media index
+    await load_media_index()
+
+    # 4. 載入 vocab word index
+    await load_vocab_index()
+
+    # 5. 載入目標單字清單
+    await load_target_lists()
+
     console.log("[Startup] 初始化完成!", style="bold green")
@@ -1,6 +1,12 @@
+import asyncio
 import base64
-from aiohttp import ClientSession, ClientTimeout, ClientConnectorError
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Set, Tuple
+from aiohttp import ClientSession, ClientTimeout, ClientConnectorError, TCPConnector
 from src.config import get_anki_settings
+from src.utils.concurrency import get_semaphore
 
 settings = get_anki_settings()
 
@@ -11,23 +17,299 @@ class AnkiConnectionError(Exception):
     pass
 
 
+class AnkiDuplicateError(RuntimeError):
+    """Raised when addNote is rejected because the note already exists."""
+
+    pass
+
+
+class AnkiNoteNotFoundError(RuntimeError):
+    """Raised when the target note no longer exists (e.g. deleted in Anki)."""
+
+    pass
+
+
+# AnkiConnect：「Note was not found: <id>」（新版 Anki 也可能是「Note not found」）；
+# 「deck was not found」、「model was not found」等設定錯誤不算，照一般錯誤拋出
+_NOTE_NOT_FOUND = re.compile(r"\bnote (?:was )?not found\b", re.IGNORECASE)
+
+
+def _raise_anki_error(error: str):
+    message = f"[Anki] Error: {error}"
+    lowered = str(error).lower()
+    if "duplicate" in lowered:
+        raise AnkiDuplicateError(message)
+    if _NOTE_NOT_FOUND.search(str(error)):
+        raise AnkiNoteNotFoundError(message)
+    raise RuntimeError(message)
+
+
+class AnkiClient:
+    """
+    App-scoped AnkiConnect client.
+
+    - 共用一個 ClientSession（keep-alive），避免每個 action 重新建立 TCP 連線
+    - 以 Semaphore 限制同時送往 AnkiConnect 的請求數
+    - invoke() 會在 batch_window 內收集並發 coroutine 的 action，合併成一個 `multi` 請求
+    - 由 main.py lifespan 呼叫 start() / close()
+    """
+
+    def __init__(
+        self,
+        url: str,
+        max_connections: int,
+        timeout: float,
+        batch_window: float = 0.0,
+        batch_max_actions: int = 50,
+    ):
+        self.url = url
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.batch_window = batch_window
+        self.batch_max_actions = batch_max_actions
+        self._session: Optional[ClientSession] = None
+        self._semaphore = asyncio.Semaphore(max_connections)
+
+        # 等待合併送出的 action：(action dict, future)
+        self._pending: List[Tuple[dict, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._dispatch_tasks: Set[asyncio.Task] = set()
+
+    async def start(self):
+        if self._session is not None and not self._session.closed:
+            return
+        connector = TCPConnector(
+            limit=self.max_connections,
+            keepalive_timeout=settings.keepalive_timeout,
+        )
+        self._session = ClientSession(
+            connector=connector, timeout=ClientTimeout(total=self.timeout)
+        )
+
+    async def close(self):
+        # 先把還在排隊的 action 送出，再關閉連線
+        self._flush()
+        if self._dispatch_tasks:
+            await asyncio.gather(*self._dispatch_tasks, return_exceptions=True)
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _post(self, action: str, params: dict) -> Any:
+        # 非 API 情境（例如 script）沒有經過 lifespan，第一次呼叫時自動開啟
+        if self._session is None or self._session.closed:
+            await self.start()
+
+        payload = {"action": action, "version": 6, "params": params}
+        try:
+            async with self._semaphore:
+                async with self._session.post(self.url, json=payload) as resp:
+                    data = await resp.json(content_type=None)
+        except ClientConnectorError:
+            raise AnkiConnectionError(
+                f"無法連接到 Anki，請確認 Anki 已開啟且 AnkiConnect 外掛已安裝。(URL: {self.url})"
+            )
+        if data.get("error"):
+            _raise_anki_error(data["error"])
+        return data.get("result")
+
+    @staticmethod
+    def _unpack(item: Any) -> Any:
+        """Unpack one `multi` sub-result ({"result", "error"} for version 6)."""
+        if isinstance(item, dict) and set(item) == {"result", "error"}:
+            if item["error"]:
+                _raise_anki_error(item["error"])
+            return item["result"]
+        return item
+
+    async def multi(self, actions: List[Tuple[str, dict]]) -> List[Any]:
+        """
+        Run several actions in one round trip, in order.
+        AnkiConnect 依序執行；任一 action 失敗時拋出 RuntimeError。
+        """
+        payload = [
+            {"action": action, "version": 6, "params": params}
+            for action, params in actions
+        ]
+        results = await self._post("multi", {"actions": payload})
+        return [self._unpack(item) for item in results]
+
+    async def invoke(self, action: str, params: dict) -> Any:
+        if self.batch_window <= 0:
+            return await self._post(action, params)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append(({"action": action, "params": params}, future))
+
+        if len(self._pending) >= self.batch_max_actions:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_window, self._flush)
+
+        return await future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        task = asyncio.create_task(self._dispatch(batch))
+        self._dispatch_tasks.add(task)
+        task.add_done_callback(self._dispatch_tasks.discard)
+
+    async def _dispatch(self, batch: List[Tuple[dict, asyncio.Future]]):
+        try:
+            # 只有一個 action 時直接送出，不包 multi
+            if len(batch) == 1:
+                (item, future), = batch
+                result = await self._post(item["action"], item["params"])
+                if not future.done():
+                    future.set_result(result)
+                return
+
+            # 每個 caller 各自拿到自己的 result / error
+            results = await self._post(
+                "multi",
+                {"actions": [dict(item, version=6) for item, _ in batch]},
+            )
+            if not isinstance(results, list) or len(results) != len(batch):
+                got = len(results) if isinstance(results, list) else type(results).__name__
+                raise RuntimeError(
+                    f"[Anki] Error: multi returned {got} results for {len(batch)} actions"
+                )
+            for (_, future), raw in zip(batch, results):
+                if future.done():
+                    continue
+                try:
+                    future.set_result(self._unpack(raw))
+                except RuntimeError as e:
+                    future.set_exception(e)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            # 任何情況（含 dispatch 被取消）都不能讓 caller 的 future 永遠懸著
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(
+                        RuntimeError("[Anki] Error: batched action got no result")
+                    )
+
+
+@lru_cache()
+def get_anki_client() -> AnkiClient:
+    return AnkiClient(
+        url=settings.url,
+        max_connections=settings.max_connections,
+        timeout=settings.timeout,
+        batch_window=settings.batch_window_ms / 1000,
+        batch_max_actions=settings.batch_max_actions,
+    )
+
+
 async def invoke_anki(action: str, params: dict):
-    payload = {"action": action, "version": 6, "params": params}
-    timeout = ClientTimeout(total=10)
+    return await get_anki_client().invoke(action, params)
+
+
+def _project_note(note: Dict[str, Any], fields: Sequence[str]) -> Dict[str, Any]:
+    note_fields = note.get("fields", {})
+    projected = {"noteId": note["noteId"], "mod": note.get("mod", 0)}
+    for field in fields:
+        projected[field] = note_fields.get(field, {}).get("value", "").strip()
+    return projected
+
+
+async def iter_note_fields(
+    note_ids: Sequence[int], fields: Sequence[str], chunk_size: Optional[int] = None
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Fetch only the given fields of notes, one chunk at a time.
+
+    AnkiConnect 的 notesInfo 無法指定欄位，因此分批請求，每批收到後立即投影成
+    `{noteId, mod, <field>: value}` 並丟棄其餘欄位（例句、音檔、翻譯）。
+    下一批在處理目前這批時就先送出，記憶體中最多只有兩批完整 payload。
+    """
+    chunk_size = chunk_size or settings.notes_info_chunk_size
+    chunks = [note_ids[i:i + chunk_size] for i in range(0, len(note_ids), chunk_size)]
+    if not chunks:
+        return
+
+    client = get_anki_client()
+
+    def _fetch(chunk: Sequence[int]) -> asyncio.Task:
+        return asyncio.ensure_future(client.invoke("notesInfo", {"notes": list(chunk)}))
+
+    pending = _fetch(chunks[0])
     try:
-        async with ClientSession(timeout=timeout) as session:
-            async with session.post(settings.url, json=payload) as resp:
-                data = await resp.json()
-                if data.get("error"):
-                    raise RuntimeError(f"[Anki] Error: {data['error']}")
-                return data.get("result")
-    except ClientConnectorError:
-        raise AnkiConnectionError(
-            f"無法連接到 Anki，請確認 Anki 已開啟且 AnkiConnect 外掛已安裝。(URL: {settings.url})"
+        for next_chunk in [*chunks[1:], None]:
+            notes_info = await pending
+            pending = _fetch(next_chunk) if next_chunk is not None else None
+            yield [_project_note(note, fields) for note in notes_info if note]
+            del notes_info
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+
+class MediaIndex:
+    """
+    In-memory index of media filenames already in Anki's collection.
+    啟動時以 getMediaFilesNames 建立，之後每次上傳成功就加入；
+    檔名是內容 hash，已存在即代表同一份音檔，可略過 storeMediaFile。
+    """
+
+    def __init__(self, patterns: List[str]):
+        self.patterns = patterns
+        self.loaded = False
+        self._names: Set[str] = set()
+
+    async def load(self):
+        results = await get_anki_client().multi(
+            [("getMediaFilesNames", {"pattern": pattern}) for pattern in self.patterns]
         )
+        self._names = {name for names in results for name in names}
+        self.loaded = True
+        return len(self._names)
+
+    def __contains__(self, filename: str) -> bool:
+        return filename in self._names
+
+    def add(self, filename: str):
+        self._names.add(filename)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+
+@lru_cache()
+def get_media_index() -> MediaIndex:
+    return MediaIndex(settings.media_patterns)
+
+
+async def store_media_file(path: Path, filename: str) -> bool:
+    """
+    Store a local audio file in Anki media collection.
+    Returns False when the same content-hash filename is already in Anki (upload skipped).
 
+    media_upload = "data"（預設）：讀檔後以 base64 上傳，Docker / 遠端 Anki 皆可用；
+    "path"：只傳檔案路徑，由 Anki 自行讀取（不在記憶體中複製），僅限 Anki 與本服務共用檔案系統時。
+    """
+    media_index = get_media_index()
+    if filename in media_index:
+        return False
 
-async def store_media_file(audio_bytes: bytes, filename: str):
-    """Store audio file in Anki media collection."""
-    audio_b64 = base64.b64encode(audio_bytes).decode("utf-8")
-    await invoke_anki("storeMediaFile", {"filename": filename, "data": audio_b64})
+    if settings.media_upload == "path":
+        params = {"filename": filename, "path": str(path.resolve())}
+    else:
+        audio_bytes = await asyncio.to_thread(path.read_bytes)
+        params = {"filename": filename, "data": base64.b64encode(audio_bytes).decode("utf-8")}
+    async with get_semaphore("anki_write"):
+        await invoke_anki("storeMediaFile", params)
+    media_index.add(filename)
+    return True
@@ -0,0 +1,111 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+from src.config import get_tts_settings
+from src.utils.logger import console
+
+
+class AudioCache:
+    """
+    Content-addressed local audio store.
+
+    - key = sha256(text + voice settings)，檔名即 key（`<key>.mp3`）
+    - 命中時更新 mtime，容量超過 max_bytes 時淘汰最久未使用的檔案（LRU）
+    - pin() 中的檔案（正在上傳到 Anki）不會被淘汰
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._pins: Dict[str, int] = {}
+        self._total_bytes = sum(p.stat().st_size for p in self._files())
+
+    def _files(self):
+        return self.directory.glob("*.mp3")
+
+    @staticmethod
+    def make_key(text: str, **voice) -> str:
+        voice_str = "|".join(f"{k}={voice[k]}" for k in sorted(voice))
+        return hashlib.sha256(f"{voice_str}|{text}".encode("utf-8")).hexdigest()
+
+    def path_for(self, key: str) -> Path:
+        return self.directory / f"{key}.mp3"
+
+    def _put(self, key: str, data: bytes):
+        path = self.path_for(key)
+        # 先寫暫存檔再 rename，避免並發讀到寫一半的檔案
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        with self._lock:
+            previous = path.stat().st_size if path.exists() else 0
+            os.replace(tmp, path)
+            self._total_bytes += len(data) - previous
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        files = sorted(self._files(), key=lambda p: p.stat().st_mtime)
+        for path in files:
+            if self._total_bytes <= self.max_bytes:
+                break
+            if path.stem in self._pins:
+                continue  # 使用中，暫時超出 max_bytes，下次 put 再淘汰
+            size = path.stat().st_size
+            path.unlink(missing_ok=True)
+            self._total_bytes -= size
+            console.log(f"[AudioCache] evicted {path.name}", markup=False)
+
+    @contextmanager
+    def pin(self, key: str) -> Iterator[Path]:
+        """
+        Keep the key's file from being evicted while the caller uses its path.
+        與 put / evict 共用 lock：pin 之後的淘汰一律略過它；pin 之前已被淘汰的，呼叫端 touch 會 miss 並重新 put。
+        """
+        with self._lock:
+            self._pins[key] = self._pins.get(key, 0) + 1
+        try:
+            yield self.path_for(key)
+        finally:
+            with self._lock:
+                self._pins[key] -= 1
+                if not self._pins[key]:
+                    del self._pins[key]
+
+    def _touch(self, key: str) -> bool:
+        try:
+            os.utime(self.path_for(key))  # LRU：更新最後使用時間
+        except FileNotFoundError:
+            return False
+        return True
+
+    async def touch(self, key: str) -> bool:
+        """True (and mark as recently used) when the file is cached."""
+        return await asyncio.to_thread(self._touch, key)
+
+    async def put(self, key: str, data: bytes):
+        await asyncio.to_thread(self._put, key, data)
+
+    def stats(self) -> dict:
+        return {
+            "directory": str(self.directory),
+            "total_bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+
+@lru_cache()
+def get_audio_cache() -> Optional[AudioCache]:
+    settings = get_tts_settings()
+    if not settings.cache_enabled:
+        return None
+    return AudioCache(settings.cache_dir, settings.cache_max_bytes)
@@ -0,0 +1,297 @@
+"""
+Offline LLM batch：把多個 ask_llm 請求寫成 JSONL，透過 Batch API 一次送出。
+
+- AzureBatchBackend：Azure OpenAI Batch API（files + batches，24h completion window）
+- LocalBatchBackend：本地離線替身，模擬同樣的 submit / poll / download 流程，
+  回應由 responder 產生（預設為可通過 schema 驗證的假資料），用於離線測試整個流程
+"""
+
+import asyncio
+import json
+import uuid
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Protocol
+
+from src.config import get_app_settings, get_env_settings, get_tts_settings
+from src.utils.llm import build_messages, client, get_llm_cache
+from src.utils.logger import console
+
+# custom_id → ask_llm kwargs
+BatchRequests = Dict[str, Dict[str, Any]]
+
+
+class BatchBackend(Protocol):
+    async def submit(self, input_path: Path) -> str: ...
+
+    async def poll(self, batch_id: str) -> str: ...
+
+    async def download(self, batch_id: str) -> str: ...
+
+
+class AzureBatchBackend:
+    """Azure OpenAI Batch API."""
+
+    def __init__(self):
+        # 共用 client 關閉了 SDK 重試（chat completion 由 rate limiter 負責）；
+        # files / batches 呼叫量很低，沿用 SDK 內建重試即可
+        self._client = client.with_options(max_retries=2)
+
+    async def submit(self, input_path: Path) -> str:
+        with open(input_path, "rb") as f:
+            uploaded = await self._client.files.create(file=f, purpose="batch")
+        batch = await self._client.batches.create(
+            input_file_id=uploaded.id,
+            endpoint="/chat/completions",
+            completion_window="24h",
+        )
+        return batch.id
+
+    async def poll(self, batch_id: str) -> str:
+        batch = await self._client.batches.retrieve(batch_id)
+        return batch.status
+
+    async def download(self, batch_id: str) -> str:
+        batch = await self._client.batches.retrieve(batch_id)
+        if not batch.output_file_id:
+            raise RuntimeError(f"[BatchLLM] batch {batch_id} has no output file")
+        content = await self._client.files.content(batch.output_file_id)
+        return content.text
+
+
+def fake_batch_response(custom_id: str, body: Dict[str, Any]) -> str:
+    """Deterministic placeholder answers that pass the nodes' parsers."""
+    user = body["messages"][-1]["content"]
+    subject = user.split("：", 1)[-1].split("\n", 1)[0].strip() or user.strip()
+    kind = custom_id.split(":", 1)[0]
+    if kind == "parse_word":
+        return json.dumps(
+            {
+                "word": subject,
+                "meaning": f"(offline) {subject}",
+                "pos": "n",
+                "examples": [
+                    {"type": "casual", "kr": f"{subject}이에요.", "zh": "(offline)"},
+                    {"type": "formal", "kr": f"{subject}입니다.", "zh": "(offline)"},
+                ],
+            },
+            ensure_ascii=False,
+        )
+    if kind == "extract_root":
+        return json.dumps({"root": "N"})
+    return f"(offline) {user.strip().splitlines()[-1]}"
+
+
+class LocalBatchBackend:
+    """
+    Local stand-in for the Batch API（離線測試用）。
+    submit 後狀態依序為 validating → in_progress → completed，輸出格式與 Batch API 相同。
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        responder: Callable[[str, Dict[str, Any]], str] = fake_batch_response,
+    ):
+        self.directory = directory
+        self.responder = responder
+        self._status: Dict[str, str] = {}
+        self._inputs: Dict[str, Path] = {}
+
+    async def submit(self, input_path: Path) -> str:
+        batch_id = f"local_batch_{uuid.uuid4().hex[:12]}"
+        self._inputs[batch_id] = input_path
+        self._status[batch_id] = "validating"
+        return batch_id
+
+    async def poll(self, batch_id: str) -> str:
+        if batch_id not in self._status:
+            # 重啟前送出的 batch：輸出已寫好就算完成，否則無法恢復
+            output_path = self.directory / f"{batch_id}_output.jsonl"
+            return "completed" if output_path.exists() else "expired"
+        status = self._status[batch_id]
+        if status == "validating":
+            self._status[batch_id] = "in_progress"
+        elif status == "in_progress":
+            await asyncio.to_thread(self._process, batch_id)
+            self._status[batch_id] = "completed"
+        return self._status[batch_id]
+
+    def _process(self, batch_id: str):
+        output_path = self.directory / f"{batch_id}_output.jsonl"
+        with open(self._inputs[batch_id], encoding="utf-8") as src, open(
+            output_path, "w", encoding="utf-8"
+        ) as dst:
+            for line in src:
+                request = json.loads(line)
+                content = self.responder(request["custom_id"], request["body"])
+                dst.write(
+                    json.dumps(
+                        {
+                            "custom_id": request["custom_id"],
+                            "response": {
+                                "status_code": 200,
+                                "body": {
+                                    "choices": [
+                                        {"message": {"role": "assistant", "content": content}}
+                                    ]
+                                },
+                            },
+                            "error": None,
+                        },
+                        ensure_ascii=False,
+                    )
+                    + "\n"
+                )
+
+    async def download(self, batch_id: str) -> str:
+        output_path = self.directory / f"{batch_id}_output.jsonl"
+        return await asyncio.to_thread(output_path.read_text, "utf-8")
+
+
+class BatchLLMClient:
+    """Write requests as JSONL → submit → poll → collect `custom_id → content`."""
+
+    TERMINAL = {"completed", "failed", "expired", "cancelled"}
+
+    def __init__(self, backend: BatchBackend, directory: Path, poll_seconds: float):
+        self.backend = backend
+        # 本地替身的輸出是假資料，不寫進 LLM cache / lexicon（Anki 端見 check_offline）
+        self.offline = isinstance(backend, LocalBatchBackend)
+        self.directory = directory
+        self.poll_seconds = poll_seconds
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def _to_body(request: Dict[str, Any]) -> Dict[str, Any]:
+        deployment = get_env_settings().batch_deployment
+        return {
+            "model": deployment or request["model"],
+            "messages": build_messages(
+                request.get("system_prompt"),
+                request.get("user_prompt"),
+                request.get("messages"),
+            ),
+            "temperature": request["temperature"],
+            "max_tokens": request["max_tokens"],
+        }
+
+    def check_offline(self):
+        """
+        本地替身會讓整個流程（TTS / store / send）用假資料跑完並寫入 Anki，
+        因此必須搭配 TTS_BACKEND=fake，並把 deck 指向測試用 deck，避免假卡片混進真正的收藏。
+        """
+        if self.offline and get_tts_settings().backend != "fake":
+            raise ValueError(
+                "LLM_BATCH_BACKEND=local writes placeholder cards: set TTS_BACKEND=fake "
+                "and point ANKI_DECK_NAME / ANKI_LISTENING_DECK_NAME at a test deck"
+            )
+
+    def write_input(self, requests: BatchRequests) -> Path:
+        path = self.directory / f"batch_{uuid.uuid4().hex[:12]}_input.jsonl"
+        with open(path, "w", encoding="utf-8") as f:
+            for custom_id, request in requests.items():
+                line = {
+                    "custom_id": custom_id,
+                    "method": "POST",
+                    "url": "/chat/completions",
+                    "body": self._to_body(request),
+                }
+                f.write(json.dumps(line, ensure_ascii=False) + "\n")
+        return path
+
+    async def run(
+        self,
+        requests: BatchRequests,
+        on_status: Optional[Callable[[str], None]] = None,
+        batch_id: Optional[str] = None,
+        on_submit: Optional[Callable[[str], Awaitable[None]]] = None,
+    ) -> Dict[str, str]:
+        """
+        Run all requests through the batch backend.
+        回傳成功的 `custom_id → content`；失敗的請求不會出現在結果中。
+        結果不會自動寫入 LLM cache：呼叫端驗證（parse）通過後再呼叫 warm_cache。
+
+        batch_id：重啟前已送出的 batch，直接恢復輪詢（不重送 requests）；
+        on_submit：送出後立即呼叫，讓呼叫端先保存 batch id。
+        """
+        if batch_id is None:
+            if not requests:
+                return {}
+            input_path = await asyncio.to_thread(self.write_input, requests)
+            batch_id = await self.backend.submit(input_path)
+            console.log(
+                f"[BatchLLM] submitted {batch_id} ({len(requests)} requests)", markup=False
+            )
+            if on_submit:
+                await on_submit(batch_id)
+        else:
+            console.log(f"[BatchLLM] resuming {batch_id}", markup=False)
+
+        status = "validating"
+        while True:
+            status = await self.backend.poll(batch_id)
+            if on_status:
+                on_status(status)
+            if status in self.TERMINAL:
+                break
+            await asyncio.sleep(self.poll_seconds)
+
+        if status != "completed":
+            raise RuntimeError(f"[BatchLLM] batch {batch_id} ended with status {status}")
+
+        outputs = self._parse_output(await self.backend.download(batch_id))
+        console.log(f"[BatchLLM] {batch_id} completed: {len(outputs)} ok", markup=False)
+        return outputs
+
+    @staticmethod
+    def _parse_output(text: str) -> Dict[str, str]:
+        outputs: Dict[str, str] = {}
+        for line in text.splitlines():
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            response = item.get("response") or {}
+            if item.get("error") or response.get("status_code") != 200:
+                continue
+            content = response["body"]["choices"][0]["message"]["content"]
+            outputs[item["custom_id"]] = (content or "").strip()
+        return outputs
+
+    async def warm_cache(self, requests: BatchRequests, outputs: Dict[str, str]):
+        """
+        Write validated outputs back to the LLM cache so interactive requests hit it.
+        只傳入已通過 response parser 的輸出；本地替身（offline）的假資料一律不寫入。
+        """
+        llm_cache = get_llm_cache()
+        if llm_cache is None or self.offline:
+            return
+        for custom_id, content in outputs.items():
+            request = requests[custom_id]
+            if not request.get("cache", True):
+                continue
+            key = llm_cache.make_key(
+                request["model"],
+                build_messages(
+                    request.get("system_prompt"),
+                    request.get("user_prompt"),
+                    request.get("messages"),
+                ),
+                request["temperature"],
+                request["max_tokens"],
+                {},
+            )
+            await llm_cache.set(key, content)
+
+
+@lru_cache()
+def get_batch_llm_client() -> BatchLLMClient:
+    settings = get_app_settings()
+    directory = Path(settings.llm_batch_dir)
+    if settings.llm_batch_backend == "local":
+        backend: BatchBackend = LocalBatchBackend(directory)
+        poll_seconds = 0.0
+    else:
+        backend = AzureBatchBackend()
+        poll_seconds = settings.llm_batch_poll_seconds
+    return BatchLLMClient(backend, directory, poll_seconds)
@@ -0,0 +1,74 @@
+import asyncio
+from functools import lru_cache
+from typing import AsyncIterator, Awaitable, Callable, Iterable, List, Tuple, TypeVar
+from src.config import get_app_settings
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def _resource_limits() -> dict[str, int]:
+    settings = get_app_settings()
+    return {
+        "llm": settings.llm_concurrency,
+        "anki_write": settings.anki_write_concurrency,
+    }
+
+
+@lru_cache(maxsize=None)
+def get_semaphore(resource: str) -> asyncio.Semaphore:
+    """
+    Process-wide semaphore for one external resource ("llm" / "anki_write").
+    所有 graph run 共用，避免並發 batch 壓垮 Azure OpenAI 或 AnkiConnect。
+    TTS 的並發上限由各 backend 自行宣告（見 src/utils/tts.py）。
+    """
+    limits = _resource_limits()
+    if resource not in limits:
+        raise KeyError(f"Unknown resource: {resource}")
+    return asyncio.Semaphore(max(1, limits[resource]))
+
+
+async def run_bounded(
+    items: Iterable[T], func: Callable[[T], Awaitable[R]], limit: int
+) -> List[R]:
+    """Run `func` over `items` with at most `limit` in flight; results keep input order."""
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def _run(item: T) -> R:
+        async with semaphore:
+            return await func(item)
+
+    return await asyncio.gather(*(_run(item) for item in items))
+
+
+async def iter_bounded(
+    items: Iterable[T], func: Callable[[T], Awaitable[R]], limit: int
+) -> AsyncIterator[Tuple[int, R]]:
+    """
+    Like run_bounded, but yields `(index, result)` as each item completes.
+    最多同時建立 `limit` 個 task，不累積結果，記憶體用量與 batch 大小無關。
+    """
+    iterator = iter(enumerate(items))
+    pending: dict[asyncio.Task, int] = {}
+
+    def _spawn() -> bool:
+        try:
+            index, item = next(iterator)
+        except StopIteration:
+            return False
+        pending[asyncio.ensure_future(func(item))] = index
+        return True
+
+    try:
+        for _ in range(max(1, limit)):
+            if not _spawn():
+                break
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                index = pending.pop(task)
+                yield index, task.result()
+                _spawn()
+    finally:
+        for task in pending:
+            task.cancel()
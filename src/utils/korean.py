@@ -0,0 +1,17 @@
+import re
+import unicodedata
+
+# 空白與零寬字元（不同輸入法 / 複製來源常混入）
+_IGNORED = re.compile(r"[\s\u200b-\u200d\u2060\ufeff]+")
+
+
+def normalize_key(text: str) -> str:
+    """
+    Normalization key for fuzzy duplicate detection of Korean words.
+
+    - 去除所有空白與零寬字元（공부하다 / 공부 하다）
+    - NFKD：完成形音節拆成組合用字母（jamo），NFC / NFD 來源得到相同 key；
+      相容字母（ㄱ U+3131）與全形字元也一併正規化
+    - casefold：混入的英文字母不分大小寫
+    """
+    return unicodedata.normalize("NFKD", _IGNORED.sub("", text)).casefold()
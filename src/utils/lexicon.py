@@ -0,0 +1,299 @@
+"""
+Local lexicon store（SQLite）：parse_word / extract_root 的快速路徑。
+
+查得到完整結果就略過 LLM；LLM 成功的結果寫回 lexicon。
+可用匯入工具從開放辭典 dump 批次載入：
+
+    python -m src.utils.lexicon import dump.jsonl
+    python -m src.utils.lexicon import dump.tsv --format tsv --overwrite
+    python -m src.utils.lexicon purge --source import
+    python -m src.utils.lexicon stats
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import sqlite3
+import sys
+import threading
+import time
+import unicodedata
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from pydantic import TypeAdapter, ValidationError
+
+from src.config import get_app_settings
+from src.models.root_schema import validate_root_value
+from src.models.word_schema import ExampleItem
+
+_FIELDS = ("meaning", "pos", "examples", "root")
+_POS_CODES = {"n", "v", "adj", "adv", "p"}
+# 辭典 dump 常見的韓文詞性標示 → WordParseOutput 的 pos
+_POS_ALIASES = {
+    "명사": "n",
+    "의존 명사": "n",
+    "대명사": "n",
+    "수사": "n",
+    "동사": "v",
+    "보조 동사": "v",
+    "형용사": "adj",
+    "보조 형용사": "adj",
+    "부사": "adv",
+    "조사": "p",
+    "noun": "n",
+    "verb": "v",
+    "adjective": "adj",
+    "adverb": "adv",
+    "particle": "p",
+}
+_EXAMPLES = TypeAdapter(List[ExampleItem])
+_SOURCES = ("import", "llm")
+
+
+def _key(word: str) -> str:
+    return unicodedata.normalize("NFC", word.strip())
+
+
+class Lexicon:
+    """
+    Word → meaning / pos / examples / root.
+
+    - 欄位可部分存在（例如辭典 dump 只有 root），查詢時只回傳完整的部分
+    - LLM 寫回時覆蓋舊值；匯入預設只補空欄位（--overwrite 才覆蓋）
+    """
+
+    def __init__(self, path: str):
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS lexicon (
+                word TEXT PRIMARY KEY,
+                meaning TEXT,
+                pos TEXT,
+                examples TEXT,
+                root TEXT,
+                source TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    # ============== Read ==============
+
+    def _get(self, word: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT meaning, pos, examples, root FROM lexicon WHERE word = ?",
+                (_key(word),),
+            ).fetchone()
+        if row is None:
+            return None
+        meaning, pos, examples, root = row
+        return {
+            "meaning": meaning,
+            "pos": pos,
+            "examples": json.loads(examples) if examples else None,
+            "root": root,
+        }
+
+    def _count(self, hit: bool):
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    async def lookup_parse(self, word: str) -> Optional[Dict[str, Any]]:
+        """meaning / pos / examples when all three are known."""
+        entry = await asyncio.to_thread(self._get, word)
+        hit = bool(entry and entry["meaning"] and entry["pos"] and entry["examples"])
+        self._count(hit)
+        if not hit:
+            return None
+        return {k: entry[k] for k in ("meaning", "pos", "examples")}
+
+    async def lookup_root(self, word: str) -> Optional[str]:
+        entry = await asyncio.to_thread(self._get, word)
+        root = entry["root"] if entry else None
+        self._count(root is not None)
+        return root
+
+    # ============== Write ==============
+
+    def _put_many(self, entries: Iterable[Dict[str, Any]], source: str, overwrite: bool) -> int:
+        # overwrite=True：新值優先；False：只補空欄位
+        merge = ", ".join(
+            f"{f} = COALESCE(excluded.{f}, {f})" if overwrite else f"{f} = COALESCE({f}, excluded.{f})"
+            for f in _FIELDS
+        )
+        sql = (
+            f"INSERT INTO lexicon (word, {', '.join(_FIELDS)}, source, updated_at) "
+            f"VALUES (?, ?, ?, ?, ?, ?, ?) "
+            f"ON CONFLICT(word) DO UPDATE SET {merge}, updated_at = excluded.updated_at"
+        )
+        now = time.time()
+        rows = [
+            (
+                _key(entry["word"]),
+                entry.get("meaning"),
+                entry.get("pos"),
+                json.dumps(entry["examples"], ensure_ascii=False) if entry.get("examples") else None,
+                entry.get("root"),
+                source,
+                now,
+            )
+            for entry in entries
+        ]
+        with self._lock:
+            self._conn.executemany(sql, rows)
+            self._conn.commit()
+        return len(rows)
+
+    async def remember(self, word: str, **fields: Any):
+        """Write back a successful LLM result (only the given fields)."""
+        entry = {"word": word, **{k: v for k, v in fields.items() if k in _FIELDS}}
+        await asyncio.to_thread(self._put_many, [entry], "llm", True)
+
+    def import_entries(
+        self, entries: Iterable[Dict[str, Any]], overwrite: bool = False, chunk_size: int = 5000
+    ) -> int:
+        total = 0
+        chunk: List[Dict[str, Any]] = []
+        for entry in entries:
+            chunk.append(entry)
+            if len(chunk) >= chunk_size:
+                total += self._put_many(chunk, "import", overwrite)
+                chunk = []
+        if chunk:
+            total += self._put_many(chunk, "import", overwrite)
+        return total
+
+    def purge(self, source: str) -> int:
+        """Delete every entry first written by `source` ("import" or "llm")."""
+        if source not in _SOURCES:
+            raise ValueError(f"unknown lexicon source: {source!r}")
+        with self._lock:
+            deleted = self._conn.execute("DELETE FROM lexicon WHERE source = ?", (source,)).rowcount
+            self._conn.commit()
+        return deleted
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, complete = self._conn.execute(
+                "SELECT COUNT(*), COUNT(CASE WHEN meaning IS NOT NULL AND pos IS NOT NULL "
+                "AND examples IS NOT NULL AND root IS NOT NULL THEN 1 END) FROM lexicon"
+            ).fetchone()
+        total = self.hits + self.misses
+        return {
+            "entries": entries,
+            "complete_entries": complete,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+@lru_cache()
+def get_lexicon() -> Optional[Lexicon]:
+    settings = get_app_settings()
+    if not settings.lexicon_enabled:
+        return None
+    return Lexicon(settings.lexicon_path)
+
+
+# ============== Import tool ==============
+
+
+def normalize_entry(raw: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Map one dictionary-dump record to a lexicon entry; invalid fields are dropped.
+    接受的欄位：word、meaning、pos（代碼或韓文詞性）、root 或 hanja / origin（漢字原語）、
+    native（純韓語詞 → root=N）、examples（[{type, kr, zh}]）。
+    root 與 extract_root prompt 相同只收單一漢字或 N；多字的漢字原語（學校）無法判斷
+    取哪個字，不匯入 root，交給 LLM 判斷。
+    """
+    word = (raw.get("word") or "").strip()
+    if not word:
+        return None
+    entry: Dict[str, Any] = {"word": word}
+
+    meaning = (raw.get("meaning") or "").strip()
+    if meaning:
+        entry["meaning"] = meaning
+
+    pos = (raw.get("pos") or "").strip()
+    pos = pos if pos in _POS_CODES else _POS_ALIASES.get(pos.lower())
+    if pos:
+        entry["pos"] = pos
+
+    root = raw.get("root") or raw.get("hanja") or raw.get("origin")
+    if not root and str(raw.get("native", "")).lower() in ("1", "true", "yes"):
+        root = "N"
+    if root:
+        try:
+            root = validate_root_value(str(root))
+        except ValueError:
+            root = None
+        if root is not None and (root == "N" or len(root) == 1):
+            entry["root"] = root
+
+    examples = raw.get("examples")
+    if isinstance(examples, str) and examples:
+        try:
+            examples = json.loads(examples)
+        except json.JSONDecodeError:
+            examples = None
+    if examples:
+        try:
+            entry["examples"] = [ex.model_dump() for ex in _EXAMPLES.validate_python(examples)]
+        except ValidationError:
+            pass
+
+    return entry if len(entry) > 1 else None
+
+
+def read_dump(path: Path, fmt: str) -> Iterator[Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8") as f:
+        if fmt == "jsonl":
+            records: Iterable[Dict[str, Any]] = (json.loads(line) for line in f if line.strip())
+        else:
+            records = csv.DictReader(f, delimiter="\t" if fmt == "tsv" else ",")
+        for record in records:
+            entry = normalize_entry(record)
+            if entry is not None:
+                yield entry
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(prog="python -m src.utils.lexicon")
+    sub = parser.add_subparsers(dest="command", required=True)
+    imp = sub.add_parser("import", help="bulk-load a dictionary dump")
+    imp.add_argument("path", type=Path)
+    imp.add_argument("--format", choices=["jsonl", "tsv", "csv"], default="jsonl")
+    imp.add_argument("--overwrite", action="store_true", help="replace existing field values")
+    purge = sub.add_parser("purge", help="delete entries by source")
+    purge.add_argument("--source", choices=_SOURCES, required=True)
+    sub.add_parser("stats", help="show lexicon size")
+    args = parser.parse_args(argv)
+
+    settings = get_app_settings()
+    lexicon = Lexicon(settings.lexicon_path)
+    if args.command == "import":
+        count = lexicon.import_entries(read_dump(args.path, args.format), overwrite=args.overwrite)
+        print(f"imported {count} entries into {settings.lexicon_path}")
+    elif args.command == "purge":
+        count = lexicon.purge(args.source)
+        print(f"purged {count} {args.source} entries from {settings.lexicon_path}")
+    print(json.dumps(lexicon.stats(), ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
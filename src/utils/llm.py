@@ -1,16 +1,273 @@
 # src/utils/llm.py
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+from pathlib import Path
 from openai import AsyncAzureOpenAI
-from typing import Optional, List, Dict, Any
-from src.config import get_env_settings
+from typing import Callable, Optional, List, Dict, Any, Type
+from pydantic import BaseModel
+from src.config import get_env_settings, get_app_settings
+from src.utils.concurrency import get_semaphore
+from src.utils.rate_limit import estimate_tokens, get_rate_limiter
 
-# 初始化 Azure OpenAI 客戶端
+# 初始化 Azure OpenAI 客戶端（重試交給 rate limiter，關閉 SDK 內建重試避免重複退避）
 _settings = get_env_settings()
 client = AsyncAzureOpenAI(
     azure_endpoint=_settings.endpoint,
     api_key=_settings.api_key,
-    api_version=_settings.api_version
+    api_version=_settings.api_version,
+    max_retries=0,
 )
 
+
+class LLMCache:
+    """
+    Disk-backed (SQLite) LLM response cache.
+
+    - key = sha256(model, messages, temperature, max_tokens, 其他 API 參數)
+    - 超過 ttl 的資料視為 miss；超過 max_entries 時依最後存取時間淘汰
+    """
+
+    def __init__(self, path: str, ttl_seconds: int, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_cache (accessed_at)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(
+        model: str,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        extra: Dict[str, Any],
+    ) -> str:
+        raw = json.dumps(
+            {
+                "model": model,
+                "messages": messages,
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+                "extra": extra,
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def _set(self, key: str, response: str):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache VALUES (?, ?, ?, ?)",
+                (key, response, now, now),
+            )
+            self._writes += 1
+            # 每 100 次寫入做一次淘汰（TTL + 筆數上限）
+            if self._writes % 100 == 0:
+                self._evict(now)
+            self._conn.commit()
+
+    def _reject(self, key: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            self._conn.commit()
+            # get() 已算作 hit，但這筆不能用：改記為 miss，hit rate 只反映真正省下的呼叫
+            self.hits -= 1
+            self.misses += 1
+
+    def _evict(self, now: float):
+        self._conn.execute(
+            "DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,)
+        )
+        self._conn.execute(
+            """
+            DELETE FROM llm_cache WHERE key IN (
+                SELECT key FROM llm_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.max_entries,),
+        )
+
+    async def get(self, key: str) -> Optional[str]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, response: str):
+        await asyncio.to_thread(self._set, key, response)
+
+    async def reject(self, key: str):
+        """Drop an entry returned by get() that failed validation (counted as a miss)."""
+        await asyncio.to_thread(self._reject, key)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+
+@lru_cache()
+def get_llm_cache() -> Optional[LLMCache]:
+    settings = get_app_settings()
+    if not settings.llm_cache_enabled:
+        return None
+    return LLMCache(
+        path=settings.llm_cache_path,
+        ttl_seconds=settings.llm_cache_ttl_seconds,
+        max_entries=settings.llm_cache_max_entries,
+    )
+
+
+class LLMUsageStats:
+    """Per-prompt call count, token usage and latency (p50 / p95)."""
+
+    def __init__(self, window: int = 1000):
+        self._window = window
+        self._stats: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, tag: str, latency: float, usage: Any):
+        entry = self._stats.setdefault(
+            tag,
+            {
+                "calls": 0,
+                "prompt_tokens": 0,
+                "completion_tokens": 0,
+                "latencies": deque(maxlen=self._window),
+            },
+        )
+        entry["calls"] += 1
+        entry["latencies"].append(latency)
+        if usage is not None:
+            entry["prompt_tokens"] += getattr(usage, "prompt_tokens", 0) or 0
+            entry["completion_tokens"] += getattr(usage, "completion_tokens", 0) or 0
+
+    @staticmethod
+    def _percentile(values: List[float], pct: float) -> float:
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * pct))], 4)
+
+    def snapshot(self) -> Dict[str, Any]:
+        result = {}
+        for tag, entry in self._stats.items():
+            calls = entry["calls"]
+            latencies = list(entry["latencies"])
+            result[tag] = {
+                "calls": calls,
+                "prompt_tokens": entry["prompt_tokens"],
+                "completion_tokens": entry["completion_tokens"],
+                "avg_total_tokens": round(
+                    (entry["prompt_tokens"] + entry["completion_tokens"]) / calls, 1
+                ),
+                "latency_p50": self._percentile(latencies, 0.5),
+                "latency_p95": self._percentile(latencies, 0.95),
+            }
+        return result
+
+
+usage_stats = LLMUsageStats()
+
+
+def structured_response_format(schema: Type[BaseModel], name: str) -> Dict[str, Any]:
+    """
+    Build an OpenAI `json_schema` response_format (strict structured output) from a Pydantic model.
+    strict 模式要求每個 object 都列出全部 required 且 additionalProperties=false。
+    """
+
+    def _strict(node: Any) -> Any:
+        if isinstance(node, list):
+            return [_strict(v) for v in node]
+        if not isinstance(node, dict):
+            return node
+        out = {}
+        for key, value in node.items():
+            if key in ("title", "default"):
+                continue
+            if key in ("properties", "$defs"):
+                # 這兩層的 key 是欄位 / 定義名稱，不做過濾
+                out[key] = {name: _strict(sub) for name, sub in value.items()}
+            else:
+                out[key] = _strict(value)
+        if "properties" in out:
+            out["required"] = list(out["properties"])
+            out["additionalProperties"] = False
+        return out
+
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": name,
+            "schema": _strict(schema.model_json_schema()),
+            "strict": True,
+        },
+    }
+
+
+def build_messages(
+    system_prompt: Optional[str] = None,
+    user_prompt: Optional[str] = None,
+    messages: Optional[List[Dict[str, str]]] = None,
+) -> List[Dict[str, str]]:
+    if messages:
+        return messages
+    if not user_prompt:
+        raise ValueError("Either `user_prompt` or `messages` must be provided.")
+    messages = []
+    if system_prompt:
+        messages.append({"role": "system", "content": system_prompt})
+    messages.append({"role": "user", "content": user_prompt})
+    return messages
+
+
 async def ask_llm(
     *,
     model: str = "gpt-4o-mini",
@@ -19,6 +276,9 @@ async def ask_llm(
     messages: Optional[List[Dict[str, str]]] = None,
     temperature: float = 0.2,
     max_tokens: int = 800,
+    cache: bool = True,
+    tag: str = "default",
+    validate: Optional[Callable[[str], Any]] = None,
     **kwargs: Any
 ) -> str:
     """
@@ -31,29 +291,52 @@ async def ask_llm(
         messages: 自訂 messages 列表（若提供則覆蓋 system/user）
         temperature: 生成溫度
         max_tokens: 最大 token 數
+        cache: 是否使用 LLM response cache（prompt YAML 可設 `cache: false` 關閉）
+        tag: 用於統計 token / latency 的名稱（通常為 prompt name）
+        validate: 呼叫端的 parser；拋出例外時該回應不寫入 cache（例外照常拋出）
         kwargs: 傳遞其他 OpenAI API 參數
 
     Returns:
         str: 模型回傳的主要文字內容
     """
 
-    if not messages:
-        if not user_prompt:
-            raise ValueError("Either `user_prompt` or `messages` must be provided.")
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.append({"role": "user", "content": user_prompt})
+    messages = build_messages(system_prompt, user_prompt, messages)
+
+    llm_cache = get_llm_cache() if cache else None
+    if llm_cache is not None:
+        cache_key = llm_cache.make_key(model, messages, temperature, max_tokens, kwargs)
+        cached = await llm_cache.get(cache_key)
+        if cached is not None:
+            try:
+                if validate is not None:
+                    validate(cached)
+                return cached
+            except Exception:
+                # 舊版寫入的無效回應：刪除後重新呼叫 LLM
+                await llm_cache.reject(cache_key)
 
-    try:
-        resp = await client.chat.completions.create(
+    start = 0.0
+
+    async def _call():
+        nonlocal start
+        start = time.perf_counter()
+        # with_raw_response：保留 x-ratelimit-* header 給 rate limiter 校正預算
+        return await client.chat.completions.with_raw_response.create(
             model=model,
             messages=messages,
             temperature=temperature,
             max_tokens=max_tokens,
             **kwargs
         )
-        return resp.choices[0].message.content.strip()
-    except Exception as e:
-        print(f"[ask_llm] Error: {e}")
-        raise
+
+    async with get_semaphore("llm"):
+        resp = await get_rate_limiter().run(_call, estimate_tokens(messages, max_tokens))
+        # latency 只計最後一次成功的呼叫，不含排隊與 backoff
+        usage_stats.record(tag, time.perf_counter() - start, resp.usage)
+    content = resp.choices[0].message.content.strip()
+    if validate is not None:
+        validate(content)
+
+    if llm_cache is not None:
+        await llm_cache.set(cache_key, content)
+    return content
@@ -1,10 +1,20 @@
-from functools import wraps
+import atexit
+import logging
+import queue
+import random
+import time
+from functools import lru_cache, wraps
+from logging.handlers import QueueHandler, QueueListener
 from typing import Callable, Dict, Any
 from rich.console import Console
-from datetime import datetime
+from rich.logging import RichHandler
+from rich.markup import escape
+from src.config import get_app_settings
 
 console = Console(log_path=False)
 
+_MISSING = "<new>"
+
 
 def _format_val(val: Any) -> str:
     """Format value for display, escaping Rich markup."""
@@ -18,35 +28,107 @@ def _format_val(val: Any) -> str:
     return display.replace("[", "\\[")
 
 
+class _LazyDiff:
+    """State diff rendered only when the record is actually emitted (in the listener thread)."""
+
+    __slots__ = ("before", "after")
+
+    def __init__(self, before: Dict[str, Any], after: Dict[str, Any]):
+        self.before = before
+        self.after = after
+
+    def __str__(self) -> str:
+        parts = [
+            f"[dim]{key}:[/] [red]{_format_val(self.before[key])}[/] → [green]{_format_val(val)}[/]"
+            for key, val in self.after.items()
+            if self.before[key] != val
+        ]
+        return ", ".join(parts) if parts else "[dim]<no changes>[/]"
+
+
+class _LazyKeys:
+    __slots__ = ("delta",)
+
+    def __init__(self, delta: Dict[str, Any]):
+        self.delta = delta
+
+    def __str__(self) -> str:
+        return ", ".join(self.delta) if self.delta else "[dim]<no changes>[/]"
+
+
+class _DeferredQueueHandler(QueueHandler):
+    # 預設 prepare() 會在呼叫端 format 訊息；改由 listener thread 格式化，hot path 只做 enqueue
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+@lru_cache()
+def get_node_logger() -> logging.Logger:
+    """
+    Node instrumentation logger.
+
+    - 呼叫端只把 record 放進 queue（QueueHandler），由背景 QueueListener 寫到 rich console
+    - NODE_LOG_LEVEL：DEBUG = start + 欄位 diff；INFO = 耗時 + 變動欄位名；WARNING 以上只記錄失敗
+    """
+    settings = get_app_settings()
+    logger = logging.getLogger("anki_loader.nodes")
+    logger.setLevel(settings.node_log_level.upper())
+    logger.propagate = False
+
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    output = RichHandler(
+        console=console,
+        show_level=False,
+        show_path=False,
+        markup=True,
+        rich_tracebacks=False,
+        log_time_format="[%X]",  # 與 console.log 相同的時間格式
+    )
+    listener = QueueListener(records, output)
+    listener.start()
+    atexit.register(listener.stop)  # 結束時把剩餘的 record 寫完
+    logger.addHandler(_DeferredQueueHandler(records))
+    return logger
+
+
+@lru_cache()
+def _sample_rate() -> float:
+    return get_app_settings().node_log_sample_rate
+
+
 def node_logger(func: Callable):
-    """Compact node logger matching service log format."""
+    """Level-aware, sampled node logger (non-blocking output)."""
+    node_name = func.__name__
 
     @wraps(func)
     async def wrapper(state: Dict[str, Any], *args, **kwargs):
-        node_name = func.__name__
-        start_time = datetime.now()
-        before_state = dict(state)
-
-        # ── Node Start ──
-        console.log(f"[cyan]\\[{node_name}][/] ▶ start")
-
-        # Execute node
-        result_delta = await func(state, *args, **kwargs)
-
-        # Compute diff
-        diff_parts = []
-        for key, after_val in result_delta.items():
-            before_val = before_state.get(key, "<new>")
-            if before_val != after_val:
-                diff_parts.append(
-                    f"[dim]{key}:[/] [red]{_format_val(before_val)}[/] → [green]{_format_val(after_val)}[/]"
-                )
-
-        duration = (datetime.now() - start_time).total_seconds()
-        diff_str = ", ".join(diff_parts) if diff_parts else "[dim]<no changes>[/]"
-
-        # ── Node End ──
-        console.log(f"[green]\\[{node_name} {duration:.3f}s][/] ✓ {diff_str}")
+        logger = get_node_logger()
+        rate = _sample_rate()
+        sampled = rate >= 1.0 or random.random() < rate
+        debug = sampled and logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug("[cyan]\\[%s][/] ▶ start", node_name)
+
+        start = time.perf_counter()
+        try:
+            result_delta = await func(state, *args, **kwargs)
+        except Exception as e:
+            # 失敗不受 sampling 影響
+            logger.error(
+                "[red]\\[%s %.3fs][/] ✗ %s: %s",
+                node_name, time.perf_counter() - start, type(e).__name__, escape(str(e)),
+            )
+            raise
+        duration = time.perf_counter() - start
+
+        if debug:
+            # node 只回傳 delta、不修改傳入的 state，所以只需保留 delta 欄位的舊值參照（不複製整個 state）
+            before = {key: state.get(key, _MISSING) for key in result_delta}
+            logger.debug(
+                "[green]\\[%s %.3fs][/] ✓ %s", node_name, duration, _LazyDiff(before, result_delta)
+            )
+        elif sampled and logger.isEnabledFor(logging.INFO):
+            logger.info("[green]\\[%s %.3fs][/] ✓ %s", node_name, duration, _LazyKeys(result_delta))
 
         return result_delta
 
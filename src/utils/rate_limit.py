@@ -0,0 +1,262 @@
+import asyncio
+import random
+import re
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+import openai
+
+from src.config import get_app_settings
+from src.utils.logger import console
+
+# 可重試的錯誤：429、5xx、逾時 / 連線中斷；其餘（400、401、content filter…）直接拋出
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.InternalServerError,
+    openai.APIConnectionError,  # 含 APITimeoutError
+)
+
+_DURATION = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_UNIT_SECONDS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def _parse_int(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _parse_duration(value: Optional[str]) -> Optional[float]:
+    """`x-ratelimit-reset-*` values: plain seconds ("12") or "1m30s" / "250ms"."""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION.findall(value)
+    if not parts:
+        return None
+    return sum(float(n) * _UNIT_SECONDS[unit] for n, unit in parts)
+
+
+def retry_after_seconds(headers: Any) -> Optional[float]:
+    """Server-requested wait from `retry-after-ms` / `retry-after` (seconds or HTTP date)."""
+    if headers is None:
+        return None
+    ms = headers.get("retry-after-ms")
+    if ms:
+        try:
+            return float(ms) / 1000
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def estimate_tokens(messages: List[Dict[str, Any]], max_tokens: int) -> int:
+    """
+    Azure 的 TPM 以「prompt 估計 token + max_tokens」計算，不是實際用量。
+    韓文 / 中文約 1 字 1 token，英文約 4 字 1 token，這裡取保守的 chars / 2。
+    """
+    chars = sum(len(str(m.get("content") or "")) for m in messages)
+    return chars // 2 + max_tokens
+
+
+class RateLimiter:
+    """
+    Shared RPM / TPM limiter + retry engine for Azure OpenAI.
+
+    - 60 秒滑動視窗記錄已送出的 request 與預估 token，超出預算就排隊等待
+    - 排隊為 FIFO（asyncio.Lock 依到達順序喚醒），vocab / listening graph 的呼叫公平輪流
+    - 回應的 `x-ratelimit-limit-*` 會校正預算；`remaining` 歸零時暫停到 reset
+    - 429 / 5xx / 逾時：jittered exponential backoff，並遵守 `Retry-After`（429 會暫停所有呼叫端）
+    """
+
+    WINDOW = 60.0
+
+    def __init__(
+        self,
+        rpm_limit: int,
+        tpm_limit: int,
+        max_retries: int,
+        backoff_base: float,
+        backoff_max: float,
+    ):
+        self.rpm_limit = rpm_limit
+        self.tpm_limit = tpm_limit
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self._window: Deque[List[float]] = deque()  # [sent_at, tokens]
+        self._window_tokens = 0
+        self._lock = asyncio.Lock()
+        self._paused_until = 0.0
+        self._waiting = 0
+
+        self.remaining_requests: Optional[int] = None
+        self.remaining_tokens: Optional[int] = None
+        self.requests = 0
+        self.throttled = 0
+        self.retries = 0
+        self.failures = 0
+        self.wait_seconds = 0.0
+
+    # ============== Budget ==============
+
+    def _trim(self, now: float):
+        while self._window and self._window[0][0] <= now - self.WINDOW:
+            _, tokens = self._window.popleft()
+            self._window_tokens -= tokens
+
+    def _budget_delay(self, now: float, tokens: int) -> float:
+        delay = self._paused_until - now
+        if self.rpm_limit > 0 and len(self._window) >= self.rpm_limit:
+            oldest = self._window[len(self._window) - self.rpm_limit][0]
+            delay = max(delay, oldest + self.WINDOW - now)
+        if self.tpm_limit > 0 and self._window and self._window_tokens + tokens > self.tpm_limit:
+            # 找出最早讓足夠 token 滑出視窗的時間點；單次超過 tpm 時等視窗清空即可
+            excess = self._window_tokens + tokens - self.tpm_limit
+            for sent_at, used in self._window:
+                excess -= used
+                if excess <= 0:
+                    break
+            delay = max(delay, sent_at + self.WINDOW - now)
+        return delay
+
+    async def acquire(self, tokens: int):
+        """Wait (FIFO) until the request fits the RPM / TPM budget, then reserve it."""
+        self._waiting += 1
+        started = time.monotonic()
+        try:
+            async with self._lock:
+                while True:
+                    now = time.monotonic()
+                    self._trim(now)
+                    delay = self._budget_delay(now, tokens)
+                    if delay <= 0:
+                        break
+                    await asyncio.sleep(delay)
+                self._window.append([now, tokens])
+                self._window_tokens += tokens
+        finally:
+            self._waiting -= 1
+            self.wait_seconds += time.monotonic() - started
+
+    def pause(self, seconds: float):
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def observe(self, headers: Any):
+        """Calibrate the budget from Azure / OpenAI `x-ratelimit-*` response headers."""
+        if headers is None:
+            return
+        limit_requests = _parse_int(headers.get("x-ratelimit-limit-requests"))
+        limit_tokens = _parse_int(headers.get("x-ratelimit-limit-tokens"))
+        if limit_requests:
+            self.rpm_limit = limit_requests
+        if limit_tokens:
+            self.tpm_limit = limit_tokens
+
+        self.remaining_requests = _parse_int(headers.get("x-ratelimit-remaining-requests"))
+        self.remaining_tokens = _parse_int(headers.get("x-ratelimit-remaining-tokens"))
+        exhausted = []
+        if self.remaining_requests == 0:
+            exhausted.append(_parse_duration(headers.get("x-ratelimit-reset-requests")))
+        if self.remaining_tokens == 0:
+            exhausted.append(_parse_duration(headers.get("x-ratelimit-reset-tokens")))
+        if exhausted:
+            # 沒給 reset 時保守等 1 秒，之後由 429 + Retry-After 接手
+            self.pause(min(self.backoff_max, max(d or 1.0 for d in exhausted)))
+
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        # full jitter，避免多個呼叫端在同一時間點一起重試
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.backoff_max))
+        return delay
+
+    # ============== Retry engine ==============
+
+    async def run(self, call: Callable[[], Awaitable[Any]], tokens: int) -> Any:
+        """
+        Run `call` (returning an OpenAI raw response) under the limiter with retries.
+        Returns the parsed response.
+        """
+        attempt = 0
+        while True:
+            await self.acquire(tokens)
+            self.requests += 1
+            try:
+                raw = await call()
+            except RETRYABLE_ERRORS as e:
+                response = getattr(e, "response", None)
+                headers = response.headers if response is not None else None
+                self.observe(headers)
+                retry_after = retry_after_seconds(headers)
+                if isinstance(e, openai.RateLimitError):
+                    self.throttled += 1
+                    # 429 代表整個 deployment 的額度用完，所有呼叫端一起暫停
+                    self.pause(self._backoff(attempt, retry_after))
+                if attempt >= self.max_retries:
+                    self.failures += 1
+                    raise
+                delay = self._backoff(attempt, retry_after)
+                attempt += 1
+                self.retries += 1
+                console.log(
+                    f"[RateLimiter] {type(e).__name__}, retry {attempt}/{self.max_retries} "
+                    f"in {delay:.1f}s",
+                    markup=False,
+                )
+                await asyncio.sleep(delay)
+                continue
+            except Exception:
+                self.failures += 1
+                raise
+            self.observe(raw.headers)
+            return raw.parse()
+
+    def snapshot(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        self._trim(now)
+        return {
+            "rpm_limit": self.rpm_limit,
+            "tpm_limit": self.tpm_limit,
+            "window_requests": len(self._window),
+            "window_tokens": self._window_tokens,
+            "remaining_requests": self.remaining_requests,
+            "remaining_tokens": self.remaining_tokens,
+            "waiting": self._waiting,
+            "paused_for": round(max(0.0, self._paused_until - now), 3),
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "retries": self.retries,
+            "failures": self.failures,
+            "avg_wait_seconds": round(self.wait_seconds / self.requests, 4) if self.requests else 0.0,
+        }
+
+
+@lru_cache()
+def get_rate_limiter() -> RateLimiter:
+    settings = get_app_settings()
+    return RateLimiter(
+        rpm_limit=settings.llm_rpm_limit,
+        tpm_limit=settings.llm_tpm_limit,
+        max_retries=settings.llm_max_retries,
+        backoff_base=settings.llm_backoff_base,
+        backoff_max=settings.llm_backoff_max,
+    )
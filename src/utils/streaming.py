@@ -0,0 +1,78 @@
+import json
+from typing import Any, AsyncIterator, Dict, Literal, Tuple
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+StreamFormat = Literal["ndjson", "sse"]
+
+
+async def batch_progress_events(
+    total: int, results: AsyncIterator[Tuple[int, BaseModel]]
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Turn `(index, item)` pairs into progress events with running counters.
+    先送出 `start` event（`results` 尚未開始迭代，查重 / LLM 預取前 client 就收到回應），
+    每個 item 一個 `item` event，最後一個 `summary` event；item 送出後即釋放。
+    串流開始後發生的錯誤以 `status: "failed"` 的 summary 回報（HTTP status 已送出）。
+    """
+    counts = {"success": 0, "skipped": 0, "failed": 0}
+    done = 0
+    yield {"type": "start", "total": total}
+    try:
+        async for index, item in results:
+            done += 1
+            counts[item.status if item.status in counts else "failed"] += 1
+            yield {
+                "type": "item",
+                "index": index,
+                "item": item.model_dump(),
+                "done": done,
+                "total": total,
+                "success_count": counts["success"],
+                "skip_count": counts["skipped"],
+                "fail_count": counts["failed"],
+            }
+    except Exception as e:
+        yield {
+            "type": "summary",
+            "status": "failed",
+            "error": str(e),
+            "total": total,
+            "success_count": counts["success"],
+            "skip_count": counts["skipped"],
+            "fail_count": counts["failed"],
+        }
+        return
+    yield {
+        "type": "summary",
+        "status": "completed",
+        "total": total,
+        "success_count": counts["success"],
+        "skip_count": counts["skipped"],
+        "fail_count": counts["failed"],
+    }
+
+
+def stream_events(
+    events: AsyncIterator[Dict[str, Any]], fmt: StreamFormat = "ndjson"
+) -> StreamingResponse:
+    """
+    Stream dict events as NDJSON (one JSON object per line) or Server-Sent Events.
+    每個 event 產生後立即送出，不在記憶體中累積。
+    """
+
+    async def _encode():
+        async for event in events:
+            data = json.dumps(event, ensure_ascii=False)
+            if fmt == "sse":
+                yield f"event: {event.get('type', 'message')}\ndata: {data}\n\n"
+            else:
+                yield data + "\n"
+
+    media_type = "text/event-stream" if fmt == "sse" else "application/x-ndjson"
+    return StreamingResponse(
+        _encode(),
+        media_type=media_type,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,21 +1,87 @@
 import asyncio
-from io import BytesIO
-from gtts import gTTS
+import hashlib
+import os
+import tempfile
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator
+from src.config import get_tts_settings
+from src.utils.audio_cache import AudioCache, get_audio_cache
+from src.utils.tts_backends import get_tts_backend
+from src.utils.tts_executor import get_tts_executor
 
 
 async def generate_korean_tts(text: str) -> bytes:
     """
-    Generate TTS audio for Korean text using gTTS.
-    Returns MP3 audio bytes.
+    Generate TTS audio for Korean text with the configured backend (TTS_BACKEND).
+    在專屬的 TTS executor 上執行（bounded queue + timeout）。Returns MP3 audio bytes.
     """
+    return await get_tts_executor().submit(text)
 
-    def _generate():
-        tts = gTTS(text=text, lang="ko")
-        buffer = BytesIO()
-        tts.write_to_fp(buffer)
-        buffer.seek(0)
-        return buffer.read()
 
-    loop = asyncio.get_event_loop()
-    audio_bytes = await loop.run_in_executor(None, _generate)
-    return audio_bytes
+def _cache_key(audio_cache, text: str) -> str:
+    return audio_cache.make_key(text, **get_tts_backend().voice())
+
+
+# 加入 voice 之前（只支援 gTTS 預設聲音）的檔名是 md5(text)；
+# 同樣的聲音沿用舊檔名，Anki 內既有的音檔仍被 media index 認得，不會重傳或留下孤兒檔
+_LEGACY_VOICE = {"engine": "gtts", "lang": "ko", "tld": "com", "slow": False}
+
+
+def media_filename(prefix: str, text: str) -> str:
+    """
+    Anki media filename for the text's audio, e.g. `vocab_<key>.mp3`.
+    gTTS 預設聲音：`<prefix>_<md5(text)[:12]>.mp3`（與舊版相同）；
+    其他 backend / 聲音設定：key 與 audio cache 相同（text + voice），換聲音後檔名也不同，
+    不會被 media index 視為已上傳而略過。
+    """
+    voice = get_tts_backend().voice()
+    if voice == _LEGACY_VOICE:
+        return f"{prefix}_{hashlib.md5(text.encode()).hexdigest()[:12]}.mp3"
+    return f"{prefix}_{AudioCache.make_key(text, **voice)[:16]}.mp3"
+
+
+async def prepare_korean_tts(text: str):
+    """
+    Make sure TTS audio for the text is in the local audio cache (generate_tts node).
+    cache 關閉時不預先生成，由 store_audio 在上傳當下生成自己的暫存檔。
+    """
+    audio_cache = get_audio_cache()
+    if audio_cache is None:
+        return
+    key = _cache_key(audio_cache, text)
+    if not await audio_cache.touch(key):
+        await audio_cache.put(key, await generate_korean_tts(text))
+
+
+def _write_spool(data: bytes) -> Path:
+    # 每次呼叫各自一個唯一檔名，同一句話並發執行時不會互相覆寫 / 刪除
+    directory = Path(get_tts_settings().cache_dir) / "spool"
+    directory.mkdir(parents=True, exist_ok=True)
+    fd, path = tempfile.mkstemp(dir=directory, suffix=".mp3")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    return Path(path)
+
+
+@asynccontextmanager
+async def korean_tts_file(text: str) -> AsyncIterator[Path]:
+    """
+    Yield a local media file holding TTS audio for the text (store_audio node).
+    音檔只存在本地檔案，graph state / checkpoint 只帶檔名。
+    有 audio cache 時使用 cache 檔（miss 時重新生成，例如被淘汰或 checkpoint resume），
+    上傳期間 pin 住，並發的 put 不會把它淘汰；
+    cache 關閉時寫入本次專用的 spool 檔，離開時只刪除這個檔案。
+    """
+    audio_cache = get_audio_cache()
+    if audio_cache is not None:
+        with audio_cache.pin(_cache_key(audio_cache, text)) as path:
+            await prepare_korean_tts(text)
+            yield path
+        return
+
+    path = await asyncio.to_thread(_write_spool, await generate_korean_tts(text))
+    try:
+        yield path
+    finally:
+        await asyncio.to_thread(path.unlink, missing_ok=True)
@@ -0,0 +1,150 @@
+"""
+Pluggable TTS backends（由 TTS_BACKEND 選擇）：
+
+- GTTSBackend：Google Translate TTS（網路請求，batch 量大時容易被限流）
+- LocalCommandBackend：本地離線合成器（espeak-ng / Piper 等 CLI），每次呼叫啟動一個 subprocess，
+  輸出可再經 encoder（例如 lame）轉成 MP3
+- FakeTTSBackend：不發音的固定 bytes，用於離線測試整個流程
+
+每個 backend 宣告自己的並發上限（concurrency），即 TTSExecutor 的 worker 數。
+"""
+
+import asyncio
+import shlex
+import tempfile
+from concurrent.futures import Executor
+from functools import lru_cache
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Protocol
+
+from src.config import get_tts_settings
+
+
+class TTSBackend(Protocol):
+    name: str
+    concurrency: int
+
+    def voice(self) -> Dict[str, Any]:
+        """Settings that change the produced audio (part of the audio cache key)."""
+        ...
+
+    async def synthesize(self, text: str, pool: Executor) -> bytes:
+        """Blocking work must run on `pool` (the TTS executor's threads)."""
+        ...
+
+
+class GTTSBackend:
+    name = "gtts"
+
+    def __init__(self, lang: str, tld: str, slow: bool, concurrency: int):
+        self.lang = lang
+        self.tld = tld
+        self.slow = slow
+        self.concurrency = concurrency
+
+    def voice(self) -> Dict[str, Any]:
+        # 與舊版 cache key 相同，既有音檔不需重新生成
+        return {"engine": "gtts", "lang": self.lang, "tld": self.tld, "slow": self.slow}
+
+    def _generate(self, text: str) -> bytes:
+        from gtts import gTTS
+
+        tts = gTTS(text=text, lang=self.lang, tld=self.tld, slow=self.slow)
+        buffer = BytesIO()
+        tts.write_to_fp(buffer)
+        return buffer.getvalue()
+
+    async def synthesize(self, text: str, pool: Executor) -> bytes:
+        return await asyncio.get_running_loop().run_in_executor(pool, self._generate, text)
+
+
+class LocalCommandBackend:
+    """
+    Offline synthesizer run as a subprocess.
+
+    command 佔位符：`{text}` 以單一參數傳入（不經 shell）；沒有 `{text}` 時文字由 stdin 傳入。
+    `{output}` 為暫存輸出檔；沒有 `{output}` 時讀取 stdout。
+    encode_command 非空時，把合成結果經 stdin → stdout 轉碼（預設轉成 MP3）。
+    """
+
+    name = "local"
+
+    def __init__(self, command: str, encode_command: str, concurrency: int):
+        if not command.strip():
+            raise ValueError("TTS_LOCAL_COMMAND must not be empty for the local backend")
+        self.command = command
+        self.encode_command = encode_command
+        self.concurrency = concurrency
+
+    def voice(self) -> Dict[str, Any]:
+        return {"engine": "local", "command": self.command, "encode": self.encode_command}
+
+    async def _run(self, argv: List[str], stdin: Optional[bytes]) -> bytes:
+        proc = await asyncio.create_subprocess_exec(
+            *argv,
+            stdin=asyncio.subprocess.PIPE if stdin is not None else asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            stdout, stderr = await proc.communicate(stdin)
+        except BaseException:
+            # executor 逾時或呼叫端取消時不留下孤兒 process
+            if proc.returncode is None:
+                proc.kill()
+                await proc.wait()
+            raise
+        if proc.returncode != 0:
+            detail = stderr.decode("utf-8", "replace").strip()[:300]
+            raise RuntimeError(f"[TTS] {argv[0]} exited with {proc.returncode}: {detail}")
+        return stdout
+
+    async def synthesize(self, text: str, pool: Executor) -> bytes:
+        with tempfile.TemporaryDirectory(prefix="tts_") as tmp:
+            output = Path(tmp) / "out"
+            argv = [
+                part.replace("{text}", text).replace("{output}", str(output))
+                for part in shlex.split(self.command)
+            ]
+            stdin = None if "{text}" in self.command else text.encode("utf-8")
+            audio = await self._run(argv, stdin)
+            if "{output}" in self.command:
+                audio = await asyncio.get_running_loop().run_in_executor(pool, output.read_bytes)
+        if not audio:
+            raise RuntimeError(f"[TTS] {argv[0]} produced no audio")
+        if self.encode_command.strip():
+            audio = await self._run(shlex.split(self.encode_command), audio)
+        return audio
+
+
+class FakeTTSBackend:
+    name = "fake"
+
+    def __init__(self, delay: float, concurrency: int):
+        self.delay = delay
+        self.concurrency = concurrency
+
+    def voice(self) -> Dict[str, Any]:
+        return {"engine": "fake"}
+
+    async def synthesize(self, text: str, pool: Executor) -> bytes:
+        if self.delay > 0:
+            await asyncio.sleep(self.delay)
+        return b"ID3FAKE:" + text.encode("utf-8")
+
+
+@lru_cache()
+def get_tts_backend() -> TTSBackend:
+    settings = get_tts_settings()
+    if settings.backend == "local":
+        return LocalCommandBackend(
+            command=settings.local_command,
+            encode_command=settings.local_encode_command,
+            concurrency=settings.local_concurrency,
+        )
+    if settings.backend == "fake":
+        return FakeTTSBackend(delay=settings.fake_delay_seconds, concurrency=settings.fake_concurrency)
+    return GTTSBackend(
+        lang=settings.lang, tld=settings.tld, slow=settings.slow, concurrency=settings.gtts_concurrency
+    )
@@ -0,0 +1,172 @@
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from src.config import get_tts_settings
+from src.utils.tts_backends import TTSBackend, get_tts_backend
+
+# (text, caller future, enqueued_at)
+_Job = Tuple[str, asyncio.Future, float]
+
+
+class TTSExecutor:
+    """
+    Dedicated TTS worker pool owned by the app lifespan.
+
+    - worker 數 = backend 宣告的 concurrency；blocking 的合成（gTTS）跑在專屬 thread pool，
+      不佔用 loop 的 default executor
+    - bounded queue：排隊數達 queue_size 時 submit 會等待（backpressure），不會無限堆積
+    - 每次合成有 timeout；呼叫端取消時，尚未開始的工作直接略過、執行中的工作一併取消
+    """
+
+    def __init__(self, backend: TTSBackend, queue_size: int, timeout: float, window: int = 1000):
+        self.backend = backend
+        self.workers = max(1, backend.concurrency)
+        self.queue_size = max(1, queue_size)
+        self.timeout = timeout
+        self._queue: Optional[asyncio.Queue] = None
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._worker_tasks: List[asyncio.Task] = []
+
+        self._blocked = 0
+        self._running = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.cancelled = 0
+        self._waits: Deque[float] = deque(maxlen=window)
+        self._runs: Deque[float] = deque(maxlen=window)
+
+    # ============== Lifecycle ==============
+
+    @property
+    def started(self) -> bool:
+        return bool(self._worker_tasks)
+
+    async def start(self):
+        if self.started:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        # timeout 後 thread 無法中斷，多留一倍 thread 讓後續工作不必等它跑完
+        self._pool = ThreadPoolExecutor(max_workers=self.workers * 2, thread_name_prefix="tts")
+        self._worker_tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+        if self._queue is not None:
+            while not self._queue.empty():
+                _, future, _ = self._queue.get_nowait()
+                future.cancel()
+            self._queue = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    # ============== Public API ==============
+
+    async def submit(self, text: str) -> bytes:
+        """Synthesize `text`; waits for a queue slot when the queue is full."""
+        if not self.started:
+            # lifespan 以外（CLI、script）使用時自動啟動
+            await self.start()
+        future = asyncio.get_running_loop().create_future()
+        self._blocked += 1
+        try:
+            await self._queue.put((text, future, time.monotonic()))
+        finally:
+            self._blocked -= 1
+        self.submitted += 1
+        # 呼叫端被取消時 future 也會被取消，worker 據此略過或中止該工作
+        return await future
+
+    # ============== Worker ==============
+
+    async def _worker(self):
+        while True:
+            text, future, enqueued_at = await self._queue.get()
+            if future.cancelled():
+                self.cancelled += 1
+                continue
+
+            started = time.monotonic()
+            self._waits.append(started - enqueued_at)
+            self._running += 1
+            run = asyncio.create_task(
+                asyncio.wait_for(self.backend.synthesize(text, self._pool), self.timeout)
+            )
+            future.add_done_callback(lambda f, run=run: run.cancel() if f.cancelled() else None)
+            try:
+                audio = await run
+            except asyncio.CancelledError:
+                if not run.cancelled() or asyncio.current_task().cancelling():
+                    run.cancel()
+                    future.cancel()
+                    raise  # executor 正在關閉
+                self.cancelled += 1
+                continue
+            except TimeoutError:
+                self.timeouts += 1
+                if not future.done():
+                    future.set_exception(
+                        TimeoutError(f"[TTS] {self.backend.name} timed out after {self.timeout}s")
+                    )
+                continue
+            except Exception as e:
+                self.failed += 1
+                if not future.done():
+                    future.set_exception(e)
+                continue
+            finally:
+                self._running -= 1
+                self._runs.append(time.monotonic() - started)
+
+            self.completed += 1
+            if not future.done():
+                future.set_result(audio)
+
+    # ============== Metrics ==============
+
+    @staticmethod
+    def _percentile(values: List[float], pct: float) -> float:
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * pct))], 4)
+
+    def stats(self) -> Dict[str, Any]:
+        waits = list(self._waits)
+        runs = list(self._runs)
+        return {
+            "backend": self.backend.name,
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "blocked_submitters": self._blocked,
+            "running": self._running,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timeouts": self.timeouts,
+            "cancelled": self.cancelled,
+            "wait_p50": self._percentile(waits, 0.5),
+            "wait_p95": self._percentile(waits, 0.95),
+            "run_p50": self._percentile(runs, 0.5),
+            "run_p95": self._percentile(runs, 0.95),
+        }
+
+
+@lru_cache()
+def get_tts_executor() -> TTSExecutor:
+    settings = get_tts_settings()
+    return TTSExecutor(
+        get_tts_backend(),
+        queue_size=settings.queue_size,
+        timeout=settings.timeout_seconds,
+    )
@@ -0,0 +1,28 @@
+"""
+Test environment：在 import `src` 之前設定環境變數。
+
+- src.utils.llm 在 import 時建立 Azure OpenAI client，需要 endpoint / api key（不會真的連線）
+- 所有 SQLite / 音檔 cache 指向暫存目錄，不碰 repo 的 cache/
+"""
+
+import os
+import tempfile
+
+_CACHE = tempfile.mkdtemp(prefix="anki_kor_agent_test_")
+
+os.environ.update(
+    {
+        "AZURE_OPENAI_API_KEY": "test-key",
+        "AZURE_OPENAI_ENDPOINT": "https://test.openai.azure.com",
+        "ANKI_URL": "http://127.0.0.1:9",  # 測試一律以 FakeAnkiConnect 的 URL 建立 client
+        "TTS_BACKEND": "fake",
+        "TTS_CACHE_DIR": os.path.join(_CACHE, "audio"),
+        "LLM_CACHE_ENABLED": "false",
+        "LLM_CACHE_PATH": os.path.join(_CACHE, "llm_cache.sqlite3"),
+        "LEXICON_ENABLED": "false",
+        "LEXICON_PATH": os.path.join(_CACHE, "lexicon.sqlite3"),
+        "JOB_DB_PATH": os.path.join(_CACHE, "jobs.sqlite3"),
+        "GRAPH_CHECKPOINT_PATH": os.path.join(_CACHE, "graph_checkpoints.sqlite3"),
+        "LLM_BATCH_DIR": os.path.join(_CACHE, "batch"),
+    }
+)
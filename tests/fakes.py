@@ -0,0 +1,163 @@
+"""
+In-process fakes for the external services (no Anki / Azure needed).
+
+- FakeAnkiConnect：真正的 aiohttp server，回應 AnkiConnect version 6 格式（含 `multi`），
+  AnkiClient 走完整的 HTTP 路徑
+- openai_client()：httpx.MockTransport 接在 AsyncAzureOpenAI 上，依序回傳預先排好的 response
+"""
+
+import json
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from openai import AsyncAzureOpenAI
+
+
+class FakeAnkiError(Exception):
+    """Raised by a handler; returned to the client as the action's `error`."""
+
+
+class FakeAnkiConnect:
+    """
+    Minimal AnkiConnect: one deck of notes with a Word field.
+
+    - notes：note_id → {"Word", "mod"}；edited：`edited:N` 查詢回傳的 note
+    - requests：收到的每個 HTTP payload（用來檢查是否合併成 `multi`）
+    - handlers：覆寫單一 action（包含 `multi` 本身）
+    """
+
+    def __init__(self):
+        self.notes: Dict[int, Dict[str, Any]] = {}
+        self.edited: set = set()
+        self.requests: List[Dict[str, Any]] = []
+        self.handlers: Dict[str, Callable[[Dict[str, Any]], Any]] = {}
+        self._server: Optional[TestServer] = None
+
+    def add_note(self, note_id: int, word: str, mod: int = 1):
+        self.notes[note_id] = {"Word": word, "mod": mod}
+
+    def edit_note(self, note_id: int, word: str, mod: int):
+        self.notes[note_id] = {"Word": word, "mod": mod}
+        self.edited.add(note_id)
+
+    def delete_note(self, note_id: int):
+        self.notes.pop(note_id, None)
+        self.edited.discard(note_id)
+
+    @property
+    def url(self) -> str:
+        return str(self._server.make_url("/"))
+
+    def actions(self) -> List[str]:
+        return [payload["action"] for payload in self.requests]
+
+    async def __aenter__(self) -> "FakeAnkiConnect":
+        app = web.Application()
+        app.router.add_post("/", self._handle)
+        self._server = TestServer(app)
+        await self._server.start_server()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._server.close()
+
+    # ============== Protocol ==============
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        payload = await request.json()
+        self.requests.append(payload)
+        return web.json_response(self._envelope(payload))
+
+    def _envelope(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            return {"result": self._run(payload["action"], payload.get("params", {})), "error": None}
+        except FakeAnkiError as e:
+            return {"result": None, "error": str(e)}
+
+    def _run(self, action: str, params: Dict[str, Any]) -> Any:
+        if action in self.handlers:
+            return self.handlers[action](params)
+        if action == "multi":
+            return [self._envelope(item) for item in params["actions"]]
+        handler = getattr(self, f"_action_{action}", None)
+        if handler is None:
+            raise FakeAnkiError(f"unsupported action: {action}")
+        return handler(params)
+
+    def _action_version(self, params):
+        return 6
+
+    def _action_findNotes(self, params):
+        if "edited:" in params["query"]:
+            return sorted(self.edited)
+        return sorted(self.notes)
+
+    def _action_notesInfo(self, params):
+        # 不存在的 note 回傳空 dict（與 AnkiConnect 相同）
+        return [
+            {
+                "noteId": nid,
+                "mod": self.notes[nid]["mod"],
+                "fields": {"Word": {"value": self.notes[nid]["Word"], "order": 0}},
+            }
+            if nid in self.notes
+            else {}
+            for nid in params["notes"]
+        ]
+
+    def _action_notesModTime(self, params):
+        return [
+            {"noteId": nid, "mod": self.notes[nid]["mod"]}
+            for nid in params["notes"]
+            if nid in self.notes
+        ]
+
+    def _action_deleteNotes(self, params):
+        for nid in params["notes"]:
+            if nid not in self.notes:
+                raise FakeAnkiError(f"Note was not found: {nid}")
+        for nid in params["notes"]:
+            self.delete_note(nid)
+        return None
+
+
+def openai_response(status: int = 200, headers: Optional[Dict[str, str]] = None, content: str = "ok") -> httpx.Response:
+    """A chat.completions response (or an error body when status >= 400)."""
+    if status >= 400:
+        body = {"error": {"message": f"fake {status}", "type": "fake", "code": str(status)}}
+    else:
+        body = {
+            "id": "chatcmpl-fake",
+            "object": "chat.completion",
+            "created": 0,
+            "model": "gpt-4o-mini",
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+        }
+    return httpx.Response(status, headers=headers or {}, content=json.dumps(body).encode("utf-8"))
+
+
+def openai_client(responses: List[httpx.Response], requests: Optional[List[httpx.Request]] = None) -> AsyncAzureOpenAI:
+    """AsyncAzureOpenAI whose transport replays `responses` in order (SDK retries off)."""
+    queue = list(responses)
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        if requests is not None:
+            requests.append(request)
+        return queue.pop(0)
+
+    return AsyncAzureOpenAI(
+        azure_endpoint="https://test.openai.azure.com",
+        api_key="test-key",
+        api_version="2025-01-01-preview",
+        max_retries=0,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(_handler)),
+    )
@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+
+from fakes import FakeAnkiConnect
+from src.utils.anki import AnkiClient, AnkiNoteNotFoundError
+
+
+def _client(url: str, batch_window: float = 0.05) -> AnkiClient:
+    return AnkiClient(url, max_connections=4, timeout=5, batch_window=batch_window)
+
+
+def test_concurrent_invokes_are_coalesced_into_one_multi():
+    async def main():
+        async with FakeAnkiConnect() as anki:
+            anki.add_note(1, "공부")
+            anki.add_note(2, "학교")
+            client = _client(anki.url)
+            try:
+                results = await asyncio.gather(
+                    client.invoke("version", {}),
+                    client.invoke("findNotes", {"query": "deck:test"}),
+                    client.invoke("notesModTime", {"notes": [2]}),
+                )
+            finally:
+                await client.close()
+            return anki, results
+
+    anki, results = asyncio.run(main())
+    assert results == [6, [1, 2], [{"noteId": 2, "mod": 1}]]
+    assert anki.actions() == ["multi"]
+    assert [a["action"] for a in anki.requests[0]["params"]["actions"]] == [
+        "version",
+        "findNotes",
+        "notesModTime",
+    ]
+
+
+def test_single_invoke_is_sent_without_multi():
+    async def main():
+        async with FakeAnkiConnect() as anki:
+            client = _client(anki.url)
+            try:
+                result = await client.invoke("version", {})
+            finally:
+                await client.close()
+            return anki, result
+
+    anki, result = asyncio.run(main())
+    assert result == 6
+    assert anki.actions() == ["version"]
+
+
+def test_batch_window_zero_disables_coalescing():
+    async def main():
+        async with FakeAnkiConnect() as anki:
+            client = _client(anki.url, batch_window=0)
+            try:
+                await asyncio.gather(client.invoke("version", {}), client.invoke("version", {}))
+            finally:
+                await client.close()
+            return anki
+
+    assert asyncio.run(main()).actions() == ["version", "version"]
+
+
+def test_each_caller_gets_its_own_error():
+    async def main():
+        async with FakeAnkiConnect() as anki:
+            anki.add_note(1, "공부")
+            client = _client(anki.url)
+            try:
+                return await asyncio.gather(
+                    client.invoke("findNotes", {"query": "deck:test"}),
+                    client.invoke("deleteNotes", {"notes": [99]}),
+                    client.invoke("noSuchAction", {}),
+                    return_exceptions=True,
+                )
+            finally:
+                await client.close()
+
+    found, missing, unsupported = asyncio.run(main())
+    assert found == [1]
+    assert isinstance(missing, AnkiNoteNotFoundError)
+    assert type(unsupported) is RuntimeError
+    assert "unsupported action" in str(unsupported)
+
+
+@pytest.mark.parametrize("multi_result", [[{"result": 6, "error": None}], None, {"result": 6}])
+def test_malformed_multi_result_fails_every_caller(multi_result):
+    async def main():
+        async with FakeAnkiConnect() as anki:
+            anki.handlers["multi"] = lambda params: multi_result
+            client = _client(anki.url)
+            try:
+                return await asyncio.wait_for(
+                    asyncio.gather(
+                        client.invoke("version", {}),
+                        client.invoke("version", {}),
+                        return_exceptions=True,
+                    ),
+                    timeout=5,
+                )
+            finally:
+                await client.close()
+
+    results = asyncio.run(main())
+    assert len(results) == 2
+    assert all(isinstance(r, RuntimeError) and "multi returned" in str(r) for r in results)
@@ -0,0 +1,47 @@
+import asyncio
+import os
+
+from src.utils.audio_cache import AudioCache
+
+
+def _age(cache: AudioCache, key: str, mtime: float):
+    os.utime(cache.path_for(key), (mtime, mtime))
+
+
+def test_lru_eviction_keeps_the_most_recent_files(tmp_path):
+    async def main():
+        cache = AudioCache(str(tmp_path), max_bytes=20)
+        await cache.put("a", b"x" * 8)
+        _age(cache, "a", 1)
+        await cache.put("b", b"x" * 8)
+        _age(cache, "b", 2)
+        assert await cache.touch("a")  # a 變成最近使用
+        await cache.put("c", b"x" * 8)
+        return cache
+
+    cache = asyncio.run(main())
+    assert cache.path_for("a").exists()
+    assert not cache.path_for("b").exists()
+    assert cache.path_for("c").exists()
+    assert cache.stats()["total_bytes"] == 16
+
+
+def test_pinned_file_survives_eviction_until_released(tmp_path):
+    async def main():
+        cache = AudioCache(str(tmp_path), max_bytes=20)
+        await cache.put("a", b"x" * 8)
+        _age(cache, "a", 1)
+        await cache.put("b", b"x" * 8)
+        _age(cache, "b", 2)
+        with cache.pin("a") as path:
+            await cache.put("c", b"x" * 8)  # a 最舊但正在上傳 → 改淘汰 b
+            assert path.read_bytes() == b"x" * 8
+            assert not cache.path_for("b").exists()
+        _age(cache, "c", 3)
+        await cache.put("d", b"x" * 8)  # 釋放後 a 照常依 LRU 淘汰
+        return cache
+
+    cache = asyncio.run(main())
+    assert not cache.path_for("a").exists()
+    assert cache.path_for("c").exists()
+    assert cache.path_for("d").exists()
@@ -0,0 +1,90 @@
+import asyncio
+from typing import TypedDict
+
+import pytest
+from langgraph.graph import END, START, StateGraph
+
+from src.graph.checkpoint import GraphCheckpointer, ainvoke_resumable
+
+
+class _State(TypedDict, total=False):
+    word: str
+    force_update: bool
+    parsed: str
+    sent: bool
+
+
+def _build(checkpointer, calls, fail):
+    async def parse(state):
+        calls.append("parse")
+        return {"parsed": state["word"].upper()}
+
+    async def send(state):
+        calls.append("send")
+        if fail:
+            fail.pop()
+            raise RuntimeError("Anki is closed")
+        return {"sent": True}
+
+    graph = StateGraph(_State)
+    graph.add_node("parse", parse)
+    graph.add_node("send", send)
+    graph.add_edge(START, "parse")
+    graph.add_edge("parse", "send")
+    graph.add_edge("send", END)
+    return graph.compile(checkpointer=checkpointer)
+
+
+def test_failed_run_resumes_from_failed_node_and_is_deleted(tmp_path):
+    async def main():
+        checkpointer = GraphCheckpointer(str(tmp_path / "checkpoints.sqlite3"))
+        calls = []
+        app = _build(checkpointer, calls, fail=[True])
+        config = {"configurable": {"thread_id": "vocab:abc"}}
+        try:
+            with pytest.raises(RuntimeError):
+                await ainvoke_resumable(app, {"word": "abc", "force_update": False}, "vocab:abc")
+            pending = await app.aget_state(config)
+            assert pending.next == ("send",)
+
+            result = await ainvoke_resumable(app, {"word": "abc", "force_update": False}, "vocab:abc")
+            done = await app.aget_state(config)
+            return calls, result, pending, done
+        finally:
+            await checkpointer.close()
+
+    calls, result, pending, done = asyncio.run(main())
+    # parse 只跑一次：重試時從失敗的 send 繼續
+    assert calls == ["parse", "send", "send"]
+    assert result["parsed"] == "ABC" and result["sent"] is True
+    # 成功後 checkpoint 刪除
+    assert not done.values and not done.next
+
+
+def test_changed_input_discards_checkpoint(tmp_path):
+    async def main():
+        checkpointer = GraphCheckpointer(str(tmp_path / "checkpoints.sqlite3"))
+        calls = []
+        app = _build(checkpointer, calls, fail=[True])
+        try:
+            with pytest.raises(RuntimeError):
+                await ainvoke_resumable(app, {"word": "abc", "force_update": False}, "vocab:abc")
+            result = await ainvoke_resumable(app, {"word": "abc", "force_update": True}, "vocab:abc")
+            return calls, result
+        finally:
+            await checkpointer.close()
+
+    calls, result = asyncio.run(main())
+    assert calls == ["parse", "send", "parse", "send"]
+    assert result["force_update"] is True and result["sent"] is True
+
+
+def test_graph_without_checkpointer_runs_plain():
+    async def main():
+        calls = []
+        app = _build(None, calls, fail=[])
+        return calls, await ainvoke_resumable(app, {"word": "abc"}, "vocab:abc")
+
+    calls, result = asyncio.run(main())
+    assert calls == ["parse", "send"]
+    assert result["sent"] is True
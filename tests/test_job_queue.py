@@ -0,0 +1,92 @@
+import asyncio
+
+from src.service.job_queue import JobQueue
+
+
+async def _wait_for(predicate, timeout: float = 5.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not await predicate():
+        assert asyncio.get_running_loop().time() < deadline, "condition not reached"
+        await asyncio.sleep(0.02)
+
+
+def test_restart_resets_interrupted_items_to_pending(tmp_path):
+    db = str(tmp_path / "jobs.sqlite3")
+    started = []
+    processed = []
+
+    async def hanging_runner(payload, force_update):
+        started.append(payload["word"])
+        await asyncio.Event().wait()  # 模擬執行到一半 process 被停掉
+
+    async def runner(payload, force_update):
+        processed.append(payload["word"])
+        return {**payload, "status": "success"}
+
+    async def first_run() -> str:
+        queue = JobQueue(db, workers=1, poll_seconds=0.05)
+        queue.register("vocab", hanging_runner)
+        await queue.start()
+        job_id = await queue.submit("vocab", [{"word": "공부"}, {"word": "학교"}], False)
+
+        async def running():
+            job = await queue.get(job_id)
+            return bool(started) and job["counts"].get("running") == 1
+
+        await _wait_for(running)
+        await queue.stop()
+        job = await queue.get(job_id)
+        assert job["status"] == "running"
+        assert job["counts"] == {"running": 1, "pending": 1}
+        return job_id
+
+    async def second_run(job_id: str):
+        queue = JobQueue(db, workers=1, poll_seconds=0.05)
+        queue.register("vocab", runner)
+        await queue.start()
+        try:
+            async def completed():
+                return (await queue.get(job_id))["status"] == "completed"
+
+            await _wait_for(completed)
+            return await queue.get(job_id)
+        finally:
+            await queue.stop()
+
+    job_id = asyncio.run(first_run())
+    job = asyncio.run(second_run(job_id))
+
+    assert started == ["공부"]
+    assert processed == ["공부", "학교"]
+    assert job["counts"] == {"success": 2}
+    assert [r["word"] for r in job["results"]] == ["공부", "학교"]
+
+
+def test_cancel_stops_pending_items(tmp_path):
+    async def main():
+        gate = asyncio.Event()
+
+        async def runner(payload, force_update):
+            await gate.wait()
+            return {**payload, "status": "success"}
+
+        queue = JobQueue(str(tmp_path / "jobs.sqlite3"), workers=1, poll_seconds=0.05)
+        queue.register("vocab", runner)
+        await queue.start()
+        try:
+            job_id = await queue.submit("vocab", [{"word": "a"}, {"word": "b"}], False)
+
+            async def running():
+                return (await queue.get(job_id))["counts"].get("running") == 1
+
+            await _wait_for(running)
+            assert await queue.cancel(job_id)
+            gate.set()
+            await asyncio.sleep(0.1)
+            return await queue.get(job_id)
+        finally:
+            await queue.stop()
+
+    job = asyncio.run(main())
+    assert job["status"] == "cancelled"
+    assert job["counts"] == {"cancelled": 2}
@@ -0,0 +1,32 @@
+import unicodedata
+
+import pytest
+
+from src.utils.korean import normalize_key
+
+
+@pytest.mark.parametrize(
+    "variant",
+    [
+        "공부하다",
+        unicodedata.normalize("NFD", "공부하다"),  # macOS 檔名 / 部分輸入法
+        "공부 하다",
+        " 공부하다\n",
+        "공부\u200b하다",  # 零寬空白
+        "\ufeff공부하다",  # BOM
+        "공부\u3000하다",  # 全形空白
+    ],
+)
+def test_variants_share_a_key(variant):
+    assert normalize_key(variant) == normalize_key("공부하다")
+
+
+def test_compatibility_jamo_and_fullwidth_are_folded():
+    assert normalize_key("ㄱ") == normalize_key("ᄀ")
+    assert normalize_key("ＴＶ") == normalize_key("tv")
+    assert normalize_key("SNS하다") == normalize_key("sns하다")
+
+
+@pytest.mark.parametrize("other", ["공부", "공부하다가", "공무하다"])
+def test_different_words_keep_different_keys(other):
+    assert normalize_key(other) != normalize_key("공부하다")
@@ -0,0 +1,62 @@
+import asyncio
+import json
+
+from fakes import openai_client, openai_response
+from src.utils import llm as llm_module
+from src.utils.llm import LLMCache, ask_llm
+
+
+def _cache(tmp_path) -> LLMCache:
+    return LLMCache(str(tmp_path / "llm_cache.sqlite3"), ttl_seconds=3600, max_entries=100)
+
+
+def _ask(monkeypatch, cache, responses, requests):
+    monkeypatch.setattr(llm_module, "get_llm_cache", lambda: cache)
+
+    async def main():
+        monkeypatch.setattr(llm_module, "client", openai_client(responses, requests))
+        try:
+            return await ask_llm(user_prompt="공부", validate=json.loads)
+        finally:
+            await llm_module.client.close()
+
+    return asyncio.run(main())
+
+
+def test_valid_entry_is_served_from_cache(tmp_path, monkeypatch):
+    cache = _cache(tmp_path)
+    requests = []
+    first = _ask(monkeypatch, cache, [openai_response(content='{"word": "공부"}')], requests)
+    second = _ask(monkeypatch, cache, [], requests)
+
+    assert first == second == '{"word": "공부"}'
+    assert len(requests) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_invalid_response_is_not_cached(tmp_path, monkeypatch):
+    cache = _cache(tmp_path)
+    requests = []
+    try:
+        _ask(monkeypatch, cache, [openai_response(content="not json")], requests)
+    except json.JSONDecodeError:
+        pass
+    assert cache.stats()["entries"] == 0
+
+
+def test_stale_invalid_entry_is_replaced_and_counted_as_miss(tmp_path, monkeypatch):
+    cache = _cache(tmp_path)
+    requests = []
+    key = cache.make_key(
+        "gpt-4o-mini", [{"role": "user", "content": "공부"}], 0.2, 800, {}
+    )
+    asyncio.run(cache.set(key, "not json"))  # 加上 validate 之前寫入的壞資料
+
+    result = _ask(monkeypatch, cache, [openai_response(content='{"word": "공부"}')], requests)
+
+    assert result == '{"word": "공부"}'
+    assert len(requests) == 1
+    assert (cache.hits, cache.misses) == (0, 1)
+    assert cache.stats()["entries"] == 1  # 同一個 key 被新回應覆寫
+    assert _ask(monkeypatch, cache, [], requests) == result
+    assert (cache.hits, cache.misses) == (1, 1)
@@ -0,0 +1,116 @@
+import asyncio
+import time
+from email.utils import formatdate
+
+import openai
+import pytest
+
+from fakes import openai_client, openai_response
+from src.utils.rate_limit import RateLimiter, retry_after_seconds
+
+
+def _limiter(max_retries: int = 3) -> RateLimiter:
+    return RateLimiter(
+        rpm_limit=100, tpm_limit=100_000, max_retries=max_retries, backoff_base=0.01, backoff_max=5.0
+    )
+
+
+def _run(limiter: RateLimiter, responses, requests=None):
+    async def main():
+        client = openai_client(responses, requests)
+        try:
+            return await limiter.run(
+                lambda: client.chat.completions.with_raw_response.create(
+                    model="gpt-4o-mini", messages=[{"role": "user", "content": "공부"}]
+                ),
+                tokens=10,
+            )
+        finally:
+            await client.close()
+
+    return asyncio.run(main())
+
+
+def test_429_waits_for_retry_after_then_succeeds():
+    limiter = _limiter()
+    requests = []
+    started = time.monotonic()
+    result = _run(
+        limiter,
+        [openai_response(429, {"retry-after-ms": "300"}), openai_response(content="공부")],
+        requests,
+    )
+    elapsed = time.monotonic() - started
+
+    assert result.choices[0].message.content == "공부"
+    assert len(requests) == 2
+    assert elapsed >= 0.3
+    stats = limiter.snapshot()
+    assert (stats["throttled"], stats["retries"], stats["failures"]) == (1, 1, 0)
+
+
+def test_429_pauses_every_caller():
+    limiter = _limiter(max_retries=0)
+    with pytest.raises(openai.RateLimitError):
+        _run(limiter, [openai_response(429, {"retry-after": "2"})])
+
+    stats = limiter.snapshot()
+    assert stats["failures"] == 1
+    # 其他呼叫端的下一個 acquire 也要等到 Retry-After 之後
+    assert 1.5 < stats["paused_for"] <= 2.0
+
+
+def test_5xx_is_retried_without_throttling():
+    limiter = _limiter()
+    _run(limiter, [openai_response(500), openai_response(503), openai_response()])
+    stats = limiter.snapshot()
+    assert (stats["throttled"], stats["retries"], stats["failures"]) == (0, 2, 0)
+
+
+def test_non_retryable_error_is_raised_immediately():
+    limiter = _limiter()
+    requests = []
+    with pytest.raises(openai.BadRequestError):
+        _run(limiter, [openai_response(400), openai_response()], requests)
+    assert len(requests) == 1
+    assert limiter.snapshot()["retries"] == 0
+
+
+def test_ratelimit_headers_calibrate_budget_and_pause_on_exhaustion():
+    limiter = _limiter()
+    _run(
+        limiter,
+        [
+            openai_response(
+                headers={
+                    "x-ratelimit-limit-requests": "60",
+                    "x-ratelimit-limit-tokens": "8000",
+                    "x-ratelimit-remaining-requests": "0",
+                    "x-ratelimit-reset-requests": "1s500ms",
+                }
+            )
+        ],
+    )
+    stats = limiter.snapshot()
+    assert (stats["rpm_limit"], stats["tpm_limit"]) == (60, 8000)
+    assert 1.0 < stats["paused_for"] <= 1.5
+
+
+@pytest.mark.parametrize(
+    "headers, expected",
+    [
+        ({"retry-after-ms": "1500"}, 1.5),
+        ({"retry-after": "7"}, 7.0),
+        ({"retry-after-ms": "bad", "retry-after": "3"}, 3.0),
+        ({"retry-after": "soon"}, None),
+        ({}, None),
+        (None, None),
+    ],
+)
+def test_retry_after_seconds(headers, expected):
+    assert retry_after_seconds(headers) == expected
+
+
+def test_retry_after_http_date():
+    seconds = retry_after_seconds({"retry-after": formatdate(time.time() + 30, usegmt=True)})
+    assert 25 < seconds <= 30
@@ -0,0 +1,35 @@
+import hashlib
+
+import pytest
+
+from src.utils import tts as tts_module
+from src.utils.tts import media_filename
+from src.utils.tts_backends import FakeTTSBackend, GTTSBackend
+
+
+def _use_backend(monkeypatch, backend):
+    monkeypatch.setattr(tts_module, "get_tts_backend", lambda: backend)
+
+
+def test_default_gtts_voice_keeps_legacy_md5_filename(monkeypatch):
+    _use_backend(monkeypatch, GTTSBackend(lang="ko", tld="com", slow=False, concurrency=2))
+    legacy = hashlib.md5("공부".encode()).hexdigest()[:12]
+    assert media_filename("vocab", "공부") == f"vocab_{legacy}.mp3"
+    assert media_filename("listening", "공부") == f"listening_{legacy}.mp3"
+
+
+@pytest.mark.parametrize(
+    "backend",
+    [
+        GTTSBackend(lang="ko", tld="co.kr", slow=False, concurrency=2),
+        GTTSBackend(lang="ko", tld="com", slow=True, concurrency=2),
+        FakeTTSBackend(delay=0, concurrency=1),
+    ],
+)
+def test_other_voices_get_their_own_filename(monkeypatch, backend):
+    _use_backend(monkeypatch, GTTSBackend(lang="ko", tld="com", slow=False, concurrency=2))
+    legacy = media_filename("vocab", "공부")
+    _use_backend(monkeypatch, backend)
+    name = media_filename("vocab", "공부")
+    assert name != legacy
+    assert name.startswith("vocab_") and name.endswith(".mp3")
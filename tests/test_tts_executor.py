@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+
+from src.utils.tts_backends import FakeTTSBackend
+from src.utils.tts_executor import TTSExecutor
+
+
+class _RecordingBackend(FakeTTSBackend):
+    def __init__(self, delay: float, concurrency: int = 1):
+        super().__init__(delay=delay, concurrency=concurrency)
+        self.started = []
+        self.finished = []
+
+    async def synthesize(self, text, pool):
+        self.started.append(text)
+        audio = await super().synthesize(text, pool)
+        self.finished.append(text)
+        return audio
+
+
+def _run(backend, timeout, scenario):
+    async def main():
+        executor = TTSExecutor(backend, queue_size=4, timeout=timeout)
+        await executor.start()
+        try:
+            return await scenario(executor)
+        finally:
+            await executor.stop()
+
+    return asyncio.run(main())
+
+
+def test_submit_returns_audio():
+    backend = _RecordingBackend(delay=0)
+
+    async def scenario(executor):
+        return await executor.submit("공부"), executor.stats()
+
+    audio, stats = _run(backend, 5, scenario)
+    assert audio == "ID3FAKE:공부".encode("utf-8")
+    assert stats["completed"] == 1
+
+
+def test_slow_synthesis_times_out_and_worker_keeps_serving():
+    backend = _RecordingBackend(delay=0.5)
+
+    async def scenario(executor):
+        with pytest.raises(TimeoutError):
+            await executor.submit("느림")
+        backend.delay = 0
+        audio = await executor.submit("빠름")
+        return audio, executor.stats()
+
+    audio, stats = _run(backend, 0.1, scenario)
+    assert audio.endswith("빠름".encode("utf-8"))
+    assert (stats["timeouts"], stats["completed"]) == (1, 1)
+    assert backend.finished == ["빠름"]
+
+
+def test_cancelled_queued_job_is_skipped():
+    backend = _RecordingBackend(delay=0.2)
+
+    async def scenario(executor):
+        first = asyncio.create_task(executor.submit("첫째"))
+        await asyncio.sleep(0.05)  # 第一個已在合成，第二個排隊中
+        second = asyncio.create_task(executor.submit("둘째"))
+        await asyncio.sleep(0.01)
+        second.cancel()
+        await first
+        await asyncio.sleep(0.05)
+        return second, executor.stats()
+
+    second, stats = _run(backend, 5, scenario)
+    assert second.cancelled()
+    assert backend.started == ["첫째"]
+    assert (stats["completed"], stats["cancelled"]) == (1, 1)
+
+
+def test_cancelling_a_running_job_stops_synthesis():
+    backend = _RecordingBackend(delay=0.5)
+
+    async def scenario(executor):
+        task = asyncio.create_task(executor.submit("취소"))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        await asyncio.sleep(0.05)
+        backend.delay = 0
+        audio = await executor.submit("다음")
+        return task, audio, executor.stats()
+
+    task, audio, stats = _run(backend, 5, scenario)
+    assert task.cancelled()
+    assert backend.started == ["취소", "다음"]
+    assert backend.finished == ["다음"]  # 執行中的合成被中止，沒有跑完
+    assert (stats["cancelled"], stats["completed"], stats["running"]) == (1, 1, 0)
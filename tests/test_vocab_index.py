@@ -0,0 +1,85 @@
+import asyncio
+
+from fakes import FakeAnkiConnect
+from src.service.vocab_anki_service import VocabAnkiService
+from src.utils import anki as anki_module
+from src.utils.anki import AnkiClient
+
+
+def _run_with_service(monkeypatch, scenario):
+    """Run `scenario(fake, service)` against a VocabAnkiService wired to a FakeAnkiConnect."""
+
+    async def main():
+        async with FakeAnkiConnect() as fake:
+            client = AnkiClient(fake.url, max_connections=4, timeout=5)
+            monkeypatch.setattr(anki_module, "get_anki_client", lambda: client)
+            service = VocabAnkiService()
+            service.client = client
+            try:
+                return await scenario(fake, service)
+            finally:
+                await client.close()
+
+    return asyncio.run(main())
+
+
+def _notes_info_ids(fake: FakeAnkiConnect):
+    return [sorted(p["params"]["notes"]) for p in fake.requests if p["action"] == "notesInfo"]
+
+
+def test_sync_reconciles_deletions_edits_and_new_notes(monkeypatch):
+    async def scenario(fake, service):
+        fake.add_note(1, "공부")
+        fake.add_note(2, "학교")
+        fake.add_note(3, "사랑")
+        index = service.index
+        await index.sync()  # 第一次：完整載入
+        assert sorted(index.words()) == ["공부", "사랑", "학교"]
+
+        fake.requests.clear()
+        fake.delete_note(2)
+        fake.edit_note(3, "사랑하다", mod=5)
+        fake.add_note(4, "친구", mod=5)  # 新 note 不在 edited:N 也要補上
+        await index.sync()
+        return index, _notes_info_ids(fake)
+
+    index, fetched = _run_with_service(monkeypatch, scenario)
+    assert sorted(index.words()) == ["공부", "사랑하다", "친구"]
+    assert index.get("학교") is None
+    assert index.get("사랑") is None
+    assert index.get("사랑하다") == 3
+    assert index.get("친구") == 4
+    # 只對變動的 note 取欄位，未變動的 1 不重抓
+    assert fetched == [[3, 4]]
+
+
+def test_sync_drops_notes_whose_word_was_cleared(monkeypatch):
+    async def scenario(fake, service):
+        fake.add_note(1, "공부")
+        await service.index.sync()
+        fake.edit_note(1, "", mod=5)
+        await service.index.sync()
+        return service.index
+
+    index = _run_with_service(monkeypatch, scenario)
+    assert len(index) == 0
+    assert index.get("공부") is None
+
+
+def test_confirm_drops_stale_hits(monkeypatch):
+    async def scenario(fake, service):
+        fake.add_note(1, "공부")
+        fake.add_note(2, "학교")
+        index = service.index
+        await index.ensure_loaded()
+        # 背景同步之前 Anki 端刪除 / 改名：index 還是舊的
+        fake.delete_note(1)
+        fake.edit_note(2, "학생", mod=5)
+        confirmed = await index.confirm({"공부": 1, "학교": 2})
+        return index, confirmed
+
+    index, confirmed = _run_with_service(monkeypatch, scenario)
+    assert confirmed == {}
+    assert index.get("공부") is None
+    assert index.get("학교") is None
+    assert index.get("학생") == 2